@@ -0,0 +1,62 @@
+"""Time the amount_to_transfer settlement as the number of balances grows.
+
+The same balances are also settled with settle_arrays, which skips the merge
+and the result dataframe, and streamed with iter_transfers, for which the
+time until the first transfer is reported.
+
+Run from the repository root:
+
+    python benchmarks/bench_amount_to_transfer.py
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from billsplittermds.amount_to_transfer import amount_to_transfer, iter_transfers, settle_arrays
+
+SCALES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_balances(n_people, seed=0):
+    """Return should_pay / actually_paid frames for `n_people` people."""
+    rng = np.random.default_rng(seed)
+    names = [f"p{i}" for i in range(n_people)]
+    should_pay = np.round(rng.uniform(0, 500, size=n_people), 2)
+    actually_paid = rng.permutation(should_pay)
+    return (pd.DataFrame({"name": names, "should_pay": should_pay}),
+            pd.DataFrame({"name": names, "actually_paid": actually_paid}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-people", type=int, default=SCALES[-1])
+    args = parser.parse_args()
+
+    print(f"{'balances':>10} {'transfers':>10} {'frames [s]':>11} {'arrays [s]':>11} "
+          f"{'first [s]':>10}")
+    for n_people in SCALES:
+        if n_people > args.max_people:
+            break
+        should_pay_df, actually_paid_df = make_balances(n_people)
+        start = time.perf_counter()
+        result = amount_to_transfer(should_pay_df, actually_paid_df)
+        frames = time.perf_counter() - start
+
+        names = should_pay_df["name"].to_numpy()
+        should_pay = should_pay_df["should_pay"].to_numpy()
+        actually_paid = actually_paid_df["actually_paid"].to_numpy()
+        start = time.perf_counter()
+        settle_arrays(names, should_pay=should_pay, actually_paid=actually_paid)
+        arrays = time.perf_counter() - start
+
+        start = time.perf_counter()
+        next(iter_transfers(should_pay_df, actually_paid_df), None)
+        first = time.perf_counter() - start
+        print(f"{n_people:>10} {len(result):>10} {frames:11.3f} {arrays:11.3f} {first:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
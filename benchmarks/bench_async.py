@@ -0,0 +1,68 @@
+"""Load-test AsyncSettler with many concurrent settlement requests.
+
+Every request settles one synthetic csv bill. `--requests` requests arrive
+at once and the script reports the p50 and p99 latency, from arrival to
+result, and the throughput for each concurrency cap, in a thread pool and
+in a process pool. Run from the repository root:
+
+    python benchmarks/bench_async.py
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+from synthetic import make_ledger
+
+from billsplittermds import AsyncSettler
+
+CONCURRENCY = [1, 2, 4, 8, 16]
+
+
+async def load_test(settler, paths):
+    """Send one request per path at once; return the latencies in seconds and the wall time."""
+    async def request(path):
+        start = time.perf_counter()
+        await settler.settle(path)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(request(path) for path in paths))
+    return np.array(latencies), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=5_000, help="rows per bill")
+    parser.add_argument("--people", type=int, default=50)
+    parser.add_argument("--bills", type=int, default=20, help="distinct bills to cycle through")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bills = []
+        for seed in range(args.bills):
+            path = os.path.join(tmp, f"bill_{seed}.csv")
+            make_ledger(args.rows, args.people, seed=seed).to_csv(path, index=False)
+            bills.append(path)
+        paths = [bills[i % len(bills)] for i in range(args.requests)]
+
+        print(f"{args.requests} requests of {args.rows} rows, {os.cpu_count()} CPUs")
+        print(f"{'pool':>8} {'jobs':>5} {'p50 [ms]':>9} {'p99 [ms]':>9} {'req/s':>8}")
+        for pool_name, pool_class in [("thread", ThreadPoolExecutor),
+                                      ("process", ProcessPoolExecutor)]:
+            for max_concurrency in CONCURRENCY:
+                with pool_class(max_workers=max_concurrency) as pool:
+                    settler = AsyncSettler(pool, max_concurrency=max_concurrency)
+                    latencies, wall = asyncio.run(load_test(settler, paths))
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                print(f"{pool_name:>8} {max_concurrency:>5} {p50:9.1f} {p99:9.1f} "
+                      f"{len(paths) / wall:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Compare a cold settlement of a csv file with a SettlementCache hit.
+
+Run from the repository root:
+
+    python benchmarks/bench_cache.py
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import make_ledger
+
+from billsplittermds import SettlementCache, settle
+
+SCALES = [10_000, 100_000, 1_000_000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'settle [s]':>11} {'disk hit [s]':>13} {'memory hit [s]':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in SCALES:
+            path = Path(tmp) / f"bill_{n_rows}.csv"
+            make_ledger(n_rows, args.people).to_csv(path, index=False)
+
+            start = time.perf_counter()
+            settle(path)
+            cold = time.perf_counter() - start
+
+            SettlementCache(directory=Path(tmp) / "store").settle(path)
+            cache = SettlementCache(directory=Path(tmp) / "store")
+            start = time.perf_counter()
+            cache.settle(path)
+            disk = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cache.settle(path)
+            memory = time.perf_counter() - start
+            print(f"{n_rows:>10} {cold:11.3f} {disk:13.4f} {memory:15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Time re-settling a bill from its CSV file and from a compiled ledger.
+
+The bill is compiled once with compile_ledger. Every later run either reads
+and validates the CSV file again, or opens the memory-mapped ledger. Run
+from the repository root:
+
+    python benchmarks/bench_compiled.py
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from synthetic import make_ledger
+
+from billsplittermds import compile_ledger, load_validate_data, open_ledger, settle
+
+SCALES = [10_000, 100_000, 1_000_000]
+
+
+def best_of(func, repeat):
+    """Return the fastest of `repeat` runs of `func`, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'compile [s]':>12} {'open [ms]':>10} "
+          f"{'csv settle [s]':>15} {'ledger settle [s]':>18}")
+    with tempfile.TemporaryDirectory(prefix="billsplitter-bench-") as directory:
+        for n_rows in SCALES:
+            csv_path = os.path.join(directory, f"bill_{n_rows}.csv")
+            ledger_path = os.path.join(directory, f"bill_{n_rows}.ledger")
+            make_ledger(n_rows, args.people, seed=1).to_csv(csv_path, index=False)
+
+            start = time.perf_counter()
+            compile_ledger(load_validate_data(csv_path), ledger_path)
+            compile_time = time.perf_counter() - start
+
+            open_time = best_of(lambda: open_ledger(ledger_path), args.repeat)
+            from_csv = best_of(lambda: settle(csv_path), args.repeat)
+            from_ledger = best_of(lambda: settle(open_ledger(ledger_path)), args.repeat)
+            print(f"{n_rows:>9} {compile_time:12.3f} {open_time * 1e3:10.2f} "
+                  f"{from_csv:15.3f} {from_ledger:18.3f}")
+
+
+if __name__ == "__main__":
+    main()
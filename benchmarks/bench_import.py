@@ -0,0 +1,74 @@
+"""Measure the import time of billsplittermds with ``python -X importtime``.
+
+Each run starts a fresh interpreter, so nothing is cached between repeats.
+The script exits with status 1 if the best cumulative import time is above
+`--max-ms`, or if importing the package pulled in pandas or numpy, and can be
+used as a regression check. Run from the repository root:
+
+    python benchmarks/bench_import.py
+"""
+
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ("pandas", "numpy")
+
+
+def import_times(statement):
+    """
+    Run `statement` in a fresh interpreter.
+
+    Returns the total import time in milliseconds, counting only imports at
+    the top of the import tree so nested ones are not counted twice, and the
+    names of every module that was imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+        modules.add(name.strip())
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=50.0,
+                        help="fail if `import billsplittermds` takes longer")
+    args = parser.parse_args()
+
+    # interpreter start-up imports (site, encodings, ...) are not ours
+    startup = min(import_times("pass")[0] for _ in range(args.repeat))
+
+    print(f"{'statement':<48} {'best [ms]':>10}")
+    failed = False
+    for statement in ("import billsplittermds",
+                      "from billsplittermds import load_validate_data",
+                      "from billsplittermds import settle"):
+        runs = [import_times(statement) for _ in range(args.repeat)]
+        best = min(total for total, _ in runs) - startup
+        print(f"{statement:<48} {best:10.1f}")
+
+        if statement == "import billsplittermds":
+            heavy = [name for name in HEAVY_MODULES if name in runs[0][1]]
+            if heavy:
+                print(f"  imports {', '.join(heavy)} eagerly", file=sys.stderr)
+                failed = True
+            if best > args.max_ms:
+                print(f"  slower than --max-ms={args.max_ms:g}", file=sys.stderr)
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
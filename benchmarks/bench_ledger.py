@@ -0,0 +1,50 @@
+"""Measure the cost of appending one expense to a bill and settling again.
+
+Compares Ledger.add_expense() + transfers() with re-running settle() on
+the whole bill after every new row. Run from the repository root:
+
+    python benchmarks/bench_ledger.py
+"""
+
+import argparse
+import time
+
+from synthetic import make_ledger
+
+from billsplittermds import Ledger, settle
+
+SCALES = [1_000, 10_000, 100_000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=50)
+    parser.add_argument("--appends", type=int, default=100,
+                        help="number of expenses appended at each scale")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'settle [ms/append]':>19} {'Ledger [ms/append]':>19}")
+    for n_rows in SCALES:
+        bill = make_ledger(n_rows + args.appends, args.people, seed=1)
+        base, extra = bill.iloc[:n_rows], bill.iloc[n_rows:]
+
+        # re-settling the whole bill is slow, so only time every tenth append
+        ends = range(n_rows + 1, n_rows + args.appends + 1, max(1, args.appends // 10))
+        start = time.perf_counter()
+        for end in ends:
+            settle(bill.iloc[:end])
+        full = (time.perf_counter() - start) / len(ends) * 1e3
+
+        ledger = Ledger.from_frame(base)
+        rows = extra.to_dict("records")
+        start = time.perf_counter()
+        for row in rows:
+            ledger.add_expense(**row)
+            ledger.transfers()
+        incremental = (time.perf_counter() - start) / len(rows) * 1e3
+
+        print(f"{n_rows:>8} {full:19.2f} {incremental:19.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Time load_validate_data and measure the loaded frame for each CSV parser.
+
+The first run writes a synthetic CSV of `--rows` rows (5M by default) next to
+the system temp files and reuses it afterwards. Run from the repository root:
+
+    python benchmarks/bench_load_validate_data.py
+"""
+
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+
+import pandas as pd
+from synthetic import make_ledger
+
+from billsplittermds.load_validate_data import load_validate_data
+
+
+def untyped_load(csv_path):
+    """The loader before dtypes were declared: infer, then coerce column by column."""
+    df = pd.read_csv(csv_path)
+    for col in ["item_price", "tax_pct", "tip_pct"]:
+        df[col] = pd.to_numeric(df[col])
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--people", type=int, default=10_000)
+    args = parser.parse_args()
+
+    csv_path = os.path.join(tempfile.gettempdir(), f"billsplitter_bench_{args.rows}.csv")
+    if not os.path.exists(csv_path):
+        print(f"writing {csv_path} ...")
+        make_ledger(args.rows, args.people).to_csv(csv_path, index=False)
+
+    loaders = [("untyped (c)", lambda: untyped_load(csv_path))]
+    engines = ["c", "pyarrow"] if importlib.util.find_spec("pyarrow") else ["c"]
+    for engine in engines:
+        loaders.append((f"schema ({engine})",
+                        lambda engine=engine: load_validate_data(csv_path, engine=engine)))
+
+    print(f"{'loader':>16} {'time [s]':>10} {'frame [MB]':>11}")
+    for label, load in loaders:
+        start = time.perf_counter()
+        df = load()
+        elapsed = time.perf_counter() - start
+        size = df.memory_usage(deep=True).sum() / 1e6
+        print(f"{label:>16} {elapsed:10.2f} {size:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measure the peak memory of every pipeline stage with tracemalloc.
+
+Each stage runs on the same synthetic ledger of `--rows` rows (10M by
+default). The peak is reported next to the size of the ledger's numeric
+columns, which any full-frame copy would duplicate, and the script fails if
+a stage added columns to its input. Run from the
+repository root:
+
+    python benchmarks/bench_memory.py
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from synthetic import make_ledger
+
+from billsplittermds import individual_total_payments, settle, split_by_item
+
+STAGES = {
+    "split_by_item": split_by_item,
+    "individual_total_payments": individual_total_payments,
+    "settle": settle,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--people", type=int, default=1_000)
+    args = parser.parse_args()
+
+    valid_df = make_ledger(args.rows, args.people)
+    columns = list(valid_df.columns)
+    # only the numeric columns: a frame copy duplicates these buffers, while
+    # the strings of the object columns are shared between the copies
+    numeric_mb = valid_df.select_dtypes("number").memory_usage(index=False).sum() / 2**20
+    print(f"{args.rows} rows, {args.people} people, numeric columns: {numeric_mb:.1f} MB")
+
+    print(f"{'stage':<26} {'time [s]':>9} {'peak [MB]':>10} {'peak / numeric':>15}")
+    for name, stage in STAGES.items():
+        tracemalloc.start()
+        start = time.perf_counter()
+        stage(valid_df)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        peak_mb = peak / 2**20
+        print(f"{name:<26} {elapsed:9.3f} {peak_mb:10.1f} {peak_mb / numeric_mb:14.2f}x")
+        if list(valid_df.columns) != columns:
+            raise SystemExit(f"{name} added columns to its input: {list(valid_df.columns)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare transfer count and solve time of the settlement strategies.
+
+Balances are built from zero-sum clusters of 2-4 people, shuffled together,
+so fewer transfers than the greedy matching are possible. Run from the
+repository root:
+
+    python benchmarks/bench_min_transfers.py
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from billsplittermds.amount_to_transfer import amount_to_transfer
+
+SCALES = [8, 16, 100, 1_000, 10_000]
+
+
+def make_clustered_balances(n_people, seed=0):
+    """Return should_pay / actually_paid frames (in cents) made of zero-sum clusters."""
+    rng = np.random.default_rng(seed)
+    names, should, paid = [], [], []
+    while len(names) < n_people:
+        debts = rng.integers(100, 50_000, size=rng.integers(1, 4))
+        names.append(f"p{len(names)}")
+        should.append(0)
+        paid.append(int(debts.sum()))
+        for debt in debts:
+            names.append(f"p{len(names)}")
+            should.append(int(debt))
+            paid.append(0)
+    order = rng.permutation(len(names))
+    names = np.array(names)[order]
+    return (pd.DataFrame({"name": names, "should_pay": np.array(should)[order]}),
+            pd.DataFrame({"name": names, "actually_paid": np.array(paid)[order]}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--time-budget", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{'people':>8} {'greedy':>8} {'[s]':>7} {'min_transfers':>14} {'[s]':>7}")
+    for n_people in SCALES:
+        should_pay_df, actually_paid_df = make_clustered_balances(n_people)
+        row = [f"{len(should_pay_df):>8}"]
+        for strategy in ["greedy", "min_transfers"]:
+            start = time.perf_counter()
+            result = amount_to_transfer(should_pay_df, actually_paid_df, money="cents",
+                                        strategy=strategy, time_budget=args.time_budget)
+            elapsed = time.perf_counter() - start
+            width = 8 if strategy == "greedy" else 14
+            row.append(f"{len(result):>{width}} {elapsed:7.3f}")
+        print(" ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare settle() with the four-call chain on the same validated ledger.
+
+Run from the repository root:
+
+    python benchmarks/bench_settle.py
+"""
+
+import argparse
+import time
+
+from synthetic import make_ledger
+
+from billsplittermds import (
+    amount_to_transfer,
+    individual_total_payments,
+    settle,
+    split_by_item,
+)
+
+SCALES = [(10_000, 500), (100_000, 2_000), (1_000_000, 10_000)]
+
+
+def four_calls(valid_df, money):
+    return amount_to_transfer(split_by_item(valid_df, money=money),
+                              individual_total_payments(valid_df, money=money),
+                              money=money)
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--money", choices=["float", "cents"], default="float")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'people':>8} {'4 calls [s]':>12} {'settle [s]':>11} {'speedup':>8}")
+    for n_rows, n_people in SCALES:
+        valid_df = make_ledger(n_rows, n_people)
+        if args.money == "cents":
+            valid_df["item_price"] = (valid_df["item_price"] * 100).round().astype("int64")
+        chain = best_of(lambda: four_calls(valid_df, args.money), args.repeat)
+        fused = best_of(lambda: settle(valid_df, money=args.money), args.repeat)
+        print(f"{n_rows:>10} {n_people:>8} {chain:12.3f} {fused:11.3f} {chain / fused:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
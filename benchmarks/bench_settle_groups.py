@@ -0,0 +1,52 @@
+"""Measure throughput, in groups per second, of settling many small groups.
+
+Compares one settle_groups() call with calling settle() once per group.
+Run from the repository root:
+
+    python benchmarks/bench_settle_groups.py
+"""
+
+import argparse
+import time
+
+import numpy as np
+from synthetic import make_ledger
+
+from billsplittermds import settle, settle_groups
+
+SCALES = [100, 1_000, 10_000]
+
+
+def make_groups(n_groups, rows_per_group=20, people_per_group=6, seed=0):
+    """Stack `n_groups` independent small ledgers, each with its own group_id."""
+    ledger = make_ledger(n_groups * rows_per_group, people_per_group, seed=seed)
+    ledger.insert(0, "group_id", np.repeat(np.arange(n_groups), rows_per_group))
+    return ledger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--per-group-max", type=int, default=1_000,
+                        help="skip the one-call-per-group baseline above this many groups")
+    args = parser.parse_args()
+
+    print(f"{'groups':>8} {'per group [groups/s]':>21} {'settle_groups [groups/s]':>25}")
+    for n_groups in SCALES:
+        ledger = make_groups(n_groups)
+
+        if n_groups <= args.per_group_max:
+            start = time.perf_counter()
+            for _, group in ledger.groupby("group_id"):
+                settle(group)
+            per_group = f"{n_groups / (time.perf_counter() - start):21.0f}"
+        else:
+            per_group = f"{'skipped':>21}"
+
+        start = time.perf_counter()
+        settle_groups(ledger)
+        batch = n_groups / (time.perf_counter() - start)
+        print(f"{n_groups:>8} {per_group} {batch:25.0f}")
+
+
+if __name__ == "__main__":
+    main()
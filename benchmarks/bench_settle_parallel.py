@@ -0,0 +1,48 @@
+"""Measure how settle(n_jobs=...) scales with the number of worker processes.
+
+Run from the repository root:
+
+    python benchmarks/bench_settle_parallel.py
+"""
+
+import argparse
+import os
+import time
+
+from synthetic import make_ledger
+
+from billsplittermds import settle
+
+WORKERS = [1, 2, 4, 8, 16, 32]
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--people", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=max(WORKERS))
+    args = parser.parse_args()
+
+    valid_df = make_ledger(args.rows, args.people)
+    print(f"{args.rows} rows, {args.people} people, {os.cpu_count()} CPUs")
+
+    print(f"{'workers':>8} {'time [s]':>9} {'speedup':>8}")
+    serial = None
+    for n_jobs in [n for n in WORKERS if n <= args.max_workers]:
+        elapsed = best_of(lambda: settle(valid_df, n_jobs=n_jobs), args.repeat)
+        serial = serial or elapsed
+        print(f"{n_jobs:>8} {elapsed:9.3f} {serial / elapsed:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
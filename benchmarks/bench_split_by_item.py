@@ -0,0 +1,42 @@
+"""Compare how the split_by_item engines scale with ledger size.
+
+Run from the repository root:
+
+    python benchmarks/bench_split_by_item.py
+"""
+
+import argparse
+import time
+
+from synthetic import make_ledger
+
+from billsplittermds.split_by_item import split_by_item
+
+SCALES = [(1_000, 50), (10_000, 500), (100_000, 2_000), (500_000, 5_000)]
+
+
+def time_engine(df, engine):
+    start = time.perf_counter()
+    split_by_item(df.copy(), engine=engine)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--loop-max-people", type=int, default=2_000,
+                        help="skip the 'loop' engine above this many people")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'people':>8} {'explode [s]':>12} {'loop [s]':>10}")
+    for n_rows, n_people in SCALES:
+        df = make_ledger(n_rows, n_people)
+        explode = time_engine(df, "explode")
+        if n_people <= args.loop_max_people:
+            loop = f"{time_engine(df, 'loop'):10.3f}"
+        else:
+            loop = f"{'skipped':>10}"
+        print(f"{n_rows:>10} {n_people:>8} {explode:12.3f} {loop}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Time and memory-profile every public function and the whole pipeline.
+
+Every case runs on seeded synthetic ledgers at several scales. Times are the
+best of `--repeat` runs; the memory peak is measured in one extra run under
+tracemalloc, so that tracing does not slow down the timed runs.
+
+Save a baseline once, then compare later runs against it. The comparison
+exits with status 1 if any case got slower or used more memory than the
+baseline by more than `--tolerance`. Run from the repository root:
+
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from synthetic import make_ledger
+
+from billsplittermds import (
+    amount_to_transfer,
+    individual_total_payments,
+    load_validate_data,
+    settle,
+    split_by_item,
+)
+
+SCALES = [10_000, 100_000, 1_000_000]
+
+
+def make_cases(valid_df, csv_path):
+    """Return {case name: zero-argument callable} for one ledger."""
+    should_pay_df = split_by_item(valid_df)
+    actually_paid_df = individual_total_payments(valid_df)
+    # the same items with the first sharer of each paying a double share,
+    # to keep weighted splits on par with even ones
+    weighted_df = valid_df.assign(
+        shared_by=(valid_df['shared_by'] + ';').str.replace(';', ':2;', n=1, regex=False).str[:-1])
+
+    def pipeline():
+        df = load_validate_data(csv_path)
+        return amount_to_transfer(split_by_item(df), individual_total_payments(df))
+
+    return {
+        "load_validate_data": lambda: load_validate_data(csv_path),
+        "split_by_item": lambda: split_by_item(valid_df),
+        "split_by_item_weighted": lambda: split_by_item(weighted_df),
+        "individual_total_payments": lambda: individual_total_payments(valid_df),
+        "amount_to_transfer": lambda: amount_to_transfer(should_pay_df, actually_paid_df),
+        "settle": lambda: settle(valid_df),
+        "pipeline": pipeline,
+    }
+
+
+def measure(func, repeat):
+    """Return the best wall time in seconds and the tracemalloc peak in bytes."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def run(args):
+    """Run every case at every scale and return the results as a dict."""
+    results = {}
+    print(f"{'case':<26} {'rows':>10} {'time [s]':>9} {'peak [MB]':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.scales:
+            valid_df = make_ledger(n_rows, args.people, max_shared=args.max_shared,
+                                   name_length=tuple(args.name_length))
+            csv_path = os.path.join(tmp, f"bill_{n_rows}.csv")
+            valid_df.to_csv(csv_path, index=False)
+            valid_df = load_validate_data(csv_path)
+
+            for name, func in make_cases(valid_df, csv_path).items():
+                if args.cases and name not in args.cases:
+                    continue
+                seconds, peak = measure(func, args.repeat)
+                results[f"{name}/{n_rows}"] = {"seconds": seconds, "peak_bytes": peak}
+                print(f"{name:<26} {n_rows:>10} {seconds:9.3f} {peak / 2**20:10.1f}")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print every case that regressed against `baseline`; return True if any did."""
+    regressed = False
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            before, after = baseline[key][metric], result[metric]
+            if before > 0 and after > before * (1 + tolerance):
+                regressed = True
+                print(f"REGRESSION {key} {metric}: {before:.4g} -> {after:.4g} "
+                      f"(+{after / before - 1:.0%})", file=sys.stderr)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES,
+                        help="numbers of ledger rows")
+    parser.add_argument("--people", type=int, default=1_000)
+    parser.add_argument("--max-shared", type=int, default=4,
+                        help="largest number of people sharing one item")
+    parser.add_argument("--name-length", type=int, nargs=2, default=[3, 8],
+                        metavar=("MIN", "MAX"), help="range of name lengths")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="+", help="only run these cases")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown or memory growth, as a fraction")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.tolerance):
+            return 1
+        print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Seeded synthetic ledgers for the benchmark scripts."""
+
+import numpy as np
+import pandas as pd
+
+
+def make_names(n_people, seed=0, name_length=(3, 8)):
+    """
+    Return `n_people` distinct, reproducible person names.
+
+    Every name is a random stem whose length is drawn uniformly from the
+    inclusive range `name_length`, followed by the person's number.
+    """
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    low, high = name_length
+    names = []
+    for i in range(n_people):
+        stem = "".join(rng.choice(letters, size=rng.integers(low, high + 1))).capitalize()
+        names.append(f"{stem}{i}")
+    return names
+
+
+def make_ledger(n_rows, n_people, max_shared=4, seed=0, min_shared=1, name_length=(3, 8)):
+    """
+    Build a validated-looking ledger with `n_rows` items among `n_people` people.
+
+    Every item is shared by between `min_shared` and `max_shared` distinct
+    people, drawn uniformly, and is paid for by one of them. `name_length`
+    is passed on to `make_names`.
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array(make_names(n_people, seed=seed, name_length=name_length), dtype=object)
+
+    max_shared = min(max_shared, n_people)
+    fan_out = rng.integers(min(min_shared, max_shared), max_shared + 1, size=n_rows)
+    shared_by = []
+    payer = []
+    for k in fan_out:
+        sharers = names[rng.choice(n_people, size=k, replace=False)]
+        shared_by.append(";".join(sharers))
+        payer.append(sharers[0])
+
+    return pd.DataFrame({
+        "payer": payer,
+        "item_name": "item",
+        "item_price": np.round(rng.uniform(1, 200, size=n_rows), 2),
+        "shared_by": shared_by,
+        "tax_pct": rng.choice([0.05, 0.07, 0.12, 0.15], size=n_rows),
+        "tip_pct": rng.choice([0.0, 0.10, 0.15, 0.20], size=n_rows),
+    })
@@ -1,13 +1,141 @@
 # billsplittermds - A package to help groups split trip bills fairly
+#
+# The public names are loaded lazily (PEP 562): `import billsplittermds` only
+# runs this file, and a submodule, with pandas and numpy, is imported the
+# first time one of its names is used.
 
-from billsplittermds.amount_to_transfer import amount_to_transfer
-from billsplittermds.individual_total_payments import individual_total_payments
-from billsplittermds.load_validate_data import load_validate_data
-from billsplittermds.split_by_item import split_by_item
+import importlib
+import sys
+import types
 
+# typing alone takes longer to import than the rest of this file; type
+# checkers treat a module-level TYPE_CHECKING like typing.TYPE_CHECKING
+TYPE_CHECKING = False
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    "load_validate_data": "load_validate_data",
+    "ValidationError": "load_validate_data",
+    "ValidationReport": "load_validate_data",
+    "split_by_item": "split_by_item",
+    "individual_total_payments": "individual_total_payments",
+    "amount_to_transfer": "amount_to_transfer",
+    "settle_arrays": "amount_to_transfer",
+    "iter_transfers": "amount_to_transfer",
+    "Transfer": "amount_to_transfer",
+    "settle": "settle",
+    "settle_groups": "settle",
+    "settle_async": "async_service",
+    "AsyncSettler": "async_service",
+    "TotalsAccumulator": "totals_accumulator",
+    "Ledger": "ledger",
+    "CompiledLedger": "compiled",
+    "compile_ledger": "compiled",
+    "open_ledger": "compiled",
+    "SettlementCache": "cache",
+    "CacheInfo": "cache",
+    "PersonIndex": "person_index",
+    "instrument": "instrumentation",
+    "StageRecord": "instrumentation",
+    "LoggingSink": "instrumentation",
+    "JsonLinesSink": "instrumentation",
+    "PrometheusSink": "instrumentation",
+    "FxRates": "currency",
+    "convert_currency": "currency",
+    "read_ledger": "columnar",
+    "read_table": "columnar",
+    "write_table": "columnar",
+}
+
+# a literal list, so that linters can read it; kept equal to _EXPORTS by the tests
 __all__ = [
     "load_validate_data",
+    "ValidationError",
+    "ValidationReport",
     "split_by_item",
     "individual_total_payments",
     "amount_to_transfer",
+    "settle_arrays",
+    "iter_transfers",
+    "Transfer",
+    "settle",
+    "settle_groups",
+    "settle_async",
+    "AsyncSettler",
+    "TotalsAccumulator",
+    "Ledger",
+    "CompiledLedger",
+    "compile_ledger",
+    "open_ledger",
+    "SettlementCache",
+    "CacheInfo",
+    "PersonIndex",
+    "instrument",
+    "StageRecord",
+    "LoggingSink",
+    "JsonLinesSink",
+    "PrometheusSink",
+    "FxRates",
+    "convert_currency",
+    "read_ledger",
+    "read_table",
+    "write_table",
 ]
+
+if TYPE_CHECKING:
+    from billsplittermds.amount_to_transfer import (
+        Transfer,
+        amount_to_transfer,
+        iter_transfers,
+        settle_arrays,
+    )
+    from billsplittermds.async_service import AsyncSettler, settle_async
+    from billsplittermds.cache import CacheInfo, SettlementCache
+    from billsplittermds.columnar import read_ledger, read_table, write_table
+    from billsplittermds.compiled import CompiledLedger, compile_ledger, open_ledger
+    from billsplittermds.currency import FxRates, convert_currency
+    from billsplittermds.individual_total_payments import individual_total_payments
+    from billsplittermds.instrumentation import (
+        JsonLinesSink,
+        LoggingSink,
+        PrometheusSink,
+        StageRecord,
+        instrument,
+    )
+    from billsplittermds.ledger import Ledger
+    from billsplittermds.load_validate_data import (
+        ValidationError,
+        ValidationReport,
+        load_validate_data,
+    )
+    from billsplittermds.person_index import PersonIndex
+    from billsplittermds.settle import settle, settle_groups
+    from billsplittermds.split_by_item import split_by_item
+    from billsplittermds.totals_accumulator import TotalsAccumulator
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{_EXPORTS[name]}")
+    value = getattr(module, name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(types.ModuleType):
+    """Keep functions from being replaced by the submodules they live in."""
+
+    def __setattr__(self, name, value):
+        # importing billsplittermds.settle binds the submodule as the package
+        # attribute 'settle'; the public name must stay the function
+        if name in _EXPORTS and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,7 @@
+"""Allow running the command-line interface with ``python -m billsplittermds``."""
+
+import sys
+
+from billsplittermds.cli import main
+
+sys.exit(main())
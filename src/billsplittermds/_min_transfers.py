@@ -0,0 +1,165 @@
+"""Search for zero-sum groups of balances to reduce the number of transfers.
+
+A group of k people whose balances add up to zero can always be settled with
+at most k - 1 transfers, so settling everyone takes at least
+``n - (number of disjoint zero-sum groups)`` transfers. The search below
+partitions the creditors and debtors into as many zero-sum groups as it can
+find; every group is then settled on its own by the greedy solver.
+
+- Up to ``EXACT_MAX_SIZE`` people, the best partition is found exactly by
+  dynamic programming over all subsets.
+- Above that, a bounded search first pairs people with exactly opposite
+  balances, then looks for triples (one person against two) until the time
+  budget runs out, and finally solves the remainder exactly if it has become
+  small enough, or leaves it as one group otherwise.
+
+All amounts here are integers (cents), so "sums to zero" is exact.
+"""
+
+import time
+from collections import defaultdict
+
+import numpy as np
+
+# largest number of people solved exactly; the search takes O(n * 2**n)
+EXACT_MAX_SIZE = 16
+
+
+def min_transfer_groups(creditors, debtors, time_budget=1.0, exact_max_size=EXACT_MAX_SIZE):
+    """
+    Partition creditors and debtors into groups whose balances sum to zero.
+
+    Parameters
+    ----------
+    creditors, debtors : dict
+        Map names to positive integer amounts.
+    time_budget : float
+        Seconds the bounded search may spend looking for triples.
+    exact_max_size : int
+        Largest number of people for which the exact search is used.
+
+    Returns
+    -------
+    list of (list, list)
+        The creditor names and debtor names of every group. Every name
+        appears in exactly one group.
+    """
+    deadline = time.perf_counter() + time_budget
+    creditors = dict(creditors)
+    debtors = dict(debtors)
+    groups = []
+
+    if len(creditors) + len(debtors) > exact_max_size:
+        # people with exactly opposite balances settle with one transfer
+        for creditor, debtor in _match_pairs(creditors, debtors):
+            groups.append(([creditor], [debtor]))
+
+        # one debtor against two creditors, then one creditor against two debtors
+        for single, pool, single_is_creditor in [(debtors, creditors, False),
+                                                 (creditors, debtors, True)]:
+            for one, two in _match_triples(single, pool, creditors, debtors, exact_max_size, deadline):
+                groups.append(([one], two) if single_is_creditor else (two, [one]))
+
+    if len(creditors) + len(debtors) <= exact_max_size:
+        groups.extend(_exact_groups(creditors, debtors))
+    elif creditors or debtors:
+        groups.append((list(creditors), list(debtors)))
+
+    return groups
+
+
+def _match_pairs(creditors, debtors):
+    """Remove and yield (creditor, debtor) pairs with equal amounts."""
+    by_amount = defaultdict(list)
+    for name, amount in creditors.items():
+        by_amount[amount].append(name)
+    for debtor, amount in list(debtors.items()):
+        if by_amount[amount]:
+            creditor = by_amount[amount].pop(0)
+            del creditors[creditor]
+            del debtors[debtor]
+            yield creditor, debtor
+
+
+def _match_triples(single, pool, creditors, debtors, exact_max_size, deadline):
+    """
+    Remove and yield (name, [name, name]) where one `single` equals two of `pool`.
+
+    Stops at the deadline, or as soon as the rest is small enough to be
+    solved exactly.
+    """
+    by_amount = defaultdict(list)
+    for name, amount in pool.items():
+        by_amount[amount].append(name)
+
+    for one, target in list(single.items()):
+        if time.perf_counter() > deadline or len(creditors) + len(debtors) <= exact_max_size:
+            return
+        pair = _find_pair(target, pool, by_amount)
+        if pair is None:
+            continue
+        for name in pair:
+            by_amount[pool.pop(name)].remove(name)
+        del single[one]
+        yield one, list(pair)
+
+
+def _find_pair(target, pool, by_amount):
+    """Return two names of `pool` whose amounts add up to `target`, or None."""
+    for name, amount in pool.items():
+        for other in by_amount.get(target - amount, ()):
+            if other != name:
+                return name, other
+    return None
+
+
+def _exact_groups(creditors, debtors):
+    """Return the partition with the most zero-sum groups, by search over all subsets."""
+    names = list(creditors) + list(debtors)
+    if not names:
+        return []
+    values = np.array([creditors[name] for name in creditors]
+                      + [-debtors[name] for name in debtors], dtype=np.int64)
+    n = len(names)
+    size = 1 << n
+
+    # sum and number of people of every subset, built one person at a time
+    sums = np.zeros(size, dtype=np.int64)
+    popcount = np.zeros(size, dtype=np.int64)
+    for i in range(n):
+        sums[1 << i:1 << (i + 1)] = sums[:1 << i] + values[i]
+        popcount[1 << i:1 << (i + 1)] = popcount[:1 << i] + 1
+    zero = (sums == 0).astype(np.int64)
+    zero[0] = 0
+
+    # best[mask]: most zero-sum groups in a chain of subsets ending at mask,
+    # computed for subsets of one person, then two people, and so on
+    best = np.zeros(size, dtype=np.int64)
+    masks = np.argsort(popcount, kind="stable")
+    layer_ends = np.cumsum(np.bincount(popcount, minlength=n + 1))
+    for k in range(1, n + 1):
+        layer = masks[layer_ends[k - 1]:layer_ends[k]]
+        layer_best = np.full(len(layer), -1, dtype=np.int64)
+        for i in range(n):
+            has_bit = (layer & (1 << i)) != 0
+            layer_best[has_bit] = np.maximum(layer_best[has_bit], best[layer[has_bit] ^ (1 << i)])
+        best[layer] = layer_best + zero[layer]
+
+    # walk back from everyone, cutting a group at every zero-sum subset
+    groups = []
+    mask = previous = size - 1
+    while mask:
+        if zero[mask] and mask != previous:
+            groups.append(previous & ~mask)
+            previous = mask
+        target = best[mask] - zero[mask]
+        for i in range(n):
+            if mask & (1 << i) and best[mask ^ (1 << i)] == target:
+                mask ^= 1 << i
+                break
+    groups.append(previous)
+
+    n_creditors = len(creditors)
+    return [([names[i] for i in range(n_creditors) if group >> i & 1],
+             [names[i] for i in range(n_creditors, n) if group >> i & 1])
+            for group in groups]
@@ -0,0 +1,116 @@
+"""Helpers for the money representations used across the pipeline.
+
+Every public function takes a ``money`` argument:
+
+- ``'float'`` (default) keeps amounts as float64 dollars.
+- ``'cents'`` keeps amounts as int64 cents. ``load_validate_data`` converts
+  ``item_price`` to cents, and every later stage works with NumPy integer
+  operations only, so totals reconcile to the cent.
+
+Rounding rules in ``'cents'`` mode:
+
+1. The gross cost of an item, ``item_price * (1 + tax_pct + tip_pct)``, is
+   rounded to the nearest cent once, and that same value is used for both
+   what the payer paid and what the sharers owe.
+2. Splitting ``total`` cents among ``n`` people uses the largest-remainder
+   method. Everyone gets ``total // n`` cents and the ``total % n`` leftover
+   cents go to the people with the largest fractional remainder. For an even
+   split all remainders are equal, so the leftover cents go to the first
+   people listed in ``shared_by``.
+3. Weighted and fixed shares (``"Leo:2;Ana"``, ``"Leo=12.50;Ana"``) use the
+   same rule: every share's exact value in cents is rounded down and the
+   leftover cents of the item go to the largest fractional parts, ties to
+   the people listed first.
+"""
+
+import numpy as np
+
+MONEY_MODES = ("float", "cents")
+
+
+def check_money(money):
+    """Raise a ValueError if `money` is not a supported money mode."""
+    if money not in MONEY_MODES:
+        raise ValueError(f"money must be one of {MONEY_MODES}, got {money!r} instead.")
+
+
+def to_cents(values):
+    """Convert an array-like of dollar amounts to int64 cents."""
+    values = np.asarray(values, dtype=np.float64)
+    if np.isnan(values).any():
+        raise ValueError("Money values must not be missing when money='cents'.")
+    return np.rint(values * 100).astype(np.int64)
+
+
+def whole_cents(values):
+    """
+    Return an array-like of cent amounts as int64.
+
+    Raises a ValueError instead of cutting off the fraction if an amount is
+    not a whole number of cents, such as a price of 12.99 given in dollars.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64, copy=False)
+    values = values.astype(np.float64)
+    cents = np.rint(values)
+    fractional = cents != values  # also true for missing values
+    if fractional.any():
+        bad = ", ".join(str(value) for value in values[fractional][:5])
+        raise ValueError(f"Amounts must be whole cents when money='cents', got {bad}. "
+                         f"Convert dollars with load_validate_data(..., money='cents').")
+    return cents.astype(np.int64)
+
+
+def sum_by_code(codes, weights, minlength, money):
+    """
+    Sum `weights` per non-negative integer code, like np.bincount.
+
+    In 'cents' mode the sums are int64. np.bincount adds in float64, which
+    is exact for whole cents as long as every sum stays below 2**53 cents.
+    """
+    totals = np.bincount(codes, weights=weights, minlength=minlength)
+    if money == "cents":
+        return totals.astype(np.int64)
+    return totals
+
+
+def gross_cents(valid_df):
+    """Return the cost of every item including tax and tip, in whole cents."""
+    price_cents = whole_cents(valid_df['item_price'])
+    multiplier = 1 + np.asarray(valid_df['tax_pct']) + np.asarray(valid_df['tip_pct'])
+    return np.rint(price_cents * multiplier).astype(np.int64)
+
+
+def split_cents(total, n, position):
+    """
+    Split `total` cents evenly into `n` parts with the largest-remainder rule.
+
+    `position` is the 0-based rank of each part among the parts of its total;
+    the first ``total % n`` positions receive one extra cent. All arguments
+    are broadcast against each other.
+    """
+    base, leftover = np.divmod(total, n)
+    return base + (position < leftover)
+
+
+def split_cents_weighted(total, quota, item, position):
+    """
+    Split the `total` cents of every item into parts proportional to `quota`.
+
+    `total` holds one int total per item. `quota`, `item` and `position`
+    have one entry per part: its exact value in cents, the item it belongs
+    to, and its 0-based rank among the parts of that item. Every part gets
+    its quota rounded down, and the leftover cents of each item go one each
+    to its parts with the largest fractional remainder, ties to the lowest
+    position. The parts of each item add up to its total.
+    """
+    base = np.floor(quota).astype(np.int64)
+    leftover = np.asarray(total, dtype=np.int64) - np.bincount(item, weights=base,
+                                                               minlength=len(total)).astype(np.int64)
+    # rank every part within its item by decreasing remainder, then position
+    order = np.lexsort((position, base - quota, item))
+    starts = np.cumsum(np.bincount(item, minlength=len(total))) - np.bincount(item, minlength=len(total))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order)) - starts[item[order]]
+    return base + (rank < leftover[item])
@@ -0,0 +1,126 @@
+"""Per-person totals of a large bill, computed by a pool of worker processes.
+
+The bill is cut into contiguous blocks of rows, one per worker. The parent
+writes the inputs the workers need to memory-mapped ``.npy`` files in a
+temporary directory:
+
+- the 'shared_by' column as one UTF-8 buffer with one line per item,
+- the cost of every item,
+- whether every item has a 'shared_by' value,
+- the payer of every item as an integer code.
+
+Each worker maps these files, tokenizes and sums only its own block, and
+sends back the names it saw with their partial sums. The parent then adds
+the partial sums up over one shared `PersonIndex`. Nothing proportional to
+the number of rows is ever pickled between processes.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from billsplittermds.person_index import PersonIndex
+from billsplittermds.split_by_item import _check_shared_by, _item_cost, _item_shares
+
+
+def check_n_jobs(n_jobs):
+    """
+    Return the number of worker processes to use for `n_jobs`.
+
+    ``None`` and 1 mean no worker processes, -1 means one per CPU.
+    """
+    if n_jobs is None:
+        return 1
+    if isinstance(n_jobs, bool) or not isinstance(n_jobs, int) or (n_jobs < 1 and n_jobs != -1):
+        raise ValueError(f"n_jobs must be a positive integer, -1 or None, got {n_jobs!r} instead.")
+    if n_jobs == -1:
+        return os.cpu_count() or 1
+    return n_jobs
+
+
+def parallel_person_totals(valid_df, money, n_jobs):
+    """
+    Return every person's name with what they should pay and actually paid.
+
+    Same result as `billsplittermds.settle._person_totals`, computed by
+    `n_jobs` worker processes. Returns None if the bill cannot be cut into
+    blocks of whole items, which happens when a name contains a line break,
+    or if 'shared_by' holds weighted or fixed shares, which the workers do
+    not parse.
+    """
+    _check_shared_by(valid_df)
+    n_rows = len(valid_df)
+    text = np.frombuffer('\n'.join(valid_df['shared_by'].tolist()).encode('utf-8'), dtype=np.uint8)
+
+    if (text == ord(':')).any() or (text == ord('=')).any():
+        return None
+
+    # byte range of every item's line
+    line_breaks = np.flatnonzero(text == ord('\n'))
+    if len(line_breaks) != n_rows - 1:
+        return None
+    line_starts = np.concatenate([[0], line_breaks + 1])
+    line_ends = np.append(line_breaks, len(text))
+
+    cost = _item_cost(valid_df, money)
+    payer_codes, payers = pd.factorize(valid_df['payer'])
+
+    bounds = np.linspace(0, n_rows, n_jobs + 1).astype(np.int64)
+    blocks = [(lo, hi, int(line_starts[lo]), int(line_ends[hi - 1]))
+              for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()) if hi > lo]
+
+    with tempfile.TemporaryDirectory(prefix="billsplittermds-") as directory:
+        for name, array in [('shared_by', text), ('cost', cost), ('payer', payer_codes)]:
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+
+        with ProcessPoolExecutor(max_workers=len(blocks)) as pool:
+            partials = list(pool.map(_block_totals,
+                                     *zip(*[(directory, money, len(payers)) + block
+                                            for block in blocks])))
+
+    # reduce the partial sums over one index of everyone seen by any worker
+    people = PersonIndex(np.concatenate([np.asarray(payers, dtype=object)]
+                                        + [consumers for consumers, _, _ in partials]))
+    consumers, block_should_pay, block_paid = zip(*partials)
+    should_pay = people.bincount(people.encode(np.concatenate(consumers)),
+                                 np.concatenate(block_should_pay), money)
+    actually_paid = people.bincount(people.encode(payers), np.sum(block_paid, axis=0), money)
+    return people.names, should_pay, actually_paid
+
+
+def _block_totals(directory, money, n_payers, lo, hi, byte_lo, byte_hi):
+    """
+    Sum the items in rows `lo` to `hi` of the bill saved in `directory`.
+
+    Returns the distinct consumer names of the block, what each of them
+    should pay, and what every payer paid, indexed by payer code.
+    """
+    def load(name):
+        return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+
+    text = np.asarray(load('shared_by')[byte_lo:byte_hi])
+    cost = np.asarray(load('cost')[lo:hi])
+    payer_codes = np.asarray(load('payer')[lo:hi])
+
+    # count the consumers of every line straight from the bytes
+    line_breaks = np.flatnonzero(text == ord('\n'))
+    line_starts = np.concatenate([[0], line_breaks + 1])
+    line_ends = np.append(line_breaks, len(text))
+    separators = np.concatenate([[0], np.cumsum(text == ord(';'))])
+    tokens_per_line = separators[line_ends] - separators[line_starts] + 1
+
+    # one split over the whole block
+    tokens = text.tobytes().decode('utf-8').replace('\n', ';').split(';')
+    names = np.array(tokens, dtype=object)
+    num_shared_people = tokens_per_line
+
+    codes, consumers = pd.factorize(names)
+    should_pay = np.bincount(codes, weights=_item_shares(cost, num_shared_people, money),
+                             minlength=len(consumers))
+
+    paid_rows = payer_codes >= 0
+    paid = np.bincount(payer_codes[paid_rows], weights=cost[paid_rows], minlength=n_payers)
+    return np.asarray(consumers, dtype=object), should_pay, paid
@@ -1,17 +1,39 @@
 """Module for calculating money transfers to settle debts."""
 
-from decimal import Decimal
+import heapq
+from decimal import ROUND_FLOOR, Decimal
+from typing import Any, NamedTuple
 
+import numpy as np
 import pandas as pd
 
+from billsplittermds._min_transfers import min_transfer_groups
+from billsplittermds._money import check_money, sum_by_code, whole_cents
+from billsplittermds.instrumentation import _instrumented, _stage
+
 CENT = Decimal("0.01")
 
+STRATEGIES = ("greedy", "min_transfers")
+
+
+class Transfer(NamedTuple):
+    """One transfer: `sender` pays `amount` to `receiver`."""
+
+    sender: Any
+    receiver: Any
+    amount: Any
 
-def amount_to_transfer(should_pay_df, actually_paid_df):
+
+@_instrumented("amount_to_transfer")
+def amount_to_transfer(should_pay_df, actually_paid_df, money="float", strategy="greedy",
+                       time_budget=1.0):
     """
     Compute money transfers required to settle individual balances.
 
     This function takes the outputs of 'split_by_item' and 'individual_total_payments' functions and determines how much money should be transferred between individuals, so that each person's final spending equals the amount they should have paid.
+    Callers that hold the totals in arrays can use 'settle_arrays' instead,
+    and callers that want each transfer as soon as it is found can use
+    'iter_transfers'.
 
     Parameters
     ----------
@@ -23,6 +45,26 @@ def amount_to_transfer(should_pay_df, actually_paid_df):
         Dataframe containing the amount each individual actually paid.
         Typically the output of 'individual_total_payments'.
 
+    money : {'float', 'cents'}, default 'float'
+        With 'float', balances are settled as decimals and every balance within
+        one cent of zero is treated as settled. With 'cents', both inputs must
+        hold int64 cents, balances are settled with integer arithmetic, every
+        non-zero cent is transferred and 'amount' is returned as int64 cents.
+
+    strategy : {'greedy', 'min_transfers'}, default 'greedy'
+        How debtors are matched with creditors.
+
+        - 'greedy' repeatedly matches the largest debtor with the largest creditor.
+        - 'min_transfers' first splits people into as many groups as it can
+          find whose balances sum to zero, then settles each group greedily.
+          A group of k people needs at most k - 1 transfers, so this usually
+          gives fewer transfers. The search is exact for up to 16 people with
+          a non-zero balance; above that it matches opposite balances and
+          then one-against-two triples within `time_budget`.
+
+    time_budget : float, default 1.0
+        Seconds the 'min_transfers' search may spend on large groups.
+
     Returns
     -------
     result_df : pandas.DataFrame
@@ -35,7 +77,8 @@ def amount_to_transfer(should_pay_df, actually_paid_df):
     Raises
     ------
     ValueError
-        If required columns are missing from input dataframes.
+        If required columns are missing from input dataframes,
+        or if `money` or `strategy` is not supported.
 
 
     Examples
@@ -57,7 +100,71 @@ def amount_to_transfer(should_pay_df, actually_paid_df):
     0   Mia     Leo         20.0
     1   Mia     Ana         10.0
     """
+    names, should_pay, actually_paid = _input_totals(should_pay_df, actually_paid_df,
+                                                      money, strategy)
+    return _settle_balances(names, should_pay, actually_paid, money,
+                            strategy=strategy, time_budget=time_budget)
+
+
+def iter_transfers(should_pay_df, actually_paid_df, money="float", strategy="greedy",
+                   time_budget=1.0):
+    """
+    Yield the transfers of 'amount_to_transfer' one at a time, as they are found.
+
+    Inputs are checked and balances are computed when this function is
+    called; the transfers themselves are computed lazily, so a caller can
+    start acting on the first ones (for example submitting payments) before
+    the whole settlement is done, and nothing but the solver's own state is
+    kept in memory. With the 'greedy' strategy every transfer is produced
+    by one step of the solver. With 'min_transfers' the zero-sum groups are
+    searched before the first transfer, then each group is settled lazily.
+
+    Parameters
+    ----------
+    should_pay_df, actually_paid_df : pandas.DataFrame
+        As in 'amount_to_transfer'.
+
+    money : {'float', 'cents'}, default 'float'
+        As in 'amount_to_transfer'. Amounts are Decimals rounded to the cent
+        with 'float' and int cents with 'cents'.
+
+    strategy : {'greedy', 'min_transfers'}, default 'greedy'
+        As in 'amount_to_transfer'.
+
+    time_budget : float, default 1.0
+        As in 'amount_to_transfer'.
+
+    Returns
+    -------
+    iterator of Transfer
+        Named tuples with the fields 'sender', 'receiver' and 'amount', in
+        the same order as the rows of 'amount_to_transfer'.
+
+    Raises
+    ------
+    ValueError
+        If required columns are missing from input dataframes,
+        or if `money` or `strategy` is not supported.
+
+    Examples
+    --------
+    >>> for transfer in iter_transfers(should_pay_df, actually_paid_df):
+    ...     submit_payment(transfer.sender, transfer.receiver, transfer.amount)
+    """
+    names, should_pay, actually_paid = _input_totals(should_pay_df, actually_paid_df,
+                                                      money, strategy)
+    transfers = _iter_index_transfers(_balances(should_pay, actually_paid, money), money,
+                                      strategy, time_budget)
+    return _named_transfers(names, transfers)
 
+
+def _input_totals(should_pay_df, actually_paid_df, money, strategy):
+    """
+    Check the inputs of 'amount_to_transfer' and line up their totals.
+
+    Returns aligned arrays of names, what each person should pay and what
+    they actually paid.
+    """
     # Validate required columns in should_pay_df
     if 'name' not in should_pay_df.columns or 'should_pay' not in should_pay_df.columns:
         raise ValueError("should_pay_df must have columns 'name' and 'should_pay'")
@@ -66,63 +173,304 @@ def amount_to_transfer(should_pay_df, actually_paid_df):
     if 'name' not in actually_paid_df.columns or 'actually_paid' not in actually_paid_df.columns:
         raise ValueError("actually_paid_df must have columns 'name' and 'actually_paid'")
 
+    check_money(money)
+    _check_strategy(strategy)
+
+    # Results over the same PersonIndex line up by code, no merge needed
+    should_names, paid_names = should_pay_df['name'], actually_paid_df['name']
+    if (isinstance(should_names.dtype, pd.CategoricalDtype)
+            and isinstance(paid_names.dtype, pd.CategoricalDtype)
+            and should_names.cat.categories.equals(paid_names.cat.categories)):
+        return _aligned_totals(should_pay_df, actually_paid_df, money)
+
     # Merge the two dataframes
     merged_df = pd.merge(should_pay_df, actually_paid_df, on='name', how='outer')
 
     # Fill NaN with 0 (in case someone only appears in one dataframe)
-    merged_df['should_pay'] = merged_df['should_pay'].fillna(0)
-    merged_df['actually_paid'] = merged_df['actually_paid'].fillna(0)
+    return (merged_df['name'], merged_df['should_pay'].fillna(0),
+            merged_df['actually_paid'].fillna(0))
 
-    # Calculate balance: positive means overpaid (should receive), negative means underpaid (should send)
-    merged_df['balance'] = (
-    merged_df['actually_paid'].apply(lambda x: Decimal(str(x))) -
-    merged_df['should_pay'].apply(lambda x: Decimal(str(x))))
 
-    # Separate into creditors (overpaid) and debtors (underpaid)
-    balances = merged_df[['name', 'balance']].copy()
+def _check_strategy(strategy):
+    """Raise a ValueError if `strategy` is not a supported settlement strategy."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r} instead.")
 
-    # Create lists to track transfers
-    transfers = []
 
-    # Get creditors and debtors
-    creditors = balances[balances['balance'] > CENT].copy()  # Small threshold for floating point
-    debtors = balances[balances['balance'] < -CENT].copy()
+def _aligned_totals(should_pay_df, actually_paid_df, money="float"):
+    """Sum two results whose 'name' columns share the same categories by code."""
+    names = should_pay_df['name'].cat.categories
+    totals = []
+    for df, col in [(should_pay_df, 'should_pay'), (actually_paid_df, 'actually_paid')]:
+        codes = df['name'].cat.codes.to_numpy()
+        known = codes >= 0
+        totals.append(sum_by_code(codes[known], df[col].fillna(0).to_numpy()[known],
+                                  len(names), money))
+    return names, totals[0], totals[1]
 
-    # Convert to dictionaries for easier manipulation
-    creditor_dict = dict(zip(creditors['name'], creditors['balance']))
-    debtor_dict = dict(zip(debtors['name'], -debtors['balance']))  # Make positive
 
-    # Settle debts by matching debtors with creditors
-    while creditor_dict and debtor_dict:
-        # Get the largest creditor and debtor
-        creditor = max(creditor_dict, key=creditor_dict.get)
-        debtor = max(debtor_dict, key=debtor_dict.get)
+@_instrumented("settle_arrays")
+def settle_arrays(names, balances=None, should_pay=None, actually_paid=None, money="float",
+                  strategy="greedy", time_budget=1.0):
+    """
+    Compute the transfers that settle per-person balances held in NumPy arrays.
 
-        # Calculate transfer amount
-        transfer_amount = min(creditor_dict[creditor], debtor_dict[debtor])
-
-        if transfer_amount > CENT:  # Only record non-trivial transfers
-            transfers.append({
-                'sender': debtor,
-                'receiver': creditor,
-                'amount': transfer_amount.quantize(CENT)
-            })
-
-        # Update balances
-        creditor_dict[creditor] -= transfer_amount
-        debtor_dict[debtor] -= transfer_amount
-
-        # Remove settled accounts
-        if creditor_dict[creditor] < CENT:
-            del creditor_dict[creditor]
-        if debtor_dict[debtor] < CENT:
-            del debtor_dict[debtor]
-
-    # Create result dataframe
+    This is the settlement step of 'amount_to_transfer' without any
+    dataframe: no merge, no column checks and no result frame. People are
+    referred to by their position in `names`, so callers that already keep
+    totals in arrays (for example over a 'PersonIndex') can settle them
+    directly and look up names only if they need them.
+
+    Parameters
+    ----------
+    names : array-like
+        One entry per person. Only its length is used; the returned indices
+        are positions in `names`.
+
+    balances : array-like, optional
+        What each person actually paid minus what they should have paid.
+        Positive balances receive money and negative balances send it.
+
+    should_pay, actually_paid : array-like, optional
+        Per-person totals to settle instead of `balances`. Pass either
+        `balances` or both of these.
+
+    money : {'float', 'cents'}, default 'float'
+        As in 'amount_to_transfer'. With 'cents' the inputs must hold whole
+        cents and 'amount' is returned as int64 cents.
+
+    strategy : {'greedy', 'min_transfers'}, default 'greedy'
+        As in 'amount_to_transfer'.
+
+    time_budget : float, default 1.0
+        As in 'amount_to_transfer'.
+
+    Returns
+    -------
+    numpy.ndarray
+        A structured array with one record per transfer and the fields
+        'sender' and 'receiver' (int64 positions in `names`) and 'amount'
+        (float64, or int64 cents with ``money='cents'``). Equal balances
+        are matched in the order of `names`, so the transfers come in the
+        same order as the rows of 'amount_to_transfer' only when `names` is
+        sorted, the order its merge puts people in.
+
+    Raises
+    ------
+    ValueError
+        If neither or both kinds of input are given, if the inputs do not
+        have one entry per name, or if `money` or `strategy` is not supported.
+
+    Examples
+    --------
+    >>> transfers = settle_arrays(["Leo", "Ana", "Mia"], np.array([20.0, 10.0, -30.0]))
+    >>> transfers
+    array([(2, 0, 20.), (2, 1, 10.)],
+          dtype=[('sender', '<i8'), ('receiver', '<i8'), ('amount', '<f8')])
+    """
+    check_money(money)
+    _check_strategy(strategy)
+    if balances is not None:
+        if should_pay is not None or actually_paid is not None:
+            raise ValueError("Pass either balances or should_pay and actually_paid, not both.")
+        arrays = [balances]
+    elif should_pay is None or actually_paid is None:
+        raise ValueError("Pass either balances or both should_pay and actually_paid.")
+    else:
+        arrays = [should_pay, actually_paid]
+    if any(len(values) != len(names) for values in arrays):
+        raise ValueError("Balances must have one entry per name.")
+
+    if balances is None:
+        balances = _balances(should_pay, actually_paid, money)
+    elif money == "cents":
+        balances = whole_cents(balances).tolist()
+    else:
+        balances = [Decimal(str(balance)) for balance in np.asarray(balances).tolist()]
+    transfers = _index_transfers(balances, money, strategy, time_budget)
+
+    dtype = np.int64 if money == "cents" else np.float64
+    result = np.empty(len(transfers), dtype=[('sender', np.int64), ('receiver', np.int64),
+                                             ('amount', dtype)])
+    if transfers:
+        senders, receivers, amounts = zip(*transfers)
+        result['sender'] = senders
+        result['receiver'] = receivers
+        result['amount'] = np.array(amounts, dtype=dtype)
+    return result
+
+
+def _settle_balances(names, should_pay, actually_paid, money="float", strategy="greedy",
+                     time_budget=1.0):
+    """
+    Return the transfers dataframe that settles the given per-person totals.
+
+    `names`, `should_pay` and `actually_paid` are aligned array-likes with one
+    entry per person; ties between equal balances are broken by their order.
+    """
+    transfers = _index_transfers(_balances(should_pay, actually_paid, money), money,
+                                 strategy, time_budget)
+
+    # Create result dataframe, looking names up by position in one step
     if transfers:
-        result_df = pd.DataFrame(transfers)
+        senders, receivers, amounts = zip(*transfers)
+        names = np.asarray(names, dtype=object)
+        result_df = pd.DataFrame({'sender': names[list(senders)],
+                                  'receiver': names[list(receivers)],
+                                  'amount': list(amounts)})
     else:
         result_df = pd.DataFrame(columns=['sender', 'receiver', 'amount'])
+    if money == "cents":
+        result_df['amount'] = result_df['amount'].astype('int64')
 
     return result_df
 
+
+def _balance_transfers(names, should_pay, actually_paid, money="float", strategy="greedy",
+                       time_budget=1.0):
+    """
+    Return the transfers that settle the given per-person totals.
+
+    Same as `_settle_balances`, but as a list of `Transfer` records, for
+    callers that settle many small groups.
+    """
+    transfers = _index_transfers(_balances(should_pay, actually_paid, money), money,
+                                 strategy, time_budget)
+    return list(_named_transfers(names, transfers))
+
+
+def _named_transfers(names, transfers):
+    """Yield (debtor, creditor, amount) position tuples as `Transfer` records of names."""
+    names = np.asarray(names, dtype=object)
+    for debtor, creditor, amount in transfers:
+        yield Transfer(names[debtor], names[creditor], amount)
+
+
+def _balances(should_pay, actually_paid, money):
+    """
+    Return every person's balance as a list: int cents, or Decimal dollars.
+
+    Positive means overpaid (should receive), negative means underpaid (should send).
+    """
+    if money == "cents":
+        return (whole_cents(actually_paid) - whole_cents(should_pay)).tolist()
+    return [Decimal(str(paid)) - Decimal(str(should))
+            for paid, should in zip(np.asarray(actually_paid).tolist(),
+                                    np.asarray(should_pay).tolist())]
+
+
+def _index_transfers(balances, money="float", strategy="greedy", time_budget=1.0):
+    """
+    Return the transfers that settle `balances`, as (debtor, creditor, amount) tuples.
+
+    Debtors and creditors are positions in `balances`. Float amounts are
+    Decimals rounded to the cent; cent amounts are ints.
+    """
+    # Settle debts by matching debtors with creditors
+    with _stage("settlement_loop", rows=len(balances)):
+        return list(_iter_index_transfers(balances, money, strategy, time_budget))
+
+
+def _iter_index_transfers(balances, money="float", strategy="greedy", time_budget=1.0):
+    """
+    Return an iterator over the transfers of `_index_transfers`.
+
+    Creditors and debtors are sorted out right away; every transfer is
+    computed only when the iterator gets to it.
+    """
+    tol = 0 if money == "cents" else CENT  # Small threshold for floating point
+
+    # Separate into creditors (overpaid) and debtors (underpaid), made positive
+    creditor_dict = {i: balance for i, balance in enumerate(balances) if balance > tol}
+    debtor_dict = {i: -balance for i, balance in enumerate(balances) if balance < -tol}
+
+    if strategy == "min_transfers":
+        transfers = _settle_min_transfers(creditor_dict, debtor_dict, money, time_budget)
+    else:
+        transfers = _settle_greedy(creditor_dict, debtor_dict, tol)
+    if money == "cents":
+        return transfers
+    return ((debtor, creditor, amount.quantize(CENT)) for debtor, creditor, amount in transfers)
+
+
+def _settle_min_transfers(creditor_dict, debtor_dict, money, time_budget):
+    """
+    Split people into zero-sum groups and settle each group greedily.
+
+    Float balances are first rounded to whole cents by `_round_to_cents`,
+    which keeps their total; the groups are searched on those cents and
+    settled on them, so nobody is left off by a cent or more, where settling
+    every group on its exact balances could leave each group's rounding
+    unsettled. The search runs right away; the transfers are yielded lazily.
+    """
+    if money == "float":
+        creditor_dict, debtor_dict = _round_to_cents(creditor_dict, debtor_dict)
+
+    groups = min_transfer_groups(creditor_dict, debtor_dict, time_budget=time_budget)
+    transfers = (transfer for creditors, debtors in groups
+                 for transfer in _settle_greedy({name: creditor_dict[name] for name in creditors},
+                                                {name: debtor_dict[name] for name in debtors},
+                                                0))
+    if money == "cents":
+        return transfers
+    return ((debtor, creditor, amount * CENT) for debtor, creditor, amount in transfers)
+
+
+def _round_to_cents(creditor_dict, debtor_dict):
+    """
+    Round Decimal balances to int cents without changing their total by a cent.
+
+    Every balance is rounded down, and the cents this loses in total are
+    given back one each to the balances that lost the most, so every
+    balance moves by less than a cent and their sum stays as close to the
+    exact one as whole cents allow.
+    """
+    cents = {name: amount / CENT for name, amount in creditor_dict.items()}
+    cents.update((name, -amount / CENT) for name, amount in debtor_dict.items())
+    rounded = {name: int(amount.to_integral_value(rounding=ROUND_FLOOR))
+               for name, amount in cents.items()}
+    lost = int(sum(cents.values()).to_integral_value()) - sum(rounded.values())
+    for name in sorted(cents, key=lambda name: cents[name] - rounded[name], reverse=True)[:lost]:
+        rounded[name] += 1
+    return ({name: rounded[name] for name in creditor_dict},
+            {name: -rounded[name] for name in debtor_dict})
+
+
+def _settle_greedy(creditor_dict, debtor_dict, tol=CENT):
+    """
+    Repeatedly match the largest debtor with the largest creditor.
+
+    Both dictionaries map people to positive amounts. Transfers of at most
+    `tol` are not recorded and accounts left with less than `tol` (or with
+    nothing) are treated as settled. Ties are broken by dictionary order.
+    The two sides are kept in max-heaps, so settling n people takes
+    O(n log n) instead of a full scan per transfer.
+
+    Yields (debtor, creditor, amount) tuples, one per step of the loop.
+    """
+    # heap entries are (-amount, position, name); the position breaks ties
+    # in dictionary order and keeps names from ever being compared
+    creditor_heap = [(-amount, i, name) for i, (name, amount) in enumerate(creditor_dict.items())]
+    debtor_heap = [(-amount, i, name) for i, (name, amount) in enumerate(debtor_dict.items())]
+    heapq.heapify(creditor_heap)
+    heapq.heapify(debtor_heap)
+
+    while creditor_heap and debtor_heap:
+        # Get the largest creditor and debtor
+        neg_credit, creditor_pos, creditor = heapq.heappop(creditor_heap)
+        neg_debt, debtor_pos, debtor = heapq.heappop(debtor_heap)
+        credit, debt = -neg_credit, -neg_debt
+
+        # Calculate transfer amount
+        transfer_amount = min(credit, debt)
+
+        if transfer_amount > tol:  # Only record non-trivial transfers
+            yield debtor, creditor, transfer_amount
+
+        # Update balances, putting back accounts that are not settled yet
+        credit -= transfer_amount
+        debt -= transfer_amount
+        if credit > 0 and not credit < tol:
+            heapq.heappush(creditor_heap, (-credit, creditor_pos, creditor))
+        if debt > 0 and not debt < tol:
+            heapq.heappush(debtor_heap, (-debt, debtor_pos, debtor))
@@ -0,0 +1,150 @@
+"""Module for settling bills from asyncio code without blocking the event loop."""
+
+import asyncio
+import functools
+import os
+
+from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.settle import settle
+
+
+async def settle_async(data, money="float", strategy="greedy", time_budget=1.0, executor=None):
+    """
+    Run 'settle' in an executor and await its transfers.
+
+    Parameters
+    ----------
+    data : str, os.PathLike or pandas.DataFrame
+        Path of a csv file or an already validated dataframe, as in 'settle'.
+
+    money, strategy, time_budget
+        Passed on to 'settle'.
+
+    executor : concurrent.futures.Executor, optional
+        Pool to run the settlement in. Defaults to the event loop's default
+        thread pool. Pass a ``ProcessPoolExecutor`` for bills large enough
+        that holding the GIL would slow down other requests.
+
+    Returns
+    -------
+    result_df : pandas.DataFrame
+        The transfers, exactly as returned by 'settle'.
+
+    Examples
+    --------
+    >>> transfers = await settle_async("trip.csv")
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(
+        settle, data, money=money, strategy=strategy, time_budget=time_budget))
+
+
+class AsyncSettler:
+    """
+    Settle bills for many concurrent callers, at most `max_concurrency` at a time.
+
+    Jobs run in `executor`, so the event loop stays free. Once
+    `max_concurrency` jobs are running, further calls wait for a free slot
+    before anything is submitted, so a burst of requests queues up as
+    waiting coroutines instead of piling work and memory into the pool.
+    `running` and `waiting` count the jobs in each state. A settler belongs
+    to the first event loop that uses it.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor, optional
+        Pool the jobs run in. Defaults to the event loop's default thread pool.
+
+    max_concurrency : int, optional
+        Largest number of jobs running at once. Defaults to the number of CPUs.
+
+    Examples
+    --------
+    >>> settler = AsyncSettler(ProcessPoolExecutor(4), max_concurrency=4)
+    >>> transfers = await settler.settle("trip.csv")
+    >>> results = await settler.settle_many(["paris.csv", "rome.csv"])
+    """
+
+    def __init__(self, executor=None, max_concurrency=None):
+        if max_concurrency is None:
+            max_concurrency = os.cpu_count() or 1
+        if isinstance(max_concurrency, bool) or not isinstance(max_concurrency, int) or max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be a positive integer, got {max_concurrency!r} instead.")
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.waiting = 0
+        # created on first use, inside the event loop that uses it
+        self._slots = None
+
+    async def _run(self, func, *args, **kwargs):
+        """Wait for a free slot, then run ``func(*args, **kwargs)`` in the executor."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+    async def load_validate_data(self, csv_path, money="float", engine="auto", rates=None):
+        """Run 'load_validate_data' on one file in the executor and await the dataframe."""
+        return await self._run(load_validate_data, csv_path, money=money, engine=engine,
+                               rates=rates)
+
+    async def settle(self, data, money="float", strategy="greedy", time_budget=1.0):
+        """Run 'settle' in the executor and await its transfers."""
+        return await self._run(settle, data, money=money, strategy=strategy,
+                               time_budget=time_budget)
+
+    async def settle_many(self, inputs, return_exceptions=False, **options):
+        """
+        Settle every bill in `inputs` concurrently and return the results in order.
+
+        Csv files are loaded and validated in the executor as part of each
+        job, so reading many files overlaps as well. `inputs` is consumed
+        lazily: at most `max_concurrency` bills are in flight at a time.
+
+        Parameters
+        ----------
+        inputs : iterable
+            Paths of csv files or validated dataframes.
+
+        return_exceptions : bool, default False
+            If True, a bill that fails (for example with a ValidationError)
+            gives its exception in place of its result instead of raising.
+
+        **options
+            Passed on to 'settle'.
+
+        Returns
+        -------
+        list
+            One transfers dataframe, or exception, per input.
+        """
+        iterator = enumerate(inputs)
+        results = {}
+
+        async def worker():
+            for i, data in iterator:
+                try:
+                    results[i] = await self.settle(data, **options)
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    results[i] = error
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.max_concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return [results[i] for i in range(len(results))]
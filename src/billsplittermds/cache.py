@@ -0,0 +1,247 @@
+"""Module for caching validated bills and settlements by content."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.settle import settle
+
+
+class CacheInfo(NamedTuple):
+    """Counters of a `SettlementCache`, in the style of ``functools.lru_cache``."""
+
+    hits: int
+    misses: int
+    disk_hits: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class SettlementCache:
+    """
+    A cache of validated bills and transfer tables, keyed by content.
+
+    Results are stored under a hash of the input (the bytes of a file, or
+    the values, index, columns and dtypes of a dataframe) together with the
+    options used, so an unchanged bill is never validated or settled twice
+    and a changed one is never served a stale result. The most recently used
+    results are kept in memory; with a `directory`, every result is also
+    written to disk and survives the process.
+
+    Parameters
+    ----------
+    maxsize : int or None, default 128
+        Number of results kept in memory. The least recently used one is
+        dropped first. None keeps everything.
+
+    directory : str or os.PathLike, optional
+        Directory for the on-disk store. It is created if needed. Results
+        are stored as JSON data, never as pickles, so a store written by
+        someone else can at worst hold wrong results, not run code.
+
+    Examples
+    --------
+    >>> cache = SettlementCache(maxsize=32, directory="~/.cache/bills")
+    >>> transfers = cache.settle("trip.csv")   # validated and settled
+    >>> transfers = cache.settle("trip.csv")   # served from memory
+    >>> cache.info()
+    CacheInfo(hits=1, misses=2, disk_hits=0, maxsize=32, currsize=2)
+    """
+
+    def __init__(self, maxsize=128, directory=None):
+        if maxsize is not None and (isinstance(maxsize, bool) or not isinstance(maxsize, int)
+                                    or maxsize < 0):
+            raise ValueError(f"maxsize must be a non-negative integer or None, got {maxsize!r} instead.")
+        self.maxsize = maxsize
+        self.directory = None
+        if directory is not None:
+            self.directory = os.path.expanduser(os.fspath(directory))
+            os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    def info(self):
+        """Return the hit and miss counters and the current size."""
+        return CacheInfo(self.hits, self.misses, self.disk_hits, self.maxsize, len(self))
+
+    def clear(self):
+        """Drop every result kept in memory and reset the counters. The disk store is kept."""
+        with self._lock:
+            self._results.clear()
+            self.hits = self.misses = self.disk_hits = 0
+
+    def load_validate_data(self, csv_path, money="float", engine="auto"):
+        """
+        Return the validated bill of `csv_path`, as 'load_validate_data' does.
+
+        The file is only read and validated when its content, or the options,
+        have not been seen before. Chunked reading is not cached.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A copy of the stored validated bill.
+        """
+        key = _key("load_validate_data", _file_digest(csv_path), money=money, engine=engine)
+        return self._get_or_compute(key, lambda: load_validate_data(csv_path, money=money,
+                                                                     engine=engine))
+
+    def settle(self, data, money="float", strategy="greedy", time_budget=1.0):
+        """
+        Return the transfers that settle `data`, as 'settle' does.
+
+        `data` may be a csv path, whose validated bill is cached as well, or
+        a validated dataframe.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A copy of the stored transfer table.
+        """
+        if isinstance(data, pd.DataFrame):
+            digest = _frame_digest(data)
+
+            def compute():
+                return settle(data, money=money, strategy=strategy, time_budget=time_budget)
+        else:
+            digest = _file_digest(data)
+
+            def compute():
+                return settle(self.load_validate_data(data, money=money), money=money,
+                              strategy=strategy, time_budget=time_budget)
+
+        key = _key("settle", digest, money=money, strategy=strategy, time_budget=time_budget)
+        return self._get_or_compute(key, compute)
+
+    def _get_or_compute(self, key, compute):
+        """Return a copy of the result stored under `key`, computing and storing it if needed."""
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result.copy()
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+        if result is None:
+            result = compute()
+            self._write_disk(key, result)
+
+        with self._lock:
+            self._results[key] = result.copy()
+            self._results.move_to_end(key)
+            while self.maxsize is not None and len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+    def _read_disk(self, key):
+        """Return the result stored on disk under `key`, or None."""
+        if self.directory is None:
+            return None
+        path = os.path.join(self.directory, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return _frame_from_json(json.load(f))
+
+    def _write_disk(self, key, result):
+        """Store `result` on disk under `key`, if there is a disk store."""
+        if self.directory is None:
+            return
+        # write to a temporary file first so readers never see half a file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(_frame_to_json(result), f)
+            os.replace(tmp_path, os.path.join(self.directory, f"{key}.json"))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def _key(kind, digest, **options):
+    """Combine the kind of result, the content digest and the options into one key."""
+    options = ",".join(f"{name}={value!r}" for name, value in sorted(options.items()))
+    return hashlib.blake2b(f"{kind}|{digest}|{options}".encode(), digest_size=16).hexdigest()
+
+
+def _file_digest(path, block_size=1 << 20):
+    """Hash the bytes of the file at `path`."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _frame_digest(df):
+    """Hash the values, index, column names and dtypes of `df`."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _frame_to_json(df):
+    """
+    Return `df` as JSON-serializable data that `_frame_from_json` turns back into it.
+
+    Every column keeps its dtype: categoricals are stored as their categories
+    and codes, and object columns of Decimal amounts as strings.
+    """
+    columns = []
+    for name, col in df.items():
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            columns.append({"name": name, "kind": "category",
+                            "categories": col.cat.categories.tolist(),
+                            "ordered": bool(col.cat.ordered), "codes": col.cat.codes.tolist()})
+        elif col.dtype == object and len(col) and all(isinstance(v, Decimal) for v in col):
+            columns.append({"name": name, "kind": "decimal", "values": [str(v) for v in col]})
+        else:
+            columns.append({"name": name, "kind": "values", "dtype": str(col.dtype),
+                            "values": col.tolist()})
+    if isinstance(df.index, pd.RangeIndex):
+        index = {"start": df.index.start, "stop": df.index.stop, "step": df.index.step}
+    else:
+        index = {"dtype": str(df.index.dtype), "values": df.index.tolist()}
+    return {"columns": columns, "index": index}
+
+
+def _frame_from_json(data):
+    """Inverse of `_frame_to_json`."""
+    index = data["index"]
+    if "start" in index:
+        index = pd.RangeIndex(index["start"], index["stop"], index["step"])
+    else:
+        index = pd.Index(index["values"], dtype=index["dtype"])
+    columns = {}
+    for col in data["columns"]:
+        if col["kind"] == "category":
+            values = pd.Categorical.from_codes(col["codes"], categories=col["categories"],
+                                               ordered=col["ordered"])
+        elif col["kind"] == "decimal":
+            values = pd.Series([Decimal(v) for v in col["values"]], dtype=object, index=index)
+        else:
+            values = pd.Series(col["values"], dtype=col["dtype"], index=index)
+        columns[col["name"]] = values
+    return pd.DataFrame(columns, index=index)
@@ -0,0 +1,250 @@
+"""Command-line interface: settle one or many bills from csv files.
+
+Examples
+--------
+Settle one bill and print the transfers::
+
+    billsplittermds trip.csv
+
+Settle every bill in a directory with four worker processes, writing one
+Parquet file of transfers per bill, and print how long every stage took::
+
+    billsplittermds bills/ --output-dir transfers/ --format parquet --jobs 4 --profile
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+OUTPUT_FORMATS = ("csv", "json", "parquet")
+
+# pipeline stages, in the order they run and are reported by --profile
+STAGES = ("load", "totals", "settle")
+
+
+def main(argv=None):
+    """
+    Run the command-line interface.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Command-line arguments, without the program name. Defaults to
+        ``sys.argv[1:]``.
+
+    Returns
+    -------
+    int
+        Exit status: 0 if every bill was settled, 1 if any bill failed
+        validation or could not be read, and 2 for invalid arguments.
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    paths, unmatched = _expand_inputs(args.inputs)
+    if unmatched:
+        parser.error("no such file, directory or matching glob: " + " ".join(unmatched))
+    if not paths:
+        parser.error("no csv files found in " + " ".join(args.inputs))
+    output_format = args.format or _infer_format(args.output)
+    if output_format == "parquet" and args.output_dir is None and args.output in (None, "-"):
+        parser.error("--format parquet needs --output or --output-dir")
+    if args.output_dir is not None:
+        clashes = _clashing_stems(paths)
+        if clashes:
+            parser.error("--output-dir would write several inputs to the same file: "
+                         + "; ".join(" and ".join(group) for group in clashes))
+
+    options = {"money": args.money, "strategy": args.strategy, "time_budget": args.time_budget}
+    if args.jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(paths))) as pool:
+            results = list(pool.map(_settle_file, paths, [options] * len(paths)))
+    else:
+        results = [_settle_file(path, options) for path in paths]
+
+    failed = False
+    settled = []
+    for path, transfers, timings, error in results:
+        if error is not None:
+            failed = True
+            print(f"{path}: {error}", file=sys.stderr)
+            continue
+        settled.append((path, transfers, timings))
+
+    start = time.perf_counter()
+    try:
+        if args.output_dir is not None:
+            os.makedirs(args.output_dir, exist_ok=True)
+            for path, transfers, _ in settled:
+                stem = _stem(path)
+                _write(transfers, os.path.join(args.output_dir, f"{stem}.{output_format}"),
+                       output_format)
+        elif settled:
+            if len(paths) > 1:
+                import pandas as pd
+
+                transfers = pd.concat([t.assign(file=path)[["file", "sender", "receiver", "amount"]]
+                                       for path, t, _ in settled], ignore_index=True)
+            else:
+                transfers = settled[0][1]
+            _write(transfers, args.output, output_format)
+    except (ImportError, OSError) as error:
+        print(f"billsplittermds: cannot write the transfers: {error}", file=sys.stderr)
+        return 1
+    write_time = time.perf_counter() - start
+
+    if args.profile:
+        _print_profile(settled, write_time)
+    return 1 if failed else 0
+
+
+def _build_parser():
+    """Return the argument parser of the command-line interface."""
+    parser = argparse.ArgumentParser(
+        prog="billsplittermds",
+        description="Compute the transfers that settle shared bills.",
+    )
+    parser.add_argument("inputs", nargs="+", metavar="INPUT",
+                        help="csv file, directory of csv files, or glob pattern")
+    destination = parser.add_mutually_exclusive_group()
+    destination.add_argument("-o", "--output", metavar="PATH",
+                             help="file to write the transfers to (default: standard output). "
+                                  "With several inputs a 'file' column tells the bills apart.")
+    destination.add_argument("--output-dir", metavar="DIR",
+                             help="write one transfers file per input into DIR instead")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS,
+                        help="output format (default: from the --output suffix, else csv)")
+    parser.add_argument("--money", choices=("float", "cents"), default="float",
+                        help="money representation (default: %(default)s)")
+    parser.add_argument("--strategy", choices=("greedy", "min_transfers"), default="greedy",
+                        help="settlement strategy (default: %(default)s)")
+    parser.add_argument("--time-budget", type=float, default=1.0, metavar="SECONDS",
+                        help="time the min_transfers search may spend (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=_positive_int, default=1, metavar="N",
+                        help="number of files to settle in parallel (default: %(default)s)")
+    parser.add_argument("--profile", action="store_true",
+                        help="print how long every stage took to standard error")
+    return parser
+
+
+def _stem(path):
+    """Return the file name of `path` without its suffix, which names its output file."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _clashing_stems(paths):
+    """Return the groups of input paths that would share an output file name."""
+    by_stem = {}
+    for path in paths:
+        by_stem.setdefault(_stem(path), []).append(path)
+    return [group for group in by_stem.values() if len(group) > 1]
+
+
+def _positive_int(value):
+    """Parse a positive integer command-line value."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def _expand_inputs(inputs):
+    """
+    Turn files, directories and glob patterns into a sorted list of distinct csv files.
+
+    Returns ``(paths, unmatched)``, where `unmatched` lists the inputs that are
+    neither an existing file or directory nor a glob pattern matching a file.
+    """
+    paths = []
+    unmatched = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(glob.glob(os.path.join(item, "*.csv"))))
+        elif os.path.exists(item):
+            paths.append(item)
+        else:
+            matches = sorted(glob.glob(item))
+            if not matches:
+                unmatched.append(item)
+            paths.extend(matches)
+    return list(dict.fromkeys(paths)), unmatched
+
+
+def _infer_format(output):
+    """Return the output format implied by the suffix of `output`, defaulting to csv."""
+    if output in (None, "-"):
+        return "csv"
+    suffix = os.path.splitext(output)[1].lower().lstrip(".")
+    if suffix in ("parquet", "pq"):
+        return "parquet"
+    return suffix if suffix in OUTPUT_FORMATS else "csv"
+
+
+def _settle_file(path, options):
+    """
+    Settle the bill in the csv file at `path`, timing every stage.
+
+    Returns ``(path, transfers, timings, error)``. If the bill cannot be read
+    or validated, `transfers` is None and `error` holds the message.
+    """
+    from billsplittermds.amount_to_transfer import _settle_balances
+    from billsplittermds.load_validate_data import load_validate_data
+    from billsplittermds.settle import _person_totals
+
+    timings = {}
+    try:
+        start = time.perf_counter()
+        valid_df = load_validate_data(path, money=options["money"])
+        timings["load"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        names, should_pay, actually_paid = _person_totals(valid_df, options["money"])
+        timings["totals"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        transfers = _settle_balances(names, should_pay, actually_paid, **options)
+        timings["settle"] = time.perf_counter() - start
+    except (OSError, ValueError) as error:
+        return path, None, timings, str(error)
+    return path, transfers, timings, None
+
+
+def _write(transfers, output, output_format):
+    """Write the transfers to `output`, or to standard output if it is None or '-'."""
+    to_stdout = output in (None, "-")
+    if output_format == "parquet":
+        from billsplittermds.columnar import write_table
+
+        write_table(transfers, output, format="parquet")
+    elif output_format == "json":
+        # float amounts are Decimal objects, which to_json would write as strings;
+        # cents amounts are already int64 and stay whole numbers
+        if transfers["amount"].dtype == object:
+            transfers = transfers.assign(amount=transfers["amount"].astype(float))
+        text = transfers.to_json(orient="records", indent=2)
+        if to_stdout:
+            print(text)
+        else:
+            with open(output, "w") as f:
+                f.write(text + "\n")
+    else:
+        transfers.to_csv(sys.stdout if to_stdout else output, index=False)
+
+
+def _print_profile(settled, write_time):
+    """Print the time every stage took, per file and in total, to standard error."""
+    totals = dict.fromkeys(STAGES, 0.0)
+    width = max([len(path) for path, _, _ in settled] + [len("total")])
+    print(f"{'file':<{width}} " + " ".join(f"{stage + ' [s]':>11}" for stage in STAGES),
+          file=sys.stderr)
+    for path, _, timings in settled:
+        for stage in STAGES:
+            totals[stage] += timings[stage]
+        print(f"{path:<{width}} " + " ".join(f"{timings[stage]:11.4f}" for stage in STAGES),
+              file=sys.stderr)
+    print(f"{'total':<{width}} " + " ".join(f"{totals[stage]:11.4f}" for stage in STAGES),
+          file=sys.stderr)
+    print(f"write: {write_time:.4f} s", file=sys.stderr)
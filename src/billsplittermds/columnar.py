@@ -0,0 +1,194 @@
+"""Module for storing bills and results in columnar Parquet or Arrow IPC files."""
+
+import os
+
+from billsplittermds.load_validate_data import REQUIRED_COLS
+
+# file suffix -> storage format
+FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+    ".feather": "ipc",
+}
+
+
+def write_table(df, path, format=None):
+    """
+    Write a validated bill or a result dataframe to a columnar file.
+
+    Arrow IPC files are written uncompressed so that `read_table` can memory-map
+    them without copying; Parquet files use the default Snappy compression.
+    Column dtypes, including the categorical 'payer' column, are kept.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe to write, typically the output of 'load_validate_data',
+        'split_by_item', 'individual_total_payments' or 'amount_to_transfer'.
+
+    path : str or os.PathLike
+        Destination file.
+
+    format : {'parquet', 'ipc'}, optional
+        Storage format. Inferred from the suffix of `path` if not given:
+        '.parquet' and '.pq' for Parquet, '.arrow', '.ipc' and '.feather'
+        for Arrow IPC.
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed.
+    ValueError
+        If the format is not supported or cannot be inferred.
+
+    Examples
+    --------
+    >>> valid_df = load_validate_data("trip.csv")
+    >>> write_table(valid_df, "trip.arrow")
+    """
+    format = _resolve_format(path, format)
+    pa, feather, pq = _import_pyarrow()
+
+    table = pa.Table.from_pandas(df)
+    if format == "parquet":
+        pq.write_table(table, path)
+    else:
+        feather.write_feather(table, path, compression="uncompressed")
+
+
+def read_table(path, columns=None, memory_map=True, format=None):
+    """
+    Read a dataframe written by `write_table`.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        File to read.
+
+    columns : list of str, optional
+        Only read these columns. Columnar formats skip the others entirely.
+
+    memory_map : bool, default True
+        Memory-map the file instead of reading it into memory first. For
+        uncompressed Arrow IPC files the columns are then read without copying.
+
+    format : {'parquet', 'ipc'}, optional
+        Storage format. Inferred from the suffix of `path` if not given.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The stored dataframe, restricted to `columns` if given.
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed.
+    ValueError
+        If the format is not supported or cannot be inferred.
+
+    Examples
+    --------
+    >>> read_table("trip.arrow", columns=["payer", "item_price"])
+        payer   item_price
+    0   Amy     10.0
+    1   Sam     25.0
+    2   Ben     20.0
+    """
+    format = _resolve_format(path, format)
+    _, feather, pq = _import_pyarrow()
+
+    if format == "parquet":
+        table = pq.read_table(path, columns=columns, memory_map=memory_map)
+    else:
+        table = feather.read_table(path, columns=columns, memory_map=memory_map)
+    return table.to_pandas()
+
+
+def read_ledger(path, columns=None, memory_map=True, format=None):
+    """
+    Read a validated bill written by `write_table`.
+
+    The values are not validated again; they were validated by
+    'load_validate_data' before being written. Only the presence of the
+    required columns is checked.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        File to read.
+
+    columns : list of str, optional
+        Only read these columns, for example ``['payer', 'item_price',
+        'tax_pct', 'tip_pct']`` for 'individual_total_payments'.
+
+    memory_map : bool, default True
+        Memory-map the file instead of reading it into memory first.
+
+    format : {'parquet', 'ipc'}, optional
+        Storage format. Inferred from the suffix of `path` if not given.
+
+    Returns
+    -------
+    valid_df : pandas.DataFrame
+        The stored bill.
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed.
+    ValueError
+        If a required (or requested) column is missing from the file, or if
+        the format is not supported.
+
+    Examples
+    --------
+    >>> valid_df = read_ledger("trip.arrow")
+    >>> should_pay_df = split_by_item(valid_df)
+    """
+    expected = REQUIRED_COLS if columns is None else columns
+    available = _column_names(path, _resolve_format(path, format))
+    missing = set(expected).difference(available)
+    if missing:
+        missing_str = ", ".join(sorted(missing))
+        raise ValueError(f"Missing required column(s): {missing_str}")
+
+    return read_table(path, columns=columns, memory_map=memory_map, format=format)
+
+
+def _resolve_format(path, format):
+    """Return the storage format given explicitly or implied by the file suffix."""
+    if format is None:
+        suffix = os.path.splitext(os.fspath(path))[1].lower()
+        if suffix not in FORMATS:
+            raise ValueError(f"Cannot infer the format of {os.fspath(path)!r}, "
+                             f"pass format='parquet' or format='ipc'.")
+        return FORMATS[suffix]
+    if format not in ("parquet", "ipc"):
+        raise ValueError(f"format must be 'parquet' or 'ipc', got {format!r} instead.")
+    return format
+
+
+def _column_names(path, format):
+    """Return the column names stored in a file without reading any data."""
+    pa, _, pq = _import_pyarrow()
+    if format == "parquet":
+        return pq.read_schema(path).names
+    with pa.memory_map(os.fspath(path)) as source:
+        return pa.ipc.open_file(source).schema.names
+
+
+def _import_pyarrow():
+    """Import the pyarrow modules used here, with a helpful error if missing."""
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError(
+            "Reading and writing Parquet or Arrow files requires pyarrow. "
+            "Install it with: pip install 'billsplittermds[arrow]'"
+        ) from exc
+    return pa, feather, pq
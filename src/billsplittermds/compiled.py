@@ -0,0 +1,353 @@
+"""Module for compiling a validated bill into memory-mapped binary files.
+
+A compiled ledger is a directory of ``.npy`` files and one ``meta.json``:
+
+- 'item_price', 'tax_pct' and 'tip_pct': one flat array each, float64, or
+  int64 cents for 'item_price' in a ledger compiled with ``money='cents'``,
+- 'names' and 'names_offsets': every person once, sorted, as one UTF-8
+  buffer with the byte offsets of every name,
+- 'payer': the payer of every item as an int32 code into the names, -1 if
+  missing,
+- 'share_offsets' and 'share_person': 'shared_by' in compressed sparse row
+  form; the consumers of item i are
+  ``share_person[share_offsets[i]:share_offsets[i + 1]]``, in 'shared_by'
+  order,
+- 'share_weight' and 'share_fixed': the weight and fixed amount of every
+  consumer, only in ledgers with weighted or fixed shares,
+- 'item_name' and 'item_name_offsets': the item names, like the names.
+
+Opening a ledger maps these files with ``numpy.load(mmap_mode='r')``, so it
+takes the same few milliseconds whatever the length of the bill, and the
+per-person totals are computed straight from the mapped arrays: the
+'shared_by' strings are never parsed again.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from billsplittermds._money import check_money, whole_cents
+from billsplittermds.amount_to_transfer import _check_strategy, _settle_balances
+from billsplittermds.instrumentation import _instrumented
+from billsplittermds.load_validate_data import REQUIRED_COLS
+from billsplittermds.person_index import PersonIndex
+from billsplittermds.split_by_item import (
+    _item_cost,
+    _item_shares,
+    _parse_shared_by,
+    _weighted_shares,
+)
+
+FORMAT = "billsplittermds-ledger"
+VERSION = 1
+
+
+@_instrumented("compile_ledger")
+def compile_ledger(valid_df, path, money="float"):
+    """
+    Compile a validated bill into a directory of memory-mappable arrays.
+
+    'shared_by' is tokenized once here, weights and fixed amounts included,
+    and every name is replaced by an integer code. Re-settling the bill
+    from the compiled ledger then skips reading, validating and tokenizing
+    the csv file altogether.
+
+    Parameters
+    ----------
+    valid_df : pandas.DataFrame
+        A validated bill, typically the output of 'load_validate_data'.
+
+    path : str or os.PathLike
+        Directory to write the ledger to. It is created if needed, and
+        files of a ledger already in it are overwritten.
+
+    money : {'float', 'cents'}, default 'float'
+        Money representation of `valid_df`, as in the other functions. It
+        is stored with the ledger and used by every computation on it.
+
+    Returns
+    -------
+    CompiledLedger
+        The ledger just written, opened from disk.
+
+    Raises
+    ------
+    ValueError
+        If a required column is missing, if `money` is not supported, or
+        if a weight or amount in 'shared_by' is invalid.
+
+    Examples
+    --------
+    >>> compile_ledger(load_validate_data("year.csv"), "year.ledger")
+    CompiledLedger('year.ledger', 1000000 items, 40 people)
+    """
+    check_money(money)
+    missing = set(REQUIRED_COLS).difference(valid_df.columns)
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(sorted(missing))}")
+
+    consumers, num_shared_people, weights = _parse_shared_by(valid_df)
+    _, payers = pd.factorize(valid_df['payer'])
+    _, distinct_consumers = pd.factorize(consumers)
+    people = PersonIndex(np.concatenate([np.asarray(payers, dtype=object),
+                                         np.asarray(distinct_consumers, dtype=object)]))
+
+    names, names_offsets = _encode_strings(people.names)
+    item_names, item_name_offsets = _encode_strings(valid_df['item_name'].fillna(''))
+    arrays = {
+        'item_price': (whole_cents(valid_df['item_price']) if money == "cents"
+                       else valid_df['item_price'].to_numpy(dtype=np.float64)),
+        'tax_pct': valid_df['tax_pct'].to_numpy(dtype=np.float64),
+        'tip_pct': valid_df['tip_pct'].to_numpy(dtype=np.float64),
+        'names': names,
+        'names_offsets': names_offsets,
+        'payer': people.encode(valid_df['payer']),
+        'share_offsets': np.concatenate([[0], np.cumsum(num_shared_people)]).astype(np.int64),
+        'share_person': people.encode(consumers),
+        'item_name': item_names,
+        'item_name_offsets': item_name_offsets,
+    }
+    if weights is not None:
+        arrays['share_weight'], arrays['share_fixed'] = weights
+
+    path = os.fspath(path)
+    os.makedirs(path, exist_ok=True)
+    # the metadata goes last, so an interrupted write never looks complete
+    meta_path = os.path.join(path, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array)
+    meta = {'format': FORMAT, 'version': VERSION, 'money': money, 'items': len(valid_df),
+            'people': len(people), 'weighted': weights is not None}
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    return CompiledLedger(path)
+
+
+@_instrumented("open_ledger")
+def open_ledger(path):
+    """
+    Open a ledger written by `compile_ledger`, mapping its arrays into memory.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Directory of the ledger.
+
+    Returns
+    -------
+    CompiledLedger
+
+    Raises
+    ------
+    ValueError
+        If `path` does not hold a compiled ledger of a supported version.
+
+    Examples
+    --------
+    >>> ledger = open_ledger("year.ledger")
+    >>> ledger.transfers(strategy="min_transfers")
+    """
+    return CompiledLedger(path)
+
+
+class CompiledLedger:
+    """
+    A bill compiled by `compile_ledger`, with its columns mapped from disk.
+
+    Nothing is read until it is used, and then only the pages that are
+    touched. The totals are computed the way 'split_by_item' and
+    'individual_total_payments' compute them, over the mapped arrays, and
+    give the same results as those functions on the original bill.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Directory of the ledger, as written by `compile_ledger`.
+
+    Attributes
+    ----------
+    money : {'float', 'cents'}
+        Money representation the ledger was compiled with.
+
+    Raises
+    ------
+    ValueError
+        If `path` does not hold a compiled ledger of a supported version.
+
+    Examples
+    --------
+    >>> ledger = open_ledger("year.ledger")
+    >>> ledger.should_pay_df()
+        name   should_pay
+    0   Ana    3892.10
+    1   Leo    4102.77
+    >>> settle(ledger)
+        sender  receiver    amount
+    0   Ana     Leo         105.34
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        try:
+            with open(os.path.join(self.path, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise ValueError(f"{self.path!r} is not a compiled ledger.") from exc
+        if meta.get('format') != FORMAT or meta.get('version') != VERSION:
+            raise ValueError(f"{self.path!r} is not a compiled ledger of version {VERSION}.")
+        self.money = meta['money']
+        self._meta = meta
+        self._arrays = {}
+        self._people = None
+
+    def __len__(self):
+        return self._meta['items']
+
+    def __repr__(self):
+        return (f"CompiledLedger({self.path!r}, {len(self)} items, "
+                f"{self._meta['people']} people)")
+
+    def __getitem__(self, name):
+        """Return the mapped array `name`, mapping it on first use."""
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+        return self._arrays[name]
+
+    @property
+    def people(self):
+        """The `PersonIndex` whose codes the ledger's arrays hold."""
+        if self._people is None:
+            self._people = PersonIndex(_decode_strings(self['names'], self['names_offsets']))
+        return self._people
+
+    def should_pay_df(self):
+        """
+        Return what each person should pay, as ``split_by_item(valid_df, people=...)`` does.
+
+        Returns
+        -------
+        should_pay_df : pandas.DataFrame
+            One row per person in `people`, with 'name' as a categorical
+            over it and 'should_pay'.
+        """
+        people = self.people
+        return pd.DataFrame({
+            'name': people.categorical(np.arange(len(people))),
+            'should_pay': self._should_pay(_item_cost(self, self.money)),
+        })
+
+    def actually_paid_df(self):
+        """
+        Return what each person actually paid, as 'individual_total_payments' does.
+
+        Returns
+        -------
+        actually_paid_df : pandas.DataFrame
+            One row per person in `people`, with 'name' as a categorical
+            over it and 'actually_paid'.
+        """
+        people = self.people
+        return pd.DataFrame({
+            'name': people.categorical(np.arange(len(people))),
+            'actually_paid': people.bincount(self['payer'], _item_cost(self, self.money),
+                                             self.money),
+        })
+
+    def transfers(self, strategy="greedy", time_budget=1.0):
+        """
+        Return the transfers that settle the ledger, exactly as 'settle' on the original bill.
+
+        Parameters
+        ----------
+        strategy : {'greedy', 'min_transfers'}, default 'greedy'
+            Settlement strategy, as in 'amount_to_transfer'.
+
+        time_budget : float, default 1.0
+            Seconds the 'min_transfers' search may spend, as in 'amount_to_transfer'.
+
+        Returns
+        -------
+        result_df : pandas.DataFrame
+            Columns 'sender', 'receiver' and 'amount'.
+        """
+        _check_strategy(strategy)
+        names, should_pay, actually_paid = self._totals()
+        return _settle_balances(names, should_pay, actually_paid, self.money,
+                                strategy=strategy, time_budget=time_budget)
+
+    def to_frame(self):
+        """
+        Rebuild the validated bill the ledger was compiled from.
+
+        Missing payers come back as missing, missing item names as empty
+        strings, and 'shared_by' is rebuilt from the codes, weights and
+        fixed amounts, so its text may differ from the original.
+
+        Returns
+        -------
+        valid_df : pandas.DataFrame
+        """
+        names = self.people.names.to_numpy()
+        num_shared_people = np.diff(np.asarray(self['share_offsets']))
+        tokens = names[np.asarray(self['share_person'])]
+        if self._meta['weighted']:
+            weight, fixed = np.asarray(self['share_weight']), np.asarray(self['share_fixed'])
+            # fixed shares are the only ones with weight 0
+            tokens = np.where(weight == 0, tokens + '=' + fixed.astype(str),
+                              np.where(weight == 1, tokens, tokens + ':' + weight.astype(str)))
+        shared_by = [';'.join(item) for item in np.split(tokens, np.cumsum(num_shared_people)[:-1])]
+        return pd.DataFrame({
+            'payer': self.people.categorical(np.array(self['payer'])),
+            'item_name': _decode_strings(self['item_name'], self['item_name_offsets']),
+            'item_price': np.array(self['item_price']),
+            'shared_by': pd.Series(shared_by, dtype=object).where(num_shared_people > 0),
+            'tax_pct': np.array(self['tax_pct']),
+            'tip_pct': np.array(self['tip_pct']),
+        })
+
+    def _totals(self):
+        """Return every person's name with what they should pay and actually paid."""
+        cost = _item_cost(self, self.money)
+        actually_paid = self.people.bincount(self['payer'], cost, self.money)
+        return self.people.names, self._should_pay(cost), actually_paid
+
+    def _should_pay(self, cost):
+        """Split `cost` over the mapped 'shared_by' arrays and sum it per person."""
+        num_shared_people = np.diff(np.asarray(self['share_offsets']))
+        if self._meta['weighted']:
+            multiplier = 1 + np.asarray(self['tax_pct']) + np.asarray(self['tip_pct'])
+            shares = _weighted_shares(np.asarray(self['item_price']), multiplier, cost,
+                                      num_shared_people, np.asarray(self['share_weight']),
+                                      np.asarray(self['share_fixed']), self.money)
+        else:
+            shares = _item_shares(cost, num_shared_people, self.money)
+        return self.people.bincount(self['share_person'], shares, self.money)
+
+
+def _check_compiled(ledger, money, people=None):
+    """Raise a ValueError if `ledger` cannot be used with these options."""
+    if ledger.money != money:
+        raise ValueError(f"The ledger was compiled with money={ledger.money!r}, "
+                         f"got money={money!r} instead.")
+    if people is not None:
+        raise ValueError("A compiled ledger has its own people; do not pass people.")
+
+
+def _encode_strings(values):
+    """Return strings as one UTF-8 buffer and the byte offsets of every string."""
+    encoded = [str(value).encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_strings(buffer, offsets):
+    """Inverse of `_encode_strings`, as an object array."""
+    data = np.asarray(buffer).tobytes()
+    bounds = np.asarray(offsets).tolist()
+    return np.array([data[lo:hi].decode('utf-8') for lo, hi in zip(bounds[:-1], bounds[1:])],
+                    dtype=object)
@@ -0,0 +1,215 @@
+"""Module for converting bills in several currencies to one base currency."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# columns of a rate table
+RATE_COLS = ["date", "currency", "rate"]
+
+
+class FxRates:
+    """
+    A table of exchange rates into one base currency, looked up by date.
+
+    The rate of a currency on a date is the latest rate listed on or before
+    that date (an as-of lookup), so a table with one row per working day
+    still converts expenses made on weekends. Every (currency, date) pair
+    is looked up once and then remembered.
+
+    Parameters
+    ----------
+    rates_df : pandas.DataFrame
+        Columns 'date', 'currency' and 'rate', where 'rate' is the value of
+        one unit of 'currency' in the base currency on 'date'.
+
+    base : str, default 'USD'
+        The currency bills are converted to. It always has rate 1.
+
+    Raises
+    ------
+    ValueError
+        If a column is missing, or if a rate is missing, not positive or
+        not a number.
+
+    Examples
+    --------
+    >>> rates = FxRates.read_csv("rates.csv", base="USD")
+    >>> rates.lookup(["EUR", "USD"], ["2024-07-06", "2024-07-06"])
+    array([1.0841, 1.    ])
+    """
+
+    def __init__(self, rates_df, base="USD"):
+        missing = set(RATE_COLS).difference(rates_df.columns)
+        if missing:
+            raise ValueError(f"Missing required column(s) in rates: {', '.join(sorted(missing))}")
+        rate = pd.to_numeric(rates_df['rate'], errors='coerce')
+        if not (rate > 0).all():
+            raise ValueError("Every rate must be a positive number.")
+
+        table = pd.DataFrame({'currency': rates_df['currency'].astype(str),
+                              'date': _to_days(rates_df['date']),
+                              'rate': rate.to_numpy(dtype=np.float64)})
+        table = table.sort_values(['currency', 'date'], kind='stable')
+        self.base = base
+        # currency -> (sorted days, rates), for searchsorted
+        self._tables = {currency: (group['date'].to_numpy(), group['rate'].to_numpy())
+                        for currency, group in table.groupby('currency', sort=False)}
+        self._memo = {}
+
+    @classmethod
+    def read_csv(cls, path, base="USD"):
+        """Read a rate table from a csv file with columns 'date', 'currency' and 'rate'."""
+        return cls(pd.read_csv(os.path.expanduser(os.fspath(path))), base=base)
+
+    @property
+    def currencies(self):
+        """Every currency with at least one rate, and the base currency."""
+        return sorted(set(self._tables) | {self.base})
+
+    def lookup(self, currencies, dates=None):
+        """
+        Return the rate of every (currency, date) pair as a float64 array.
+
+        Parameters
+        ----------
+        currencies : array-like of str
+            Currency of every pair.
+        dates : array-like, optional
+            Date of every pair, as anything ``pandas.to_datetime`` reads. If
+            not given, the latest rate of every currency is used.
+
+        Raises
+        ------
+        ValueError
+            If a currency has no rate on or before its date.
+        """
+        currencies = np.asarray(currencies, dtype=object)
+        if dates is None:
+            days = np.full(len(currencies), np.iinfo(np.int64).max)
+        else:
+            days = _to_days(dates)
+
+        # only distinct pairs are looked up, and only the first time
+        codes, pairs = pd.factorize(pd.MultiIndex.from_arrays([currencies, days]))
+        pair_rates = np.array([self._memo.get(pair, np.nan) for pair in pairs])
+        new = np.isnan(pair_rates)
+        if new.any():
+            pair_rates[new] = self._search(pairs.get_level_values(0)[new].to_numpy(dtype=object),
+                                           pairs.get_level_values(1)[new].to_numpy())
+            self._memo.update(zip(pairs[new], pair_rates[new].tolist()))
+        return pair_rates[codes]
+
+    def _search(self, currencies, days):
+        """Look up the as-of rate of every pair with one searchsorted per currency."""
+        result = np.full(len(currencies), np.nan)
+        for currency in pd.unique(currencies):
+            mask = currencies == currency
+            if currency == self.base:
+                result[mask] = 1.0
+                continue
+            if currency not in self._tables:
+                raise ValueError(f"No exchange rate for currency {currency!r}.")
+            table_days, table_rates = self._tables[currency]
+            position = np.searchsorted(table_days, days[mask], side='right') - 1
+            if (position < 0).any():
+                first = pd.Timestamp(table_days[0], unit='D').date()
+                raise ValueError(f"No exchange rate for {currency!r} before {first}.")
+            result[mask] = table_rates[position]
+        return result
+
+
+def convert_currency(valid_df, rates, date=None, money="float"):
+    """
+    Convert every item price to the base currency of `rates`.
+
+    A bill with a 'currency' column is converted row by row: every row is
+    joined with the rate of its currency on its date, from the 'date'
+    column if there is one, or else on `date`. Rows without a currency are
+    taken to be in the base currency already. The input dataframe is never
+    modified.
+
+    Parameters
+    ----------
+    valid_df : pandas.DataFrame
+        A validated bill, typically the output of 'load_validate_data'.
+
+    rates : FxRates
+        The exchange rates to use.
+
+    date : str or datetime-like, optional
+        Date of every expense, for bills without a 'date' column. If neither
+        is given, the latest rate of every currency is used.
+
+    money : {'float', 'cents'}, default 'float'
+        With 'cents', 'item_price' holds int64 cents and every converted
+        price is rounded to a whole cent.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The bill with 'item_price' in the base currency and 'currency' set
+        to it. A bill without a 'currency' column is returned as it is.
+
+    Raises
+    ------
+    ValueError
+        If a currency has no rate on or before the date of one of its rows.
+
+    Examples
+    --------
+    >>> valid_df
+        payer  item_name  item_price  shared_by  tax_pct  tip_pct  currency        date
+    0   Leo    taxi       25.0        Leo;Ana    0.07     0.0      EUR       2024-07-06
+    1   Ana    lunch      20.0        Ana        0.12     0.15     USD       2024-07-06
+    >>> convert_currency(valid_df, rates)['item_price']
+    0    27.1025
+    1    20.0000
+    Name: item_price, dtype: float64
+    """
+    if 'currency' not in valid_df.columns:
+        return valid_df
+
+    currencies = valid_df['currency'].astype(object).fillna(rates.base).to_numpy()
+    if 'date' in valid_df.columns:
+        dates = valid_df['date']
+    elif date is not None:
+        dates = np.repeat(pd.Timestamp(date).to_datetime64(), len(valid_df))
+    else:
+        dates = None
+    rate = rates.lookup(currencies, dates)
+
+    price = valid_df['item_price'].to_numpy() * rate
+    if money == "cents":
+        price = np.rint(price).astype(np.int64)
+    return valid_df.assign(item_price=price, currency=rates.base)
+
+
+def check_single_currency(valid_df, seen=None):
+    """
+    Raise a ValueError if `valid_df` has amounts in more than one currency.
+
+    A missing currency counts as a currency of its own, since
+    'convert_currency' takes it to be the base currency. `seen` may hold
+    the currencies of earlier chunks of the same bill; it is updated in
+    place, so that chunks in different currencies are rejected too.
+    """
+    if 'currency' not in valid_df.columns:
+        return
+    currency = valid_df['currency'].astype(object)
+    found = set(currency.where(currency.notna(), None).unique())
+    if seen is not None:
+        seen.update(found)
+        found = seen
+    if len(found) > 1:
+        listed = ", ".join(sorted("missing" if value is None else str(value) for value in found))
+        raise ValueError(f"The bill mixes currencies ({listed}); pass rates to convert them.")
+
+
+def _to_days(dates):
+    """Convert dates to int64 days since the epoch, so they sort and compare cheaply."""
+    days = pd.to_datetime(pd.Series(dates)).to_numpy(dtype='datetime64[D]')
+    if np.isnat(days).any():
+        raise ValueError("Dates must not be missing.")
+    return days.astype(np.int64)
@@ -1,25 +1,54 @@
 """Module for calculating how much each person actually paid."""
 
+import numpy as np
 import pandas as pd
 
+from billsplittermds._money import check_money
+from billsplittermds.compiled import CompiledLedger, _check_compiled
+from billsplittermds.instrumentation import _instrumented
+from billsplittermds.split_by_item import _item_cost
 
-def individual_total_payments(valid_df):
+
+@_instrumented("individual_total_payments")
+def individual_total_payments(valid_df, money="float", people=None):
     """
     Calculate the net amount to pay per item and return a dataframe with the total payment amount per person.
 
-    First, this function takes in valid payments dataframe and derives a new column 'item_paymant' which is the total cost of each item including tax and tip.
-    Then, it groups the datafram by the person who originally paid for the item and sums up the cost.
+    First, this function takes in valid payments dataframe and computes the total cost of each item including tax and tip.
+    Then, it groups these costs by the person who originally paid for the item and sums them up.
+    The input dataframe is never modified.
 
     Parameters
     ----------
-    valid_df : pandas.DataFrame
+    valid_df : pandas.DataFrame or CompiledLedger
         A dataframe containing validated data read from the input CSV file.
-        Typically the output of load_validate_data() function.
+        Typically the output of load_validate_data() function. A ledger
+        opened with 'open_ledger' is summed straight from its memory-mapped
+        arrays, as 'CompiledLedger.actually_paid_df' does.
+
+    money : {'float', 'cents'}, default 'float'
+        With 'cents', 'item_price' must hold int64 cents and 'actually_paid' is
+        returned as int64 cents. Each item's cost is rounded to a whole cent
+        exactly as in ``split_by_item(..., money='cents')``, so both totals
+        reconcile.
+
+    people : PersonIndex, optional
+        A shared index of everyone in the bill. If given, totals are summed
+        over its integer codes and the result has one row per person in the
+        index, in index order, with 'name' as a categorical over the index.
 
     Returns
     -------
     actually_paid_df : pandas.DataFrame
-        Dataframe with columns 'payer' and 'actually_paid'.
+        Dataframe with columns 'name' and 'actually_paid'.
+
+    Raises
+    ------
+    TypeError
+        If `valid_df` is not a pandas.DataFrame or a CompiledLedger.
+    ValueError
+        If `money` is not supported, if a payer is not in `people`, or if a
+        compiled ledger is passed with another `money` or with `people`.
 
     Examples
     --------
@@ -36,14 +65,33 @@ def individual_total_payments(valid_df):
 
     """
     # Validate input parameter is of type pandas.DataFrame
+    if isinstance(valid_df, CompiledLedger):
+        _check_compiled(valid_df, money, people)
+        return valid_df.actually_paid_df()
     if isinstance(valid_df, pd.DataFrame) is False:
         raise TypeError(f"Input parameter 'valid_df' must be of type pandas.DataFrame, got {type(valid_df)} instead.")
+    check_money(money)
+
+    # Calculate item_payment including tax and tip, as an array outside valid_df
+    item_payment = _item_cost(valid_df, money)
 
-    # Calculate item_payment including tax and tip
-    valid_df['item_payment'] = valid_df['item_price'] * (1 + valid_df['tax_pct'] + valid_df['tip_pct'])
+    if people is not None:
+        codes = people.encode(valid_df['payer'])
+        if ((codes < 0) & valid_df['payer'].notna().to_numpy()).any():
+            raise ValueError("Some names in 'payer' are not in people.")
+        return pd.DataFrame({
+            'name': people.categorical(np.arange(len(people))),
+            'actually_paid': people.bincount(codes, item_payment, money),
+        })
 
     # Group by payer and sum the item_payment to get actually_paid output
-    actually_paid_df = valid_df.groupby('payer', as_index=False)['item_payment'].sum()
-    actually_paid_df.rename(columns={'payer': 'name', 'item_payment': 'actually_paid'}, inplace=True)
+    item_payment = pd.Series(item_payment, index=valid_df.index)
+    actually_paid = item_payment.groupby(valid_df['payer'], observed=True).sum()
+    actually_paid_df = actually_paid.rename_axis('name').reset_index(name='actually_paid')
+
+    # Return plain names, like split_by_item, even when 'payer' is categorical
+    if isinstance(actually_paid_df['name'].dtype, pd.CategoricalDtype):
+        names = actually_paid_df['name']
+        actually_paid_df['name'] = names.astype(names.cat.categories.dtype)
 
     return actually_paid_df
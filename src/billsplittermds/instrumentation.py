@@ -0,0 +1,290 @@
+"""Module for recording how long every stage of a settlement takes.
+
+Instrumentation is off by default. Inside ``with instrument(...)`` every
+public function, and every internal phase listed below, produces one
+`StageRecord` with its wall time, the number of rows it processed and,
+optionally, its peak memory. Records are passed to sinks: any callable that
+takes a record, such as `LoggingSink`, `JsonLinesSink` or `PrometheusSink`.
+
+Internal phases:
+
+- 'load_validate_data.parse' and 'load_validate_data.validate'
+- 'split_by_item.explode': tokenizing 'shared_by' and splitting every item
+- 'settle.totals': per-person totals of the fused pipeline
+- 'settlement_loop': matching debtors with creditors, in every function
+  that settles balances
+
+'iter_transfers' is lazy and is not recorded.
+
+When no ``instrument`` block is active, the only cost is one truth test
+per call. An active block is process-wide: it also records the stages run
+by other threads.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import NamedTuple, Optional
+
+# sinks of every active `instrument` block; replaced, never mutated, so
+# that readers need no lock
+_sinks = ()
+_sinks_lock = threading.Lock()
+_memory_blocks = 0
+_started_tracing = False
+_local = threading.local()
+_NOT_RECORDING = nullcontext()
+
+
+class StageRecord(NamedTuple):
+    """One run of one stage."""
+
+    stage: str
+    seconds: float
+    rows: Optional[int]
+    peak_bytes: Optional[int]
+
+
+@contextmanager
+def instrument(*sinks, memory=False):
+    """
+    Record every stage run inside the block and pass the records to `sinks`.
+
+    Parameters
+    ----------
+    *sinks : callable
+        Called with every `StageRecord`, in the order the stages finish, so
+        inner phases come before the function that ran them.
+
+    memory : bool, default False
+        Also record the peak memory allocated by every stage, above what was
+        allocated when it started, with ``tracemalloc``. Tracing makes every
+        allocation slower, so only turn it on when you need it. The peak
+        traced by ``tracemalloc`` is process-wide and every stage resets it
+        when it starts, so stages that run at the same time in other
+        threads count each other's allocations and may miss a peak that
+        another stage reset. Measure memory with one thread at a time for
+        exact peaks.
+
+    Yields
+    ------
+    list of StageRecord
+        Every record of the block, also filled in without any sink.
+
+    Examples
+    --------
+    >>> with instrument(LoggingSink()) as records:
+    ...     transfers = settle("trip.csv")
+    >>> [record.stage for record in records]
+    ['load_validate_data.parse', 'load_validate_data.validate',
+     'load_validate_data', 'settle.totals', 'settlement_loop', 'settle']
+    """
+    global _sinks, _memory_blocks, _started_tracing
+    records = []
+    block_sinks = (records.append,) + sinks
+    with _sinks_lock:
+        _sinks = _sinks + block_sinks
+        if memory:
+            _memory_blocks += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+    try:
+        yield records
+    finally:
+        with _sinks_lock:
+            remaining = list(_sinks)
+            for sink in block_sinks:
+                remaining.remove(sink)
+            _sinks = tuple(remaining)
+            if memory:
+                _memory_blocks -= 1
+                # tracing started by an instrument block lasts until the
+                # last block measuring memory ends
+                if _memory_blocks == 0 and _started_tracing:
+                    tracemalloc.stop()
+                    _started_tracing = False
+
+
+def _stage(name, rows=None):
+    """Return a context manager that records one run of the stage `name`."""
+    if not _sinks:
+        return _NOT_RECORDING
+    return _recording(name, rows)
+
+
+@contextmanager
+def _recording(name, rows):
+    """
+    Record one run of the stage `name`.
+
+    Yields a one-item list holding `rows`, which the block may replace once
+    it knows how many rows it processed.
+    """
+    memory = _memory_blocks > 0 and tracemalloc.is_tracing()
+    if memory:
+        _enter_memory()
+    rows = [rows]
+    start = time.perf_counter()
+    try:
+        yield rows
+    except BaseException:
+        if memory:
+            _exit_memory()
+        raise
+    seconds = time.perf_counter() - start
+    peak_bytes = _exit_memory() if memory else None
+    for sink in _sinks:
+        sink(StageRecord(name, seconds, rows[0], peak_bytes))
+
+
+def _instrumented(name, rows_from="input"):
+    """
+    Decorate a public function so that every call is recorded as stage `name`.
+
+    Rows are the length of the first argument with ``rows_from='input'`` and
+    of the return value with ``rows_from='result'``, when it has a shape.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks:
+                return func(*args, **kwargs)
+            with _recording(name, None) as rows:
+                result = func(*args, **kwargs)
+                source = args[0] if rows_from == "input" and args else result
+                if hasattr(source, "shape"):
+                    rows[0] = source.shape[0]
+            return result
+        return wrapper
+    return decorator
+
+
+def _enter_memory():
+    """Start measuring the peak of a stage, keeping the peak of its parent stage."""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    current, peak = tracemalloc.get_traced_memory()
+    if stack:
+        stack[-1][1] = max(stack[-1][1], peak)
+    tracemalloc.reset_peak()
+    stack.append([current, current])
+
+
+def _exit_memory():
+    """Stop measuring the innermost stage and return its peak in bytes."""
+    stack = _local.stack
+    start, peak = stack.pop()
+    peak = max(peak, tracemalloc.get_traced_memory()[1])
+    if stack:
+        stack[-1][1] = max(stack[-1][1], peak)
+    return peak - start
+
+
+class LoggingSink:
+    """
+    Log every record with the standard ``logging`` module.
+
+    Parameters
+    ----------
+    logger : logging.Logger or str, default 'billsplittermds'
+        Logger, or name of the logger, to write to.
+
+    level : int, default logging.INFO
+        Level of the log messages.
+    """
+
+    def __init__(self, logger="billsplittermds", level=logging.INFO):
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = level
+
+    def __call__(self, record):
+        self.logger.log(self.level, "stage=%s seconds=%.6f rows=%s peak_bytes=%s",
+                        record.stage, record.seconds, record.rows, record.peak_bytes)
+
+
+class JsonLinesSink:
+    """
+    Append every record to a file as one JSON object per line.
+
+    Parameters
+    ----------
+    file : str, os.PathLike or file object
+        Path of the file, which is opened in append mode for every record,
+        or an open text file, which is written to and flushed.
+    """
+
+    def __init__(self, file):
+        self.file = os.fspath(file) if isinstance(file, (str, os.PathLike)) else file
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        line = json.dumps(record._asdict()) + "\n"
+        with self._lock:
+            if isinstance(self.file, str):
+                with open(self.file, "a") as f:
+                    f.write(line)
+            else:
+                self.file.write(line)
+                self.file.flush()
+
+
+class PrometheusSink:
+    """
+    Aggregate records per stage and render them in the Prometheus text format.
+
+    Examples
+    --------
+    >>> sink = PrometheusSink()
+    >>> with instrument(sink):
+    ...     transfers = settle("trip.csv")
+    >>> print(sink.render())
+    # HELP billsplittermds_stage_calls_total Number of runs of each stage.
+    # TYPE billsplittermds_stage_calls_total counter
+    billsplittermds_stage_calls_total{stage="settle"} 1
+    ...
+    """
+
+    METRICS = [
+        ("calls_total", "counter", "Number of runs of each stage."),
+        ("seconds_total", "counter", "Wall time spent in each stage."),
+        ("rows_total", "counter", "Rows processed by each stage."),
+        ("peak_bytes", "gauge", "Largest peak memory of one run of each stage."),
+    ]
+
+    def __init__(self, prefix="billsplittermds_stage_"):
+        self.prefix = prefix
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        with self._lock:
+            stats = self._stages.setdefault(
+                record.stage, {"calls_total": 0, "seconds_total": 0.0, "rows_total": 0,
+                               "peak_bytes": None})
+            stats["calls_total"] += 1
+            stats["seconds_total"] += record.seconds
+            stats["rows_total"] += record.rows or 0
+            if record.peak_bytes is not None:
+                stats["peak_bytes"] = max(stats["peak_bytes"] or 0, record.peak_bytes)
+
+    def render(self):
+        """Return the aggregated metrics as Prometheus exposition text."""
+        lines = []
+        with self._lock:
+            for metric, kind, description in self.METRICS:
+                samples = [(stage, stats[metric]) for stage, stats in self._stages.items()
+                           if stats[metric] is not None]
+                if not samples:
+                    continue
+                lines.append(f"# HELP {self.prefix}{metric} {description}")
+                lines.append(f"# TYPE {self.prefix}{metric} {kind}")
+                for stage, value in samples:
+                    lines.append(f'{self.prefix}{metric}{{stage="{stage}"}} {value}')
+        return "\n".join(lines) + "\n"
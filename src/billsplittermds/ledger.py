@@ -0,0 +1,290 @@
+"""Module for a bill that is updated one expense at a time."""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from billsplittermds._money import check_money, split_cents, whole_cents
+from billsplittermds.amount_to_transfer import _check_strategy, _settle_balances
+from billsplittermds.load_validate_data import (
+    RANGE_RULES,
+    REQUIRED_COLS,
+    ValidationError,
+    ValidationReport,
+)
+from billsplittermds.split_by_item import _parse_share_tokens, _weighted_shares
+
+
+class Ledger:
+    """
+    A bill kept as running per-person totals, updated one expense at a time.
+
+    Adding, removing or editing an expense only touches the totals of its
+    payer and consumers, so every update takes time proportional to the
+    size of that expense, not to the length of the bill. `transfers` then
+    settles the current balances without looking at the expenses again.
+
+    Parameters
+    ----------
+    money : {'float', 'cents'}, default 'float'
+        Money representation, as in the other functions. With 'cents',
+        'item_price' is given in int64 cents and totals are kept exactly.
+
+    Examples
+    --------
+    >>> ledger = Ledger()
+    >>> taxi = ledger.add_expense("Leo", "taxi", 25.0, "Leo;Ana", 0.07, 0.0)
+    >>> lunch = ledger.add_expense("Ana", "lunch", 20.0, "Ana", 0.12, 0.15)
+    >>> ledger.edit_expense(taxi, item_price=30.0)
+    >>> ledger.transfers()
+        sender  receiver    amount
+    0   Ana     Leo         16.05
+    """
+
+    def __init__(self, money="float"):
+        check_money(money)
+        self.money = money
+        self._expenses = {}
+        self._next_id = 0
+        self._should_pay = Counter()
+        self._actually_paid = Counter()
+        # number of expenses each person takes part in, to forget people
+        # once their last expense is removed
+        self._refs = Counter()
+
+    @classmethod
+    def from_frame(cls, valid_df, money="float"):
+        """
+        Build a ledger from a validated bill, one expense per row.
+
+        The row labels of `valid_df` become the expense ids.
+
+        Parameters
+        ----------
+        valid_df : pandas.DataFrame
+            A validated bill, typically the output of 'load_validate_data'.
+
+        money : {'float', 'cents'}, default 'float'
+            Money representation of `valid_df`.
+
+        Returns
+        -------
+        Ledger
+        """
+        ledger = cls(money=money)
+        columns = [valid_df[col].tolist() for col in REQUIRED_COLS]
+        for expense_id, row in zip(valid_df.index, zip(*columns)):
+            ledger.add_expense(*row, expense_id=expense_id)
+        return ledger
+
+    def __len__(self):
+        return len(self._expenses)
+
+    def __contains__(self, expense_id):
+        return expense_id in self._expenses
+
+    def add_expense(self, payer, item_name, item_price, shared_by, tax_pct, tip_pct,
+                    expense_id=None):
+        """
+        Add one expense.
+
+        Parameters
+        ----------
+        payer : str
+            Who paid for the item.
+        item_name : str
+            Description of the item.
+        item_price : float or int
+            Price before tax and tip; int cents if the ledger uses 'cents'.
+        shared_by : str or list of str
+            The consumers, as a ';'-separated string or a list of names,
+            optionally with weights or fixed amounts as in 'split_by_item'.
+        tax_pct, tip_pct : float
+            Tax and tip as decimals, in the ranges 'load_validate_data' allows.
+        expense_id : hashable, optional
+            Id to store the expense under. A new integer id is used if not given.
+
+        Returns
+        -------
+        expense_id
+            The id of the new expense, used to remove or edit it later.
+
+        Raises
+        ------
+        ValueError
+            If `expense_id` is already used.
+        ValidationError
+            If a value is out of range.
+        """
+        if expense_id is None:
+            while self._next_id in self._expenses:
+                self._next_id += 1
+            expense_id = self._next_id
+        elif expense_id in self._expenses:
+            raise ValueError(f"Expense {expense_id!r} already exists.")
+
+        expense = self._make_expense(expense_id, payer, item_name, item_price, shared_by,
+                                     tax_pct, tip_pct)
+        self._apply(expense, sign=1)
+        self._expenses[expense_id] = expense
+        return expense_id
+
+    def remove_expense(self, expense_id):
+        """
+        Remove one expense.
+
+        Parameters
+        ----------
+        expense_id : hashable
+            Id returned by `add_expense`.
+
+        Raises
+        ------
+        KeyError
+            If there is no expense with this id.
+        """
+        expense = self._expenses.pop(expense_id)
+        self._apply(expense, sign=-1)
+
+    def edit_expense(self, expense_id, **changes):
+        """
+        Change some fields of one expense.
+
+        Parameters
+        ----------
+        expense_id : hashable
+            Id returned by `add_expense`.
+        **changes
+            New values for any of 'payer', 'item_name', 'item_price',
+            'shared_by', 'tax_pct' and 'tip_pct'.
+
+        Raises
+        ------
+        KeyError
+            If there is no expense with this id.
+        TypeError
+            If a field name is not one of the expense fields.
+        ValidationError
+            If a new value is out of range. The expense is then left unchanged.
+        """
+        unknown = set(changes).difference(REQUIRED_COLS)
+        if unknown:
+            raise TypeError(f"Unknown expense field(s): {', '.join(sorted(unknown))}")
+
+        old = self._expenses[expense_id]
+        fields = {col: old[col] for col in REQUIRED_COLS}
+        fields.update(changes)
+        new = self._make_expense(expense_id, **fields)
+
+        self._apply(old, sign=-1)
+        self._apply(new, sign=1)
+        self._expenses[expense_id] = new
+
+    def should_pay_df(self):
+        """
+        Return what each person should pay, in the format of 'split_by_item'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Dataframe with columns 'name' and 'should_pay', sorted by name.
+        """
+        return self._to_frame(self._should_pay, 'should_pay')
+
+    def actually_paid_df(self):
+        """
+        Return what each person actually paid, in the format of 'individual_total_payments'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Dataframe with columns 'name' and 'actually_paid', sorted by name.
+        """
+        return self._to_frame(self._actually_paid, 'actually_paid')
+
+    def transfers(self, strategy="greedy", time_budget=1.0):
+        """
+        Compute the transfers that settle the current balances.
+
+        Parameters
+        ----------
+        strategy : {'greedy', 'min_transfers'}, default 'greedy'
+            Settlement strategy, as in 'amount_to_transfer'.
+        time_budget : float, default 1.0
+            Seconds the 'min_transfers' search may spend.
+
+        Returns
+        -------
+        result_df : pandas.DataFrame
+            The required transfers, with columns 'sender', 'receiver' and
+            'amount', as returned by 'amount_to_transfer'.
+        """
+        _check_strategy(strategy)
+        names = sorted(self._refs)
+        should_pay = [self._should_pay[name] for name in names]
+        actually_paid = [self._actually_paid[name] for name in names]
+        return _settle_balances(names, should_pay, actually_paid, self.money,
+                                strategy=strategy, time_budget=time_budget)
+
+    def _make_expense(self, expense_id, payer, item_name, item_price, shared_by, tax_pct, tip_pct):
+        """Validate one expense and work out its cost and every consumer's share."""
+        values = {'item_price': item_price, 'tax_pct': tax_pct, 'tip_pct': tip_pct}
+        violations = [
+            {'row': expense_id, 'column': col, 'value': values[col], 'message': message}
+            for col, low, high, message in RANGE_RULES
+            if values[col] < low or (high is not None and values[col] > high)
+        ]
+        if violations:
+            raise ValidationError(ValidationReport(pd.DataFrame(violations)))
+
+        consumers = shared_by.split(';') if isinstance(shared_by, str) else list(shared_by)
+        if not consumers:
+            raise ValueError("shared_by must name at least one person.")
+
+        names = consumers
+        if self.money == "cents":
+            cost = int(np.rint(int(whole_cents([item_price])[0]) * (1 + tax_pct + tip_pct)))
+        else:
+            cost = item_price * (1 + tax_pct + tip_pct)
+        if any(':' in token or '=' in token for token in consumers):
+            names, weight, fixed = _parse_share_tokens(np.array(consumers, dtype=object))
+            amounts = _weighted_shares(np.array([item_price]), np.array([1 + tax_pct + tip_pct]),
+                                       np.array([cost]), np.array([len(consumers)]),
+                                       weight, fixed, self.money).tolist()
+        elif self.money == "cents":
+            amounts = split_cents(cost, len(consumers), np.arange(len(consumers))).tolist()
+        else:
+            amounts = [cost / len(consumers)] * len(consumers)
+
+        shares = Counter()
+        for name, amount in zip(names, amounts):
+            shares[name] += amount
+
+        return {'payer': payer, 'item_name': item_name, 'item_price': item_price,
+                'shared_by': ';'.join(consumers), 'tax_pct': tax_pct, 'tip_pct': tip_pct,
+                'cost': cost, 'shares': shares}
+
+    def _apply(self, expense, sign):
+        """Add (sign=1) or take away (sign=-1) one expense from the running totals."""
+        payer = expense['payer']
+        self._actually_paid[payer] += sign * expense['cost']
+        self._track(payer, sign)
+        for name, amount in expense['shares'].items():
+            self._should_pay[name] += sign * amount
+            self._track(name, sign)
+
+    def _track(self, name, sign):
+        """Count one more or one less expense for `name`, forgetting unused names."""
+        self._refs[name] += sign
+        if self._refs[name] == 0:
+            del self._refs[name]
+            self._should_pay.pop(name, None)
+            self._actually_paid.pop(name, None)
+
+    def _to_frame(self, totals, column):
+        """Turn running totals into a two-column dataframe sorted by name."""
+        names = sorted(name for name in totals if name in self._refs)
+        dtype = 'int64' if self.money == 'cents' else 'float64'
+        return pd.DataFrame({'name': pd.Series(names, dtype=object),
+                             column: pd.Series([totals[name] for name in names], dtype=dtype)})
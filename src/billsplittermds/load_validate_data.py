@@ -1,21 +1,164 @@
 """Module for loading and validating bill data from CSV files."""
 
+import importlib.util
+
 import pandas as pd
 
+from billsplittermds._money import check_money, to_cents
+from billsplittermds.currency import check_single_currency, convert_currency
+from billsplittermds.instrumentation import _instrumented, _stage
+
+REQUIRED_COLS = ["payer", "item_name", "item_price", "shared_by", "tax_pct", "tip_pct"]
+
+# Columns that must be numeric
+NUMERIC_COLS = ["item_price", "tax_pct", "tip_pct"]
+
+# dtypes declared up front so that every value is parsed only once
+SCHEMA = {
+    "payer": "category",
+    "item_name": str,
+    "shared_by": str,
+    "item_price": "float64",
+    "tax_pct": "float64",
+    "tip_pct": "float64",
+}
+
+# Used when a value does not fit SCHEMA: numeric columns are read as
+# text so that validation can report every offending value
+TEXT_SCHEMA = {col: dtype for col, dtype in SCHEMA.items() if col not in NUMERIC_COLS}
+
+PARSER_ENGINES = ("auto", "pyarrow", "c", "python")
+
+# (column, lowest allowed value, highest allowed value, message)
+RANGE_RULES = [
+    ("item_price", 0.0, None, "item_price values must be non-negative."),
+    ("tax_pct", 0.05, 0.15, "tax_pct values must be between 0.05 and 0.15."),
+    ("tip_pct", 0.0, 0.50, "tip_pct values must be between 0.0 and 0.50."),
+]
 
-def load_validate_data(csv_path):
+
+class ValidationReport:
+    """
+    Every rule violation found while validating a bill dataframe.
+
+    Parameters
+    ----------
+    violations : pandas.DataFrame
+        One row per offending value, with columns 'row' (index label of the
+        offending row), 'column', 'value' and 'message'.
+
+    Examples
+    --------
+    >>> try:
+    ...     load_validate_data("trip.csv")
+    ... except ValidationError as err:
+    ...     print(err.report.violations)
+       row      column value                                        message
+    0    2     tip_pct   abc              Column 'tip_pct' must be numeric.
+    1    1  item_price    -3        item_price values must be non-negative.
+    2    1     tax_pct  0.02  tax_pct values must be between 0.05 and 0.15.
+    """
+
+    def __init__(self, violations):
+        self.violations = violations
+
+    @property
+    def ok(self):
+        """True if no violations were found."""
+        return self.violations.empty
+
+    def __len__(self):
+        return len(self.violations)
+
+    def __str__(self):
+        if self.ok:
+            return "No validation errors."
+        lines = []
+        for message, group in self.violations.groupby("message", sort=False):
+            rows = group["row"].tolist()
+            shown = ", ".join(str(row) for row in rows[:5])
+            more = f" and {len(rows) - 5} more" if len(rows) > 5 else ""
+            lines.append(f"{message} (rows: {shown}{more})")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"ValidationReport({len(self)} violation(s))"
+
+
+class ValidationError(ValueError):
+    """
+    Raised when a bill dataframe breaks one or more validation rules.
+
+    The full list of violations is available as ``err.report``.
+    """
+
+    def __init__(self, report):
+        self.report = report
+        super().__init__(str(report))
+
+
+@_instrumented("load_validate_data", rows_from="result")
+def load_validate_data(csv_path, money="float", chunksize=None, engine="auto", rates=None):
     """
     Read in a csv dataset through its path and validate its values
 
+    All values are checked in one pass, so a file with several problems
+    reports all of them at once.
+
+    For files that do not fit in memory, pass `chunksize` to get an iterator
+    of validated chunks instead of one dataframe. Only one chunk is held in
+    memory at a time; fold the chunks into totals with TotalsAccumulator.
+
+    The columns are parsed straight into their final dtypes: float64 for
+    'item_price', 'tax_pct' and 'tip_pct', and a categorical for 'payer'.
+
+    A bill may have an optional 'currency' column, and a 'date' column for
+    the exchange rates. Pass `rates` to convert every price to one base
+    currency right after validation, so that every later stage sees a
+    single currency.
+
     Parameters
     ----------
     csv_path : str
         The string of path from which we read the raw data.
 
+    money : {'float', 'cents'}, default 'float'
+        Representation of 'item_price' in the returned dataframe. With 'cents'
+        the prices are rounded to whole cents and stored as int64, ready for
+        the other functions called with ``money='cents'``.
+
+    chunksize : int, optional
+        Number of rows per chunk. If given, the file is read lazily.
+
+    engine : {'auto', 'pyarrow', 'c', 'python'}, default 'auto'
+        CSV parser passed on to ``pandas.read_csv``. 'auto' uses the
+        multithreaded 'pyarrow' parser when pyarrow is installed and falls
+        back to the 'c' parser otherwise. Chunked reading always uses the
+        'c' parser unless another one is requested.
+
+    rates : FxRates, optional
+        Exchange rates to convert the prices of a bill with a 'currency'
+        column with, as in 'convert_currency'.
+
     Returns
     -------
-    valid_df : pandas.DataFrame
-        Dataframe that is read and validated from the given path.
+    valid_df : pandas.DataFrame or iterator of pandas.DataFrame
+        Dataframe that is read and validated from the given path, or an
+        iterator of validated chunks if `chunksize` is given. Chunks keep
+        their row numbers from the file as index.
+
+    Raises
+    ------
+    ValueError
+        If a required column is missing, if `money` or `engine` is not
+        supported, if `chunksize` is not a positive integer, if `engine` is
+        'pyarrow' and `chunksize` is given, or if the bill mixes currencies
+        and `rates` is not given or has no rate for one of them.
+    ValidationError
+        If any value is not numeric or is out of range. It is a subclass of
+        ValueError whose ``report`` attribute lists every offending row and column.
+        When reading in chunks, it is raised by the chunk that contains the
+        offending rows.
 
     Examples
     --------
@@ -25,37 +168,110 @@ def load_validate_data(csv_path):
     1   Sam      taxi            25.0        Amy;Sam;Ben   0.07     0.0
     2   Ben      double-room     20.0        Amy;Ben       0.12     0.15
 
+    >>> for chunk in load_validate_data("../../data/raw.csv", chunksize=2):
+    ...     print(len(chunk))
+    2
+    1
+
     """
-    valid_df = pd.read_csv(csv_path)
-    required_cols = {"payer", "item_name", "item_price", "shared_by", "tax_pct", "tip_pct",}
+    check_money(money)
+    if engine not in PARSER_ENGINES:
+        raise ValueError(f"engine must be one of {PARSER_ENGINES}, got {engine!r} instead.")
+
+    if chunksize is not None:
+        if isinstance(chunksize, bool) or not isinstance(chunksize, int) or chunksize < 1:
+            raise ValueError(f"chunksize must be a positive integer, got {chunksize!r} instead.")
+        if engine == "pyarrow":
+            raise ValueError("engine='pyarrow' does not support chunksize.")
+        engine = "c" if engine == "auto" else engine
+        return _iter_validated_chunks(csv_path, money, chunksize, engine, rates)
 
+    if engine == "auto":
+        engine = "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+
+    with _stage("load_validate_data.parse"):
+        try:
+            valid_df = pd.read_csv(csv_path, dtype=SCHEMA, engine=engine)
+        except ValueError:
+            # Some value does not fit the schema, read it as text to report it
+            valid_df = pd.read_csv(csv_path, dtype=TEXT_SCHEMA, engine=engine)
+
+    with _stage("load_validate_data.validate", rows=len(valid_df)):
+        return _validate(valid_df, money, rates)
+
+
+def _iter_validated_chunks(csv_path, money, chunksize, engine, rates=None):
+    """Yield the validated chunks of a csv file one at a time."""
+    rows_done = 0
+    currencies = set()  # the currencies of all chunks must agree, not just within each
+    with pd.read_csv(csv_path, dtype=SCHEMA, engine=engine, chunksize=chunksize) as reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except ValueError:
+                break
+            yield _validate(chunk, money, rates, currencies)
+            rows_done += len(chunk)
+
+    # Some value does not fit the schema, read the rest as text to report it
+    with pd.read_csv(csv_path, dtype=TEXT_SCHEMA, engine=engine, chunksize=chunksize,
+                     skiprows=range(1, rows_done + 1)) as reader:
+        for chunk in reader:
+            chunk.index += rows_done
+            yield _validate(chunk, money, rates, currencies)
+
+
+def _validate(valid_df, money, rates=None, currencies=None):
+    """Validate a freshly read bill dataframe in place and return it."""
     # Check for missing required columns
-    missing = required_cols.difference(valid_df.columns)
+    missing = set(REQUIRED_COLS).difference(valid_df.columns)
     if missing:
         missing_str = ", ".join(sorted(missing))
         raise ValueError(f"Missing required column(s): {missing_str}")
 
-    # Columns that must be numeric
-    numeric_cols = ["item_price", "tax_pct", "tip_pct"]
-    for col in numeric_cols:
-        try:
-            valid_df[col] = pd.to_numeric(valid_df[col])
-        except Exception as exc:
-            raise ValueError(f"Column '{col}' must be numeric.") from exc
+    violations = []
+
+    # Coerce numeric columns, remembering every value that is not a number
+    for col in NUMERIC_COLS:
+        if pd.api.types.is_numeric_dtype(valid_df[col]):
+            continue
+        numeric = pd.to_numeric(valid_df[col], errors="coerce")
+        not_numeric = numeric.isna() & valid_df[col].notna()
+        violations.append(_violations(valid_df, col, not_numeric, f"Column '{col}' must be numeric."))
+        valid_df[col] = numeric
 
-    # Check item_price is non-negative
-    for val in valid_df["item_price"]:
-        if val < 0:
-            raise ValueError("item_price values must be non-negative.")
+    # Check every value against its allowed range
+    for col, low, high, message in RANGE_RULES:
+        out_of_range = valid_df[col] < low
+        if high is not None:
+            out_of_range |= valid_df[col] > high
+        violations.append(_violations(valid_df, col, out_of_range, message))
 
-    # Check tax_pct is between 0.05 and 0.15
-    for val in valid_df["tax_pct"]:
-        if val < 0.05 or val > 0.15:
-            raise ValueError("tax_pct values must be between 0.05 and 0.15.")
+    # Every item must be shared by someone, or its cost would be paid but never owed
+    no_consumers = valid_df["shared_by"].isna() | (valid_df["shared_by"] == "")
+    violations.append(_violations(valid_df, "shared_by", no_consumers,
+                                  "shared_by values must name at least one person."))
 
-    # Check tip_pct is between 0.0 and 0.50
-    for val in valid_df["tip_pct"]:
-        if val < 0.0 or val > 0.50:
-            raise ValueError("tip_pct values must be between 0.0 and 0.50.")
+    violations = [v for v in violations if len(v)]
+    if violations:
+        raise ValidationError(ValidationReport(pd.concat(violations, ignore_index=True)))
 
+    if money == "cents":
+        valid_df["item_price"] = to_cents(valid_df["item_price"])
+
+    if rates is not None:
+        return convert_currency(valid_df, rates, money=money)
+    check_single_currency(valid_df, currencies)
     return valid_df
+
+
+def _violations(valid_df, col, mask, message):
+    """Return the violations of one rule as a dataframe."""
+    return pd.DataFrame({
+        "row": valid_df.index[mask.to_numpy()],
+        "column": col,
+        "value": valid_df[col][mask].to_numpy(dtype=object),
+        "message": message,
+    })
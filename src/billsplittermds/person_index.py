@@ -0,0 +1,116 @@
+"""Module for numbering the people in a bill once, for all stages."""
+
+import numpy as np
+import pandas as pd
+
+from billsplittermds._money import sum_by_code
+from billsplittermds.split_by_item import _split_shared_by
+
+
+class PersonIndex:
+    """
+    A sorted list of people, each identified by a dense int32 code.
+
+    Build it once per bill with `from_ledger` and pass it to 'split_by_item'
+    and 'individual_total_payments' with ``people=``. Both then sum over the
+    integer codes with ``numpy.bincount`` instead of hashing names, and return
+    one row per person with 'name' as a categorical over the shared list of
+    people. 'amount_to_transfer' recognises two such results and lines them
+    up by code instead of merging them on 'name'.
+
+    Parameters
+    ----------
+    names : array-like of str
+        The people to index. Duplicates are removed and the names are sorted.
+
+    Examples
+    --------
+    >>> people = PersonIndex.from_ledger(valid_df)
+    >>> people.names
+    Index(['Ana', 'Leo'], dtype='object')
+    >>> people.encode(['Leo', 'Ana', 'Leo'])
+    array([1, 0, 1], dtype=int32)
+    >>> should_pay_df = split_by_item(valid_df, people=people)
+    >>> actually_paid_df = individual_total_payments(valid_df, people=people)
+    >>> amount_to_transfer(should_pay_df, actually_paid_df)
+        sender  receiver    amount
+    0   Ana     Leo         13.38
+    """
+
+    def __init__(self, names):
+        names = pd.Index(pd.unique(np.asarray(names, dtype=object)), dtype=object)
+        self.names = names.dropna().sort_values()
+        self.dtype = pd.CategoricalDtype(self.names)
+
+    @classmethod
+    def from_ledger(cls, valid_df):
+        """
+        Index every payer and consumer of a validated bill.
+
+        Parameters
+        ----------
+        valid_df : pandas.DataFrame
+            A validated bill, typically the output of 'load_validate_data'.
+
+        Returns
+        -------
+        PersonIndex
+        """
+        consumers, _ = _split_shared_by(valid_df)
+        # only the distinct names of each column are combined and sorted
+        _, payers = pd.factorize(valid_df['payer'])
+        _, consumers = pd.factorize(consumers)
+        return cls(np.concatenate([np.asarray(payers, dtype=object),
+                                   np.asarray(consumers, dtype=object)]))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"PersonIndex({len(self)} people)"
+
+    def encode(self, values):
+        """
+        Return the int32 code of every name in `values`.
+
+        Names that are missing or not in the index get the code -1.
+
+        Parameters
+        ----------
+        values : array-like of str
+
+        Returns
+        -------
+        numpy.ndarray of int32
+        """
+        if isinstance(values, (list, tuple)):
+            values = np.asarray(values, dtype=object)
+        # hash every value once, then look up only the distinct names
+        codes, uniques = pd.factorize(values)
+        lookup = self.names.get_indexer(pd.Index(np.asarray(uniques, dtype=object)))
+        lookup = np.append(lookup, -1).astype(np.int32)  # code -1 stays -1
+        return lookup[codes]
+
+    def categorical(self, codes):
+        """
+        Return a categorical over the index for the given codes.
+
+        Parameters
+        ----------
+        codes : array-like of int
+
+        Returns
+        -------
+        pandas.Categorical
+        """
+        return pd.Categorical.from_codes(codes, dtype=self.dtype)
+
+    def bincount(self, codes, weights, money="float"):
+        """
+        Sum `weights` per person, returning one total per person in index order.
+
+        Rows whose code is -1 are ignored. In 'cents' mode the totals are int64.
+        """
+        codes = np.asarray(codes)
+        known = codes >= 0
+        return sum_by_code(codes[known], np.asarray(weights)[known], len(self), money)
@@ -0,0 +1,240 @@
+"""Module for settling a whole bill in a single pass."""
+
+import numpy as np
+import pandas as pd
+
+from billsplittermds._money import check_money, sum_by_code
+from billsplittermds._parallel import check_n_jobs, parallel_person_totals
+from billsplittermds.amount_to_transfer import (
+    _balance_transfers,
+    _check_strategy,
+    _settle_balances,
+)
+from billsplittermds.compiled import CompiledLedger, _check_compiled
+from billsplittermds.instrumentation import _instrumented, _stage
+from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.person_index import PersonIndex
+from billsplittermds.split_by_item import _explode_shares, _item_cost
+
+
+@_instrumented("settle")
+def settle(data, money="float", strategy="greedy", time_budget=1.0, n_jobs=None):
+    """
+    Compute the transfers that settle a bill, from raw data to transfers in one call.
+
+    This gives the same result as calling 'load_validate_data', 'split_by_item',
+    'individual_total_payments' and 'amount_to_transfer' one after another,
+    with less work: the cost of every item is computed once, people are
+    numbered once, what each person should pay and actually paid are summed
+    with ``numpy.bincount`` over those numbers, and the two vectors go
+    straight to the settlement step without any merge. The input dataframe
+    is never modified.
+
+    Parameters
+    ----------
+    data : str, os.PathLike, pandas.DataFrame or CompiledLedger
+        Path of a csv file, which is read with 'load_validate_data', an
+        already validated dataframe, or a ledger opened with 'open_ledger',
+        whose totals are computed from its memory-mapped arrays.
+
+    money : {'float', 'cents'}, default 'float'
+        Money representation, as in the individual functions. A dataframe
+        passed with 'cents' must hold 'item_price' in int64 cents, and a
+        compiled ledger must have been compiled with the same `money`.
+
+    strategy : {'greedy', 'min_transfers'}, default 'greedy'
+        Settlement strategy, as in 'amount_to_transfer'.
+
+    time_budget : float, default 1.0
+        Seconds the 'min_transfers' search may spend, as in 'amount_to_transfer'.
+
+    n_jobs : int, optional
+        Number of worker processes that compute the per-person totals. The
+        rows are cut into `n_jobs` blocks, each worker reads its block from
+        memory-mapped files and sums it, and the partial sums are added up
+        before settlement. -1 uses one worker per CPU. By default everything
+        runs in the calling process, which is faster for all but very large
+        bills. In 'float' mode the totals are added up in a different order,
+        so an amount that falls right on half a cent may round the other way.
+        Not supported for a compiled ledger.
+
+    Returns
+    -------
+    result_df : pandas.DataFrame
+        The required transfers, with columns 'sender', 'receiver' and 'amount',
+        as returned by 'amount_to_transfer'.
+
+    Raises
+    ------
+    ValueError
+        If `money`, `strategy` or `n_jobs` is not supported, if the csv
+        file does not pass validation, or if a compiled ledger was compiled
+        with another `money` or is passed with `n_jobs`.
+
+    Examples
+    --------
+    >>> settle("trip.csv")
+        sender  receiver    amount
+    0   Mia     Leo         20.0
+    1   Mia     Ana         10.0
+    """
+    check_money(money)
+    _check_strategy(strategy)
+    n_jobs = check_n_jobs(n_jobs)
+    if isinstance(data, CompiledLedger):
+        _check_compiled(data, money)
+        if n_jobs > 1:
+            raise ValueError("n_jobs is not supported for a compiled ledger, whose totals "
+                             "are already computed without tokenizing 'shared_by'.")
+        with _stage("settle.totals", rows=len(data)):
+            names, should_pay, actually_paid = data._totals()
+        return _settle_balances(names, should_pay, actually_paid, money,
+                                strategy=strategy, time_budget=time_budget)
+
+    if isinstance(data, pd.DataFrame):
+        valid_df = data
+    else:
+        valid_df = load_validate_data(data, money=money)
+
+    with _stage("settle.totals", rows=len(valid_df)):
+        totals = None
+        if n_jobs > 1 and len(valid_df) > 1:
+            totals = parallel_person_totals(valid_df, money, min(n_jobs, len(valid_df)))
+        if totals is None:
+            totals = _person_totals(valid_df, money)
+    names, should_pay, actually_paid = totals
+    return _settle_balances(names, should_pay, actually_paid, money,
+                            strategy=strategy, time_budget=time_budget)
+
+
+@_instrumented("settle_groups")
+def settle_groups(data, group_col="group_id", money="float", strategy="greedy", time_budget=1.0):
+    """
+    Settle many independent groups, such as trips or events, in one call.
+
+    Every group is settled on its own, exactly as if its rows were passed to
+    'settle' separately, but the per-person totals of all groups are computed
+    together with a few vectorized operations. Only the settlement of each
+    group's (small) balance vector runs group by group.
+
+    Parameters
+    ----------
+    data : str, os.PathLike or pandas.DataFrame
+        Path of a csv file, which is read with 'load_validate_data', or an
+        already validated dataframe. Besides the usual columns it needs a
+        column identifying the group of every row.
+
+    group_col : str, default 'group_id'
+        Name of the group column.
+
+    money : {'float', 'cents'}, default 'float'
+        Money representation, as in 'settle'.
+
+    strategy : {'greedy', 'min_transfers'}, default 'greedy'
+        Settlement strategy, as in 'amount_to_transfer'.
+
+    time_budget : float, default 1.0
+        Seconds the 'min_transfers' search may spend on each group.
+
+    Returns
+    -------
+    result_df : pandas.DataFrame
+        The required transfers of all groups in long format, with columns
+        `group_col`, 'sender', 'receiver' and 'amount', sorted by group.
+        Groups that need no transfers have no rows.
+
+    Raises
+    ------
+    ValueError
+        If `money` or `strategy` is not supported, if the group column is
+        missing or has missing values, or if the csv file does not pass
+        validation.
+
+    Examples
+    --------
+    >>> settle_groups("nightly_groups.csv")
+        group_id  sender  receiver  amount
+    0   paris     Mia     Leo       20.00
+    1   paris     Mia     Ana       10.00
+    2   rome      Joe     Amy       31.50
+    """
+    check_money(money)
+    _check_strategy(strategy)
+    if isinstance(data, pd.DataFrame):
+        valid_df = data
+    else:
+        valid_df = load_validate_data(data, money=money)
+
+    if group_col not in valid_df.columns:
+        raise ValueError(f"Missing required column: {group_col}")
+    if valid_df[group_col].isna().any():
+        raise ValueError(f"Column '{group_col}' must not have missing values.")
+
+    cost = _item_cost(valid_df, money)
+    share_names, shares, num_shared_people = _explode_shares(valid_df, money, cost)
+    people, payer_codes, share_codes = _person_codes(valid_df['payer'], share_names)
+    group_codes, group_ids = pd.factorize(valid_df[group_col], sort=True)
+
+    # one integer key per (group, person) pair, ordered by group and then by name
+    n_people = max(len(people), 1)
+    paid_rows = payer_codes >= 0
+    paid_keys = group_codes[paid_rows].astype(np.int64) * n_people + payer_codes[paid_rows]
+    share_keys = np.repeat(group_codes.astype(np.int64), num_shared_people) * n_people + share_codes
+    keys, inverse = np.unique(np.concatenate([paid_keys, share_keys]), return_inverse=True)
+    inverse = inverse.ravel()
+
+    actually_paid = sum_by_code(inverse[:len(paid_keys)], cost[paid_rows], len(keys), money)
+    should_pay = sum_by_code(inverse[len(paid_keys):], shares, len(keys), money)
+
+    # settle the balance vector of each group
+    key_groups, key_people = np.divmod(keys, n_people)
+    starts = np.flatnonzero(np.diff(key_groups, prepend=-1))
+    ends = np.append(starts[1:], len(keys))
+    names = people.names.to_numpy()
+
+    rows = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        group_id = group_ids[key_groups[start]]
+        transfers = _balance_transfers(names[key_people[start:end]], should_pay[start:end],
+                                       actually_paid[start:end], money,
+                                       strategy=strategy, time_budget=time_budget)
+        rows.extend((group_id, sender, receiver, amount) for sender, receiver, amount in transfers)
+
+    result_df = pd.DataFrame(rows, columns=[group_col, 'sender', 'receiver', 'amount'])
+    if money == "cents":
+        result_df['amount'] = result_df['amount'].astype('int64')
+
+    return result_df
+
+
+def _person_codes(payer, share_names):
+    """
+    Number every payer and consumer once, over a shared PersonIndex.
+
+    Returns the index and the codes of `payer` and `share_names`. Missing
+    payers get the code -1.
+    """
+    # each column is hashed once and only its distinct names are looked up
+    share_codes, consumers = pd.factorize(share_names)
+    payer_codes, payers = pd.factorize(payer)
+    people = PersonIndex(np.concatenate([np.asarray(payers, dtype=object),
+                                         np.asarray(consumers, dtype=object)]))
+    share_codes = people.encode(consumers)[share_codes]
+    payer_codes = np.append(people.encode(payers), -1)[payer_codes]  # missing payers stay -1
+    return people, payer_codes, share_codes
+
+
+def _person_totals(valid_df, money):
+    """
+    Return every person's name with what they should pay and actually paid.
+
+    People are sorted by name, the order 'amount_to_transfer' uses.
+    """
+    cost = _item_cost(valid_df, money)
+    share_names, shares, _ = _explode_shares(valid_df, money, cost)
+    people, payer_codes, share_codes = _person_codes(valid_df['payer'], share_names)
+
+    actually_paid = people.bincount(payer_codes, cost, money)
+    should_pay = people.bincount(share_codes, shares, money)
+
+    return people.names, should_pay, actually_paid
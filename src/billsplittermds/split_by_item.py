@@ -1,27 +1,101 @@
 """Module for calculating how much each person should pay."""
 
+import re
+
+import numpy as np
 import pandas as pd
 
+from billsplittermds._money import (
+    check_money,
+    gross_cents,
+    split_cents,
+    split_cents_weighted,
+    sum_by_code,
+)
+from billsplittermds.instrumentation import _instrumented, _stage
+
+ENGINES = ("explode", "loop")
+
 
-def split_by_item(valid_df):
+@_instrumented("split_by_item")
+def split_by_item(valid_df, engine="explode", money="float", people=None):
     """
     Calculates a derived column called individual_price, which is the amount
     of this item that an individual should pay after splitting the bill evenly among
     all people who consumed this item. Then we sum each person’s individual_price
     to get the total amount that this individual should pay. In brief, this function calculates
     how much each individual needs to pay in total during the trip after splitting the bill
-    by item.
+    by item. The derived columns are kept as temporary arrays, so the input dataframe is
+    never modified.
+
+    Items are split evenly unless 'shared_by' gives weights or fixed
+    amounts: in 'Leo:2;Ana' Leo pays twice as much as Ana, and in
+    'Leo=12.50;Ana;Mia' Leo pays 12.50 of the price and Ana and Mia split
+    the rest. Fixed amounts are in dollars, before tax and tip, which apply
+    to every share alike. Weights are parsed once for the whole dataframe
+    and all shares are computed in one vectorized pass.
 
     Parameters
     ----------
-    valid_df : pandas.DataFrame
+    valid_df : pandas.DataFrame or CompiledLedger
         A dataframe after being validated with columns 'payer',
-        'item_name', 'item_price', 'shared_by', 'tax_pct', and 'tip_pct'.
+        'item_name', 'item_price', 'shared_by', 'tax_pct', and 'tip_pct',
+        or a ledger opened with 'open_ledger'. A ledger is split straight
+        from its memory-mapped arrays, as 'CompiledLedger.should_pay_df'
+        does: one row per person of the ledger, with 'name' as a
+        categorical, like with `people`.
+
+    engine : {'explode', 'loop'}, default 'explode'
+        How the per-person totals are computed.
+
+        - 'explode' splits every 'shared_by' string once, explodes it to one row
+          per (item, person) pair and gets every total with a single grouped sum.
+        - 'loop' scans the whole dataframe once per consumer. It is kept as a
+          reference implementation and for benchmarking.
+
+        Both engines match names as exact ';'-separated tokens, so 'Ana' is
+        never matched by 'Anastasia'. Only the 'explode' engine supports
+        weighted and fixed shares.
+
+    money : {'float', 'cents'}, default 'float'
+        With 'cents', 'item_price' must hold int64 cents (see
+        ``load_validate_data(..., money='cents')``) and 'should_pay' is returned
+        as int64 cents. Each item's cost is rounded to a whole cent and split
+        with the largest-remainder rule: the leftover cents go to the people
+        listed first in 'shared_by', so the shares always add up to the item
+        cost. Only the 'explode' engine supports this mode.
+
+    people : PersonIndex, optional
+        A shared index of everyone in the bill. If given, totals are summed
+        over its integer codes and the result has one row per person in the
+        index, in index order, with 'name' as a categorical over the index.
+        Only the 'explode' engine supports this option.
 
     Returns
     -------
     should_pay_df : pandas.DataFrame
-        Dataframe with columns 'individual' and 'should_pay'.
+        Dataframe with columns 'name' and 'should_pay'.
+
+    Raises
+    ------
+    TypeError
+        If `valid_df` is not a pandas.DataFrame or a CompiledLedger.
+    ValueError
+        If `engine` or `money` is not supported.
+    ValueError
+        If `valid_df` is a compiled ledger and `engine` is 'loop', `people`
+        is given, or the ledger was compiled with another `money`.
+    ValueError
+        If `engine` is 'loop' and `money` is 'cents', `people` is given or
+        shares are weighted.
+    ValueError
+        If a name in 'shared_by' is not in `people`.
+    ValueError
+        If 'shared_by' is missing or empty for any item.
+    ValueError
+        If a weight or amount in 'shared_by' is invalid.
+    ValueError
+        If the fixed amounts of an item do not fit its price.
 
     Examples
     --------
@@ -37,11 +111,240 @@ def split_by_item(valid_df):
     1   Leo          26.075
 
     """
-    # create `num_shared_people` and `individual_price` column inside `valid_df`
-    valid_df['num_shared_people'] = 1 + valid_df['shared_by'].str.count(";")
-    valid_df['individual_price'] = (valid_df['item_price']
-                                    * (1 + valid_df['tax_pct'] + valid_df['tip_pct'])
-                                    / valid_df['num_shared_people'])
+    # Validate input parameter is of type pandas.DataFrame
+    if isinstance(valid_df, pd.DataFrame) is False:
+        # imported here, as the compiled module builds on this one
+        from billsplittermds.compiled import CompiledLedger, _check_compiled
+
+        if isinstance(valid_df, CompiledLedger) is False:
+            raise TypeError(f"Input parameter 'valid_df' must be of type pandas.DataFrame, got {type(valid_df)} instead.")
+        if engine != "explode":
+            raise ValueError("A compiled ledger is only split with engine='explode'.")
+        _check_compiled(valid_df, money, people)
+        return valid_df.should_pay_df()
+
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got {engine!r} instead.")
+    check_money(money)
+
+    if engine == "loop":
+        if money == "cents":
+            raise ValueError("engine='loop' does not support money='cents'.")
+        if people is not None:
+            raise ValueError("engine='loop' does not support people.")
+        _check_shared_by(valid_df)
+        if valid_df['shared_by'].str.contains('[:=]').any():
+            raise ValueError("engine='loop' does not support weighted or fixed shares.")
+        return _split_by_item_loop(valid_df)
+
+    with _stage("split_by_item.explode", rows=len(valid_df)):
+        names, shares, _ = _explode_shares(valid_df, money)
+
+    if people is not None:
+        codes = people.encode(names)
+        if (codes < 0).any():
+            raise ValueError("Some names in 'shared_by' are not in people.")
+        return pd.DataFrame({
+            'name': people.categorical(np.arange(len(people))),
+            'should_pay': people.bincount(codes, shares, money),
+        })
+
+    # one grouped sum over integer person codes gives every person's total
+    codes, people = pd.factorize(names, sort=True)
+    should_pay = sum_by_code(codes, shares, len(people), money)
+
+    should_pay_df = pd.DataFrame({'name': people, 'should_pay': should_pay})
+
+    return should_pay_df
+
+
+def _item_cost(valid_df, money="float"):
+    """
+    Return the cost of every item including tax and tip as an array.
+
+    `valid_df` may also be any mapping of the three columns to arrays, such
+    as the memory-mapped columns of a compiled ledger.
+    """
+    if money == "cents":
+        return gross_cents(valid_df)
+    return (np.asarray(valid_df['item_price'])
+            * (1 + np.asarray(valid_df['tax_pct']) + np.asarray(valid_df['tip_pct'])))
+
+
+def _split_shared_by(valid_df):
+    """
+    Tokenize 'shared_by' into every consumer name and the number of consumers per item.
+
+    Names are returned as one flat object array, in item order and in
+    'shared_by' order within each item, without any weight or fixed amount.
+    """
+    names, num_shared_people, _ = _parse_shared_by(valid_df)
+    return names, num_shared_people
+
+
+def _parse_shared_by(valid_df):
+    """
+    Tokenize 'shared_by' once, with the weight or fixed amount of every token.
+
+    Returns the names and the number of consumers per item as
+    `_split_shared_by` does, and None if every share is equal, or else a
+    (weight, fixed) pair of float arrays aligned with the names. Together
+    with the item offsets given by the number of consumers, the names and
+    weights form a compressed sparse row matrix of items by people.
+    """
+    _check_shared_by(valid_df)
+    # a single str.split over all items joined together is much cheaper
+    # than splitting every item on its own
+    shared_by = valid_df['shared_by']
+    num_shared_people = shared_by.str.count(';').to_numpy() + 1
+    text = ';'.join(shared_by.tolist())
+    tokens = np.array(text.split(';') if len(shared_by) else [], dtype=object)
+    if ':' not in text and '=' not in text:
+        return tokens, num_shared_people.astype(np.int64), None
+    names, weight, fixed = _parse_share_tokens(tokens)
+    return names, num_shared_people.astype(np.int64), (weight, fixed)
+
+
+def _check_shared_by(valid_df):
+    """Raise ValueError if the 'shared_by' of any item is missing or empty."""
+    shared_by = valid_df['shared_by']
+    empty = (shared_by.isna() | (shared_by == '')).to_numpy()
+    if empty.any():
+        rows = ", ".join(map(str, valid_df.index[empty][:5]))
+        raise ValueError(f"'shared_by' must name at least one person for every item "
+                         f"(rows {rows}).")
+
+
+def _parse_share_tokens(tokens):
+    """
+    Split 'shared_by' tokens into names, weights and fixed amounts.
+
+    'Leo' has weight 1, 'Leo:2' has weight 2 and 'Leo=12.50' pays a fixed
+    12.50 of the item price, before tax and tip, and has weight 0. A token
+    is cut at its first ':' or '='.
+
+    All tokens are cut at once on the bytes of their joined text, so the
+    only per-token work is one str.split for the names and one for the
+    values. ';', ':' and '=' never occur inside a multi-byte UTF-8
+    character, so the byte masks never cut a character in two.
+    """
+    tokens = np.asarray(tokens, dtype=object)
+    if len(tokens) == 0:
+        return tokens, np.ones(0), np.zeros(0)
+    data = np.frombuffer(';'.join(tokens.tolist()).encode('utf-8'), dtype=np.uint8)
+    is_sep = data == ord(';')
+    is_mark = (data == ord(':')) | (data == ord('='))
+    token = np.cumsum(is_sep) - is_sep  # separators belong to the token before them
+
+    # rank of every ':' or '=' within its token; bytes from the first one on
+    # are the suffix, and the first one gives the kind of the token
+    marks = np.cumsum(is_mark)
+    rank = marks - np.concatenate([[0], marks[is_sep]])[token]
+    in_suffix = (rank > 0) & ~is_sep
+    first_mark = is_mark & (rank == 1)
+    kind = np.zeros(len(tokens), dtype=np.uint8)
+    kind[token[first_mark]] = data[first_mark]
+
+    names = np.array(data[~in_suffix].tobytes().decode('utf-8').split(';'), dtype=object)
+    values = data[(in_suffix & ~first_mark) | is_sep].tobytes().decode('utf-8').split(';')
+    weighted, is_fixed = kind == ord(':'), kind == ord('=')
+    value = np.full(len(tokens), np.nan)
+    value[kind > 0] = _to_float(np.array(values, dtype=object)[kind > 0])
+
+    invalid = ((weighted | is_fixed) & ~np.isfinite(value)) | (weighted & (value <= 0)) \
+        | (is_fixed & (value < 0)) | (names == '')
+    if invalid.any():
+        bad = ", ".join(repr(token) for token in pd.unique(tokens[invalid])[:5])
+        raise ValueError(f"Invalid share(s) in 'shared_by': {bad}. Use 'name', 'name:weight' "
+                         f"with a positive weight or 'name=amount' with a non-negative amount.")
+    weight = np.where(weighted, value, np.where(is_fixed, 0.0, 1.0))
+    fixed = np.where(is_fixed, value, 0.0)
+    return names, weight, fixed
+
+
+def _to_float(strings):
+    """Parse strings as float64, with NaN for the ones that are not numbers."""
+    try:
+        return strings.astype(np.float64)
+    except ValueError:
+        return pd.to_numeric(pd.Series(strings, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _explode_shares(valid_df, money="float", cost=None):
+    """
+    Return every (item, consumer) pair as two flat, aligned arrays.
+
+    The first array holds the consumer names as returned by `_split_shared_by`;
+    the second holds each consumer's share of the item. A third array holds
+    the number of consumers of every item. `cost` may hold the precomputed
+    output of `_item_cost` so that it is not computed twice.
+    """
+    if cost is None:
+        cost = _item_cost(valid_df, money)
+
+    names, num_shared_people, weights = _parse_shared_by(valid_df)
+    if weights is None:
+        return names, _item_shares(cost, num_shared_people, money), num_shared_people
+    multiplier = (1 + valid_df['tax_pct'] + valid_df['tip_pct']).to_numpy()
+    shares = _weighted_shares(valid_df['item_price'].to_numpy(), multiplier, cost,
+                              num_shared_people, *weights, money)
+    return names, shares, num_shared_people
+
+
+def _item_shares(cost, num_shared_people, money="float"):
+    """Split the cost of every item among its consumers, one share per consumer."""
+    if money == "cents":
+        # position of every consumer within its item, in `shared_by` order
+        starts = np.repeat(np.cumsum(num_shared_people) - num_shared_people, num_shared_people)
+        position = np.arange(starts.size) - starts
+        return split_cents(np.repeat(cost, num_shared_people),
+                           np.repeat(num_shared_people, num_shared_people),
+                           position)
+    return np.repeat(cost / np.maximum(num_shared_people, 1), num_shared_people)
+
+
+def _weighted_shares(price, multiplier, cost, num_shared_people, weight, fixed, money="float"):
+    """
+    Split the cost of every item by weights and fixed amounts, one share per consumer.
+
+    Fixed amounts (in dollars) are taken from the item price first, and the
+    rest of the price is split among the weighted consumers in proportion
+    to their weights; tax and tip apply to every share alike. All of it is
+    done in one pass over the flat arrays of `_parse_shared_by`.
+    """
+    item = np.repeat(np.arange(len(num_shared_people)), num_shared_people)
+    if money == "cents":
+        fixed = fixed * 100
+    rest = price - np.bincount(item, weights=fixed, minlength=len(price))
+    weight_sum = np.bincount(item, weights=weight, minlength=len(price))
+
+    # fixed amounts may not go over the price, and a price they leave over
+    # needs someone to share it; half a cent of slack absorbs float error
+    slack = 0.5 if money == "cents" else 0.005
+    unshared = (rest < -slack) | ((weight_sum == 0) & (rest > slack) & (num_shared_people > 0))
+    if unshared.any():
+        rows = ", ".join(str(row) for row in np.flatnonzero(unshared)[:5])
+        raise ValueError(f"Fixed amounts in 'shared_by' must add up to at most 'item_price', and "
+                         f"to exactly 'item_price' when nobody shares the rest (rows {rows}).")
+
+    # every consumer's exact share of the price, then with tax and tip
+    own_weight = np.divide(weight, weight_sum[item], out=np.zeros_like(weight),
+                           where=weight_sum[item] > 0)
+    quota = (fixed + np.maximum(rest, 0)[item] * own_weight) * multiplier[item]
+    if money == "cents":
+        starts = np.cumsum(num_shared_people) - num_shared_people
+        position = np.arange(len(item)) - starts[item]
+        return split_cents_weighted(cost, quota, item, position)
+    return quota
+
+
+def _split_by_item_loop(valid_df):
+    """Reference engine that scans `valid_df` once per consumer."""
+    # compute `num_shared_people` and `individual_price` without adding them to `valid_df`
+    num_shared_people = 1 + valid_df['shared_by'].str.count(";")
+    individual_price = (valid_df['item_price']
+                        * (1 + valid_df['tax_pct'] + valid_df['tip_pct'])
+                        / num_shared_people)
 
     # get a list of the unique names of consumers
     # who appear in the `shared_by` column at least once
@@ -56,10 +359,11 @@ def split_by_item(valid_df):
         'should_pay': [0.0] * len(all_consumers)
     })
 
-    # calculate the correct amount in the `should_pay` column
+    # calculate the correct amount in the `should_pay` column,
+    # matching each name only as a whole ';'-separated token
     for i, person in enumerate(all_consumers):
-        amt_should_pay = valid_df[valid_df['shared_by'].str.contains(person)]['individual_price'].sum()
+        pattern = f"(?:^|;){re.escape(person)}(?:;|$)"
+        amt_should_pay = individual_price[valid_df['shared_by'].str.contains(pattern)].sum()
         should_pay_df.loc[i, 'should_pay'] = amt_should_pay
 
     return should_pay_df
-
@@ -0,0 +1,105 @@
+"""Module for folding chunks of a bill into per-person totals."""
+
+import pandas as pd
+
+from billsplittermds._money import check_money
+from billsplittermds.individual_total_payments import individual_total_payments
+from billsplittermds.split_by_item import split_by_item
+
+
+class TotalsAccumulator:
+    """
+    Incrementally compute what each person should pay and actually paid.
+
+    Each call to `update` runs 'split_by_item' and 'individual_total_payments'
+    on one chunk and adds the partial sums to running per-person totals. Memory
+    use is bounded by the chunk size and the number of people, not by the
+    length of the bill.
+
+    Parameters
+    ----------
+    engine : {'explode', 'loop'}, default 'explode'
+        Engine passed on to 'split_by_item'.
+
+    money : {'float', 'cents'}, default 'float'
+        Money representation of the chunks and of the totals.
+
+    Examples
+    --------
+    >>> totals = TotalsAccumulator()
+    >>> for chunk in load_validate_data("trip.csv", chunksize=100_000):
+    ...     totals.update(chunk)
+    >>> amount_to_transfer(totals.should_pay_df(), totals.actually_paid_df())
+        sender  receiver    amount
+    0   Mia     Leo         20.0
+    1   Mia     Ana         10.0
+    """
+
+    def __init__(self, engine="explode", money="float"):
+        check_money(money)
+        self.engine = engine
+        self.money = money
+        self.rows = 0
+        self._should_pay = None
+        self._actually_paid = None
+
+    def update(self, valid_df):
+        """
+        Add the totals of one validated chunk.
+
+        Parameters
+        ----------
+        valid_df : pandas.DataFrame
+            A validated chunk, typically yielded by
+            ``load_validate_data(..., chunksize=...)``.
+
+        Returns
+        -------
+        TotalsAccumulator
+            The accumulator itself, so calls can be chained.
+        """
+        should_pay = split_by_item(valid_df, engine=self.engine, money=self.money)
+        actually_paid = individual_total_payments(valid_df, money=self.money)
+
+        self._should_pay = _fold(self._should_pay, should_pay.set_index('name')['should_pay'])
+        self._actually_paid = _fold(self._actually_paid,
+                                    actually_paid.set_index('name')['actually_paid'])
+        self.rows += len(valid_df)
+        return self
+
+    def should_pay_df(self):
+        """
+        Return the running totals in the format of 'split_by_item'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Dataframe with columns 'name' and 'should_pay'.
+        """
+        return _to_frame(self._should_pay, 'should_pay', self.money)
+
+    def actually_paid_df(self):
+        """
+        Return the running totals in the format of 'individual_total_payments'.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Dataframe with columns 'name' and 'actually_paid'.
+        """
+        return _to_frame(self._actually_paid, 'actually_paid', self.money)
+
+
+def _fold(total, partial):
+    """Add a per-person partial sum to a running per-person total."""
+    if total is None:
+        return partial.groupby(level=0).sum()
+    return pd.concat([total, partial]).groupby(level=0).sum()
+
+
+def _to_frame(total, column, money):
+    """Turn a per-person total into a two-column dataframe."""
+    if total is None:
+        dtype = 'int64' if money == 'cents' else 'float64'
+        return pd.DataFrame({'name': pd.Series(dtype=object), column: pd.Series(dtype=dtype)})
+    return total.rename(column).rename_axis('name').reset_index()
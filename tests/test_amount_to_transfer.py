@@ -1,9 +1,57 @@
 """Tests for amount_to_transfer function."""
 
+import random
+from decimal import Decimal
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from billsplittermds.amount_to_transfer import amount_to_transfer
+from billsplittermds.amount_to_transfer import (
+    CENT,
+    Transfer,
+    amount_to_transfer,
+    iter_transfers,
+    settle_arrays,
+)
+
+
+def reference_amount_to_transfer(should_pay_df, actually_paid_df):
+    """The original max()-scan settlement loop, kept to check the heap solver against."""
+    merged_df = pd.merge(should_pay_df, actually_paid_df, on='name', how='outer')
+    merged_df['should_pay'] = merged_df['should_pay'].fillna(0)
+    merged_df['actually_paid'] = merged_df['actually_paid'].fillna(0)
+    merged_df['balance'] = (
+        merged_df['actually_paid'].apply(lambda x: Decimal(str(x))) -
+        merged_df['should_pay'].apply(lambda x: Decimal(str(x))))
+    balances = merged_df[['name', 'balance']]
+
+    creditors = balances[balances['balance'] > CENT]
+    debtors = balances[balances['balance'] < -CENT]
+    creditor_dict = dict(zip(creditors['name'], creditors['balance']))
+    debtor_dict = dict(zip(debtors['name'], -debtors['balance']))
+
+    transfers = []
+    while creditor_dict and debtor_dict:
+        creditor = max(creditor_dict, key=creditor_dict.get)
+        debtor = max(debtor_dict, key=debtor_dict.get)
+        transfer_amount = min(creditor_dict[creditor], debtor_dict[debtor])
+        if transfer_amount > CENT:
+            transfers.append({
+                'sender': debtor,
+                'receiver': creditor,
+                'amount': transfer_amount.quantize(CENT)
+            })
+        creditor_dict[creditor] -= transfer_amount
+        debtor_dict[debtor] -= transfer_amount
+        if creditor_dict[creditor] < CENT:
+            del creditor_dict[creditor]
+        if debtor_dict[debtor] < CENT:
+            del debtor_dict[debtor]
+
+    if transfers:
+        return pd.DataFrame(transfers)
+    return pd.DataFrame(columns=['sender', 'receiver', 'amount'])
 
 
 class TestAmountToTransfer:
@@ -92,3 +140,252 @@ class TestAmountToTransfer:
         result = amount_to_transfer(should_pay, actually_paid)
 
         assert set(result.columns) == {'sender', 'receiver', 'amount'}
+
+    def test_cents_mode(self):
+        """In cents mode, every cent is transferred and amounts are int64."""
+        should_pay = pd.DataFrame({
+            'name': ['Leo', 'Ana', 'Mia'],
+            'should_pay': [3334, 3333, 3333]
+        })
+        actually_paid = pd.DataFrame({
+            'name': ['Leo', 'Ana'],
+            'actually_paid': [9999, 1]
+        })
+
+        result = amount_to_transfer(should_pay, actually_paid, money='cents')
+
+        assert result['amount'].dtype == 'int64'
+        assert result.to_dict('records') == [
+            {'sender': 'Mia', 'receiver': 'Leo', 'amount': 3333},
+            {'sender': 'Ana', 'receiver': 'Leo', 'amount': 3332},
+        ]
+
+    def test_cents_transfers_single_cent(self):
+        """A one cent balance is still settled in cents mode."""
+        should_pay = pd.DataFrame({'name': ['Leo', 'Ana'], 'should_pay': [100, 101]})
+        actually_paid = pd.DataFrame({'name': ['Leo', 'Ana'], 'actually_paid': [101, 100]})
+
+        result = amount_to_transfer(should_pay, actually_paid, money='cents')
+
+        assert result.to_dict('records') == [{'sender': 'Ana', 'receiver': 'Leo', 'amount': 1}]
+
+    def test_min_transfers_strategy(self):
+        """
+        'min_transfers' settles Ana with Eve on their own, which saves one
+        transfer over the greedy matching.
+        """
+        should_pay = pd.DataFrame({
+            'name': ['Ana', 'Bob', 'Cat', 'Dan', 'Eve'],
+            'should_pay': [0.0, 0.0, 0.0, 7.0, 6.0]
+        })
+        actually_paid = pd.DataFrame({
+            'name': ['Ana', 'Bob', 'Cat'],
+            'actually_paid': [6.0, 4.0, 3.0]
+        })
+
+        greedy = amount_to_transfer(should_pay, actually_paid)
+        result = amount_to_transfer(should_pay, actually_paid, strategy='min_transfers')
+
+        assert len(greedy) == 4
+        assert len(result) == 3
+        assert {'sender': 'Eve', 'receiver': 'Ana', 'amount': 6} in result.to_dict('records')
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_min_transfers_settles_everyone(self, seed):
+        """
+        'min_transfers' leaves every balance settled and never needs more
+        transfers than 'greedy', for both the exact and the bounded search.
+        """
+        rng = random.Random(seed)
+        # zero-sum clusters of 1 creditor and 1-3 debtors, plus noise
+        should, paid = {}, {}
+        for cluster in range(rng.randint(1, 12)):
+            debts = [rng.randint(1, 5000) for _ in range(rng.randint(1, 3))]
+            paid[f'c{cluster}'] = sum(debts)
+            for i, debt in enumerate(debts):
+                should[f'd{cluster}_{i}'] = debt
+        should_pay = pd.DataFrame({'name': list(should), 'should_pay': list(should.values())})
+        actually_paid = pd.DataFrame({'name': list(paid), 'actually_paid': list(paid.values())})
+
+        greedy = amount_to_transfer(should_pay, actually_paid, money='cents')
+        result = amount_to_transfer(should_pay, actually_paid, money='cents', strategy='min_transfers')
+
+        assert len(result) <= len(greedy)
+        received = result.groupby('receiver')['amount'].sum()
+        sent = result.groupby('sender')['amount'].sum()
+        for name, amount in paid.items():
+            assert received.get(name, 0) - sent.get(name, 0) == amount
+        for name, amount in should.items():
+            assert sent.get(name, 0) - received.get(name, 0) == amount
+
+    def test_min_transfers_sub_cent_balances(self):
+        """
+        With balances that are not whole cents, 'min_transfers' leaves
+        nobody off by a cent and leaves no more unsettled than 'greedy'.
+        """
+        balances = {'Ana': -53.7762, 'Bob': 47.6226, 'Cat': 6.1597,
+                    'Dan': 50.2799, 'Eve': -32.0939, 'Fay': -18.1921}
+        should_pay = pd.DataFrame({'name': list(balances),
+                                   'should_pay': [max(-b, 0.0) for b in balances.values()]})
+        actually_paid = pd.DataFrame({'name': list(balances),
+                                      'actually_paid': [max(b, 0.0) for b in balances.values()]})
+
+        def unsettled(transfers):
+            left = {name: Decimal(str(balance)) for name, balance in balances.items()}
+            for sender, receiver, amount in transfers.itertuples(index=False):
+                left[sender] += amount
+                left[receiver] -= amount
+            return [abs(amount) for amount in left.values()]
+
+        greedy = unsettled(amount_to_transfer(should_pay, actually_paid))
+        result = unsettled(amount_to_transfer(should_pay, actually_paid, strategy='min_transfers'))
+
+        assert max(result) < Decimal('0.01')
+        assert sum(result) <= sum(greedy)
+
+    def test_invalid_strategy(self, simple_transfer_dfs):
+        """An unknown strategy should raise ValueError."""
+        should_pay, actually_paid = simple_transfer_dfs
+        with pytest.raises(ValueError):
+            amount_to_transfer(should_pay, actually_paid, strategy='optimal')
+
+    def test_invalid_money(self, simple_transfer_dfs):
+        """An unknown money mode should raise ValueError."""
+        should_pay, actually_paid = simple_transfer_dfs
+        with pytest.raises(ValueError):
+            amount_to_transfer(should_pay, actually_paid, money='euros')
+
+    @pytest.mark.parametrize('seed', range(50))
+    def test_matches_reference_settlement(self, seed):
+        """
+        The heap-based solver should produce exactly the same transfer list as
+        the original max()-scan loop, including how ties are broken.
+        """
+        rng = random.Random(seed)
+        n_people = rng.randint(1, 40)
+        names = [f'p{i}' for i in range(n_people)]
+        # draw from a small set of amounts so that ties and exact matches are common
+        amounts = [0.0, 0.01, 0.02, 5.0, 10.0, 12.34, 30.0, 33.33, 100.0]
+        should_pay = pd.DataFrame({
+            'name': names,
+            'should_pay': [rng.choice(amounts) for _ in names]
+        })
+        actually_paid = pd.DataFrame({
+            'name': rng.sample(names, rng.randint(0, n_people)),
+        })
+        actually_paid['actually_paid'] = [rng.choice(amounts) for _ in range(len(actually_paid))]
+
+        result = amount_to_transfer(should_pay, actually_paid)
+        expected = reference_amount_to_transfer(should_pay, actually_paid)
+
+        assert result.to_dict('records') == expected.to_dict('records')
+
+
+class TestSettleArrays:
+    """Test suite for the settle_arrays function."""
+
+    def test_balances(self):
+        """Balances are settled into sender, receiver and amount fields."""
+        result = settle_arrays(['Leo', 'Ana', 'Mia'], np.array([20.0, 10.0, -30.0]))
+
+        assert result.dtype.names == ('sender', 'receiver', 'amount')
+        assert result['sender'].tolist() == [2, 2]
+        assert result['receiver'].tolist() == [0, 1]
+        assert result['amount'].tolist() == [20.0, 10.0]
+
+    def test_matches_amount_to_transfer(self):
+        """should_pay / actually_paid arrays give the same transfers as the dataframes."""
+        rng = random.Random(0)
+        # amount_to_transfer's merge sorts names, so ties only break alike on sorted names
+        names = np.array(sorted(f'p{i}' for i in range(30)), dtype=object)
+        should = [rng.choice([0.0, 5.0, 12.34, 33.33]) for _ in names]
+        paid = [rng.choice([0.0, 5.0, 12.34, 33.33]) for _ in names]
+
+        result = settle_arrays(names, should_pay=should, actually_paid=paid)
+        expected = amount_to_transfer(pd.DataFrame({'name': names, 'should_pay': should}),
+                                      pd.DataFrame({'name': names, 'actually_paid': paid}))
+
+        assert names[result['sender']].tolist() == expected['sender'].tolist()
+        assert names[result['receiver']].tolist() == expected['receiver'].tolist()
+        assert result['amount'].tolist() == expected['amount'].astype(float).tolist()
+
+    def test_cents(self):
+        """In cents mode amounts are int64, and fractional cents are refused."""
+        result = settle_arrays(['Leo', 'Ana'], np.array([-1, 1]), money='cents')
+
+        assert result['amount'].dtype == np.int64
+        assert result.tolist() == [(0, 1, 1)]
+        with pytest.raises(ValueError, match="whole cents"):
+            settle_arrays(['Leo', 'Ana'], np.array([-1.5, 1.5]), money='cents')
+
+    def test_no_transfers(self):
+        """Settled balances give an empty array with the same fields."""
+        result = settle_arrays(['Leo', 'Ana'], np.zeros(2))
+
+        assert len(result) == 0
+        assert result.dtype.names == ('sender', 'receiver', 'amount')
+
+    @pytest.mark.parametrize('kwargs', [
+        {},
+        {'should_pay': [1.0, 2.0]},
+        {'balances': [1.0, -1.0], 'should_pay': [1.0, 2.0], 'actually_paid': [2.0, 1.0]},
+        {'balances': [1.0, -1.0, 0.0]},
+    ])
+    def test_invalid_inputs(self, kwargs):
+        """Missing, mixed or misaligned inputs raise ValueError."""
+        with pytest.raises(ValueError):
+            settle_arrays(['Leo', 'Ana'], **kwargs)
+
+
+class TestIterTransfers:
+    """Test suite for the iter_transfers generator."""
+
+    @pytest.fixture
+    def totals(self):
+        """Random totals for 50 people, with some only in one dataframe."""
+        rng = random.Random(7)
+        names = [f"p{i}" for i in range(50)]
+        should_pay = pd.DataFrame({'name': names[:45],
+                                   'should_pay': [round(rng.uniform(0, 100), 2) for _ in range(45)]})
+        actually_paid = pd.DataFrame({'name': names[5:],
+                                      'actually_paid': [round(rng.uniform(0, 100), 2) for _ in range(45)]})
+        return should_pay, actually_paid
+
+    @pytest.mark.parametrize("strategy", ["greedy", "min_transfers"])
+    def test_matches_amount_to_transfer(self, totals, strategy):
+        """The records are the rows of amount_to_transfer, in the same order."""
+        transfers = list(iter_transfers(*totals, strategy=strategy))
+        expected = amount_to_transfer(*totals, strategy=strategy)
+
+        assert all(isinstance(transfer, Transfer) for transfer in transfers)
+        assert [tuple(transfer) for transfer in transfers] == list(
+            expected.itertuples(index=False, name=None))
+
+    def test_cents(self, totals):
+        """In cents mode every amount is an int, as in amount_to_transfer."""
+        should_pay, actually_paid = totals
+        should_pay = should_pay.assign(should_pay=(should_pay['should_pay'] * 100).round().astype('int64'))
+        actually_paid = actually_paid.assign(
+            actually_paid=(actually_paid['actually_paid'] * 100).round().astype('int64'))
+
+        transfers = list(iter_transfers(should_pay, actually_paid, money="cents"))
+        expected = amount_to_transfer(should_pay, actually_paid, money="cents")
+
+        assert all(type(transfer.amount) is int for transfer in transfers)
+        assert [transfer.amount for transfer in transfers] == expected['amount'].tolist()
+
+    def test_is_lazy(self, totals):
+        """The first transfer comes out before the rest are computed."""
+        transfers = iter_transfers(*totals)
+        assert iter(transfers) is transfers
+
+        first = next(transfers)
+        assert first == next(iter_transfers(*totals))
+        assert len(list(transfers)) == len(amount_to_transfer(*totals)) - 1
+
+    def test_invalid_inputs_raise_at_call(self, totals):
+        """Inputs are checked when the iterator is created, not on first use."""
+        with pytest.raises(ValueError):
+            iter_transfers(*totals, strategy="fastest")
+        with pytest.raises(ValueError):
+            iter_transfers(totals[0].drop(columns='should_pay'), totals[1])
@@ -0,0 +1,105 @@
+"""Tests for the asyncio service layer."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from billsplittermds.async_service import AsyncSettler, settle_async
+from billsplittermds.load_validate_data import ValidationError, load_validate_data
+from billsplittermds.settle import settle
+
+HEADER = "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+
+
+@pytest.fixture
+def bills(tmp_path):
+    """Two valid bills and one invalid bill."""
+    paris = tmp_path / "paris.csv"
+    paris.write_text(HEADER + "Leo,taxi,25,Leo;Ana,0.07,0.0\n" + "Ana,lunch,20,Ana;Mia,0.12,0.15\n")
+    rome = tmp_path / "rome.csv"
+    rome.write_text(HEADER + "Joe,dinner,80.33,Joe;Amy,0.10,0.20\n")
+    broken = tmp_path / "broken.csv"
+    broken.write_text(HEADER + "Joe,dinner,-1,Joe;Amy,0.10,0.20\n")
+    return paris, rome, broken
+
+
+def test_settle_async(bills):
+    """settle_async gives the same transfers as settle."""
+    paris, _, _ = bills
+    result = asyncio.run(settle_async(paris))
+
+    pd.testing.assert_frame_equal(result, settle(paris))
+
+
+def test_load_validate_data(bills):
+    """Loading runs in the executor and gives the same dataframe."""
+    paris, _, _ = bills
+    result = asyncio.run(AsyncSettler().load_validate_data(paris))
+
+    pd.testing.assert_frame_equal(result, load_validate_data(paris))
+
+
+def test_settle_many_in_order(bills):
+    """Results come back in input order, with options passed on."""
+    paris, rome, _ = bills
+    settler = AsyncSettler(max_concurrency=2)
+    results = asyncio.run(settler.settle_many([paris, rome, paris], money="cents"))
+
+    assert len(results) == 3
+    for path, result in zip([paris, rome, paris], results):
+        pd.testing.assert_frame_equal(result, settle(path, money="cents"))
+
+
+def test_settle_many_errors(bills):
+    """A failing bill raises, or is returned in place with return_exceptions=True."""
+    paris, _, broken = bills
+    settler = AsyncSettler(max_concurrency=2)
+
+    with pytest.raises(ValidationError):
+        asyncio.run(settler.settle_many([paris, broken]))
+
+    settler = AsyncSettler(max_concurrency=2)
+    results = asyncio.run(settler.settle_many([paris, broken], return_exceptions=True))
+    assert isinstance(results[0], pd.DataFrame)
+    assert isinstance(results[1], ValidationError)
+
+
+def test_concurrency_is_capped():
+    """No more than max_concurrency jobs run at once; the others wait."""
+    active = 0
+    most_active = 0
+    lock = threading.Lock()
+
+    def job():
+        nonlocal active, most_active
+        with lock:
+            active += 1
+            most_active = max(most_active, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    async def main(settler):
+        tasks = [asyncio.ensure_future(settler._run(job)) for _ in range(8)]
+        await asyncio.sleep(0.005)
+        waiting = settler.waiting
+        await asyncio.gather(*tasks)
+        return waiting
+
+    with ThreadPoolExecutor(8) as pool:
+        settler = AsyncSettler(pool, max_concurrency=2)
+        waiting = asyncio.run(main(settler))
+
+    assert most_active == 2
+    assert waiting == 6
+    assert settler.running == settler.waiting == 0
+
+
+def test_invalid_max_concurrency():
+    """max_concurrency must be a positive integer."""
+    with pytest.raises(ValueError):
+        AsyncSettler(max_concurrency=0)
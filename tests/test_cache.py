@@ -0,0 +1,115 @@
+"""Tests for the SettlementCache class."""
+
+import pandas as pd
+import pytest
+
+from billsplittermds.cache import SettlementCache
+from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.settle import settle
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """A bill where several people owe money to several others."""
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Leo,candy,10,Leo,0.12,0.15\n"
+        "Leo,taxi,25,Leo;Ana,0.07,0.0\n"
+        "Ana,lunch,20,Ana;Mia,0.12,0.15\n"
+        "Mia,museum,45,Leo;Ana;Mia;Joe,0.05,0.0\n"
+    )
+    path = tmp_path / "trip.csv"
+    path.write_text(csv_content)
+    return path
+
+
+def test_hits_and_misses(csv_path):
+    """A second call with the same file and options is served from the cache."""
+    cache = SettlementCache()
+
+    first = cache.settle(csv_path)
+    second = cache.settle(csv_path)
+    cache.settle(csv_path, money="cents")
+
+    pd.testing.assert_frame_equal(first, settle(csv_path))
+    pd.testing.assert_frame_equal(second, first)
+    info = cache.info()
+    # each money mode misses once for the validated bill and once for the transfers
+    assert (info.hits, info.misses, info.currsize) == (1, 4, 4)
+
+
+def test_changed_file_is_recomputed(csv_path):
+    """Results are keyed by content, so an edited file is never served stale results."""
+    cache = SettlementCache()
+    before = cache.settle(csv_path)
+
+    with open(csv_path, "a") as f:
+        f.write("Joe,dinner,80,Joe;Leo,0.10,0.20\n")
+    after = cache.settle(csv_path)
+
+    assert cache.hits == 0
+    pd.testing.assert_frame_equal(after, settle(csv_path))
+    assert not after.equals(before)
+
+
+def test_dataframe_input(csv_path):
+    """Equal dataframes share a result, and results are returned as copies."""
+    cache = SettlementCache()
+    valid_df = cache.load_validate_data(csv_path)
+    valid_df.loc[0, "item_name"] = "gum"
+
+    cache.settle(load_validate_data(csv_path))
+    result = cache.settle(load_validate_data(csv_path))
+    result.loc[0, "amount"] = -1.0
+
+    assert cache.load_validate_data(csv_path).loc[0, "item_name"] == "candy"
+    assert cache.settle(load_validate_data(csv_path)).loc[0, "amount"] > 0
+    assert cache.hits == 3
+
+
+def test_lru_eviction(csv_path, tmp_path):
+    """The least recently used result is dropped first."""
+    other_path = tmp_path / "other.csv"
+    other_path.write_text(csv_path.read_text().replace("Mia", "Max"))
+    cache = SettlementCache(maxsize=2)
+
+    cache.load_validate_data(csv_path)
+    cache.load_validate_data(other_path)
+    cache.load_validate_data(csv_path)
+    cache.load_validate_data(csv_path, money="cents")
+    cache.load_validate_data(csv_path)
+    cache.load_validate_data(other_path)
+
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+@pytest.mark.parametrize("money", ["float", "cents"])
+def test_disk_store(csv_path, tmp_path, money):
+    """Results written by one cache are read back by another, with their dtypes."""
+    with open(csv_path, "a") as f:
+        f.write("Joe,,80,Joe;Leo,0.10,0.20\n")  # a missing item name
+    directory = tmp_path / "store"
+    writer = SettlementCache(directory=directory)
+    expected = writer.settle(csv_path, money=money, strategy="min_transfers")
+    expected_df = writer.load_validate_data(csv_path, money=money)
+
+    cache = SettlementCache(directory=directory)
+    result = cache.settle(csv_path, money=money, strategy="min_transfers")
+    valid_df = cache.load_validate_data(csv_path, money=money)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert [type(amount) for amount in result["amount"]] == [type(amount)
+                                                             for amount in expected["amount"]]
+    pd.testing.assert_frame_equal(valid_df, expected_df)
+    assert cache.info().disk_hits == 2
+    assert cache.misses == 0
+    # results are stored as plain data that is never unpickled
+    assert all(path.suffix == ".json" for path in directory.iterdir())
+
+
+@pytest.mark.parametrize("maxsize", [-1, 1.5, True])
+def test_invalid_maxsize(maxsize):
+    """maxsize must be a non-negative integer or None."""
+    with pytest.raises(ValueError, match="maxsize"):
+        SettlementCache(maxsize=maxsize)
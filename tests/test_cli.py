@@ -0,0 +1,109 @@
+"""Tests for the command-line interface."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from billsplittermds.cli import main
+from billsplittermds.settle import settle
+
+
+@pytest.fixture
+def bills(tmp_path):
+    """A directory with two valid bills and one invalid bill."""
+    directory = tmp_path / "bills"
+    directory.mkdir()
+    header = "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+    (directory / "paris.csv").write_text(header
+                                         + "Leo,taxi,25,Leo;Ana,0.07,0.0\n"
+                                         + "Ana,lunch,20,Ana;Mia,0.12,0.15\n")
+    (directory / "rome.csv").write_text(header + "Joe,dinner,80.33,Joe;Amy,0.10,0.20\n")
+    (directory / "notes.txt").write_text("not a bill")
+    return directory
+
+
+def test_single_file_to_stdout(bills, capsys):
+    """One file prints its transfers as csv."""
+    path = bills / "paris.csv"
+
+    assert main([str(path)]) == 0
+
+    out = capsys.readouterr().out
+    expected = settle(path)
+    assert out.splitlines()[0] == "sender,receiver,amount"
+    assert len(out.splitlines()) == len(expected) + 1
+
+
+def test_directory_to_json(bills, tmp_path):
+    """A directory is settled into one table with a 'file' column."""
+    output = tmp_path / "transfers.json"
+
+    assert main([str(bills), "-o", str(output), "--money", "cents"]) == 0
+
+    records = json.loads(output.read_text())
+    assert {record["file"] for record in records} == {str(bills / "paris.csv"),
+                                                      str(bills / "rome.csv")}
+    rome = [r for r in records if r["file"].endswith("rome.csv")]
+    assert rome == [{"file": str(bills / "rome.csv"), "sender": "Amy", "receiver": "Joe",
+                     "amount": 5221}]
+    assert all(isinstance(record["amount"], int) for record in records)
+
+
+def test_glob_to_output_dir_in_parallel(bills, tmp_path, capsys):
+    """A glob settled by worker processes writes one file per bill and a profile."""
+    out_dir = tmp_path / "out"
+
+    status = main([str(bills / "*.csv"), "--output-dir", str(out_dir), "--jobs", "2", "--profile"])
+
+    assert status == 0
+    assert sorted(p.name for p in out_dir.iterdir()) == ["paris.csv", "rome.csv"]
+    result = pd.read_csv(out_dir / "paris.csv")
+    assert result["amount"].tolist() == pytest.approx(
+        settle(bills / "paris.csv")["amount"].astype(float).tolist())
+    err = capsys.readouterr().err
+    assert "load [s]" in err and "total" in err
+
+
+def test_output_dir_name_clash(bills, tmp_path, capsys):
+    """Inputs with the same file name are refused instead of overwriting each other."""
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "paris.csv").write_text((bills / "paris.csv").read_text())
+    out_dir = tmp_path / "out"
+
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(bills), str(other), "--output-dir", str(out_dir)])
+
+    assert exit_info.value.code == 2
+    assert "same file" in capsys.readouterr().err
+    assert not out_dir.exists()
+
+
+def test_invalid_bill_is_reported(bills, capsys):
+    """A bill that fails validation is reported and the others are still settled."""
+    (bills / "bad.csv").write_text("payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+                                   "Leo,taxi,-5,Leo,0.07,0.0\n")
+
+    assert main([str(bills)]) == 1
+
+    captured = capsys.readouterr()
+    assert "bad.csv" in captured.err and "non-negative" in captured.err
+    assert "rome.csv" in captured.out
+
+
+def test_invalid_arguments(bills, tmp_path, capsys):
+    """Missing inputs and parquet without a destination are usage errors."""
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(tmp_path / "missing*.csv")])
+    assert excinfo.value.code == 2
+
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(bills / "paris.csv"), str(bills / "typo.csv")])
+    assert excinfo.value.code == 2
+    err = capsys.readouterr().err
+    assert "typo.csv" in err and "paris.csv" not in err
+
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(bills / "paris.csv"), "--format", "parquet"])
+    assert excinfo.value.code == 2
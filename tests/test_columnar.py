@@ -0,0 +1,77 @@
+"""Tests for the columnar read_table, write_table and read_ledger functions."""
+
+import pandas as pd
+import pytest
+
+from billsplittermds.amount_to_transfer import amount_to_transfer
+from billsplittermds.columnar import read_ledger, read_table, write_table
+from billsplittermds.load_validate_data import load_validate_data
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def valid_df(tmp_path):
+    """A validated bill read from a small csv file."""
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Amy,Pasta,18,Amy,0.05,0.12\n"
+        "Sam,Taxi,33,Amy;Ben;Sam;Joe,0.05,0.00\n"
+        "Ben,double-room,230,Amy;Ben,0.12,0.04\n"
+    )
+    csv_path = tmp_path / "trip.csv"
+    csv_path.write_text(csv_content)
+    return load_validate_data(csv_path)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+@pytest.mark.parametrize("memory_map", [True, False])
+def test_ledger_round_trip(tmp_path, valid_df, suffix, memory_map):
+    """A written ledger reads back with the same values and dtypes."""
+    path = tmp_path / f"trip{suffix}"
+    write_table(valid_df, path)
+
+    result = read_ledger(path, memory_map=memory_map)
+
+    pd.testing.assert_frame_equal(result, valid_df)
+
+
+def test_column_projection(tmp_path, valid_df):
+    """Only the requested columns are read."""
+    path = tmp_path / "trip.parquet"
+    write_table(valid_df, path)
+
+    result = read_ledger(path, columns=["payer", "item_price"])
+
+    assert list(result.columns) == ["payer", "item_price"]
+    assert result["item_price"].tolist() == [18.0, 33.0, 230.0]
+
+
+def test_result_round_trip(tmp_path):
+    """Result tables, such as transfers, can be stored too."""
+    transfers = amount_to_transfer(
+        pd.DataFrame({"name": ["Leo", "Ana"], "should_pay": [50, 50]}),
+        pd.DataFrame({"name": ["Leo", "Ana"], "actually_paid": [100, 0]}),
+        money="cents",
+    )
+    path = tmp_path / "transfers.feather"
+    write_table(transfers, path)
+
+    pd.testing.assert_frame_equal(read_table(path), transfers)
+
+
+def test_read_ledger_missing_column(tmp_path, valid_df):
+    """A file without the required bill columns is rejected."""
+    path = tmp_path / "partial.arrow"
+    write_table(valid_df[["payer", "item_price"]], path)
+
+    with pytest.raises(ValueError):
+        read_ledger(path)
+
+
+def test_unknown_format(tmp_path, valid_df):
+    """A format that cannot be inferred or is not supported raises ValueError."""
+    with pytest.raises(ValueError):
+        write_table(valid_df, tmp_path / "trip.xlsx")
+    with pytest.raises(ValueError):
+        write_table(valid_df, tmp_path / "trip.parquet", format="orc")
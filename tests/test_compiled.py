@@ -0,0 +1,104 @@
+"""Tests for compiled, memory-mapped ledgers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from billsplittermds.compiled import CompiledLedger, compile_ledger, open_ledger
+from billsplittermds.individual_total_payments import individual_total_payments
+from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.settle import settle
+from billsplittermds.split_by_item import split_by_item
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """A bill with even, weighted and fixed shares and a non-ASCII name."""
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Leo,candy,10,Leo,0.12,0.15\n"
+        "Leo,taxi,25,Leo:2;Ana,0.07,0.0\n"
+        "Ana,lunch,20,Ana;Mia,0.12,0.15\n"
+        "Mia,museum,45,Leo=12.50;Ana;Mia;Joe,0.05,0.0\n"
+        "Joe,dinner,80.33,Joe;Leo;Zoë,0.10,0.20\n"
+    )
+    path = tmp_path / "trip.csv"
+    path.write_text(csv_content, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize('money', ['float', 'cents'])
+def test_matches_settle(csv_path, tmp_path, money):
+    """A compiled ledger settles exactly like the bill it was compiled from."""
+    valid_df = load_validate_data(csv_path, money=money)
+    compile_ledger(valid_df, tmp_path / "trip.ledger", money=money)
+
+    ledger = open_ledger(tmp_path / "trip.ledger")
+
+    expected = settle(valid_df, money=money).to_dict('records')
+    assert ledger.transfers().to_dict('records') == expected
+    assert settle(ledger, money=money).to_dict('records') == expected
+
+
+@pytest.mark.parametrize('money', ['float', 'cents'])
+def test_totals_match_stages(csv_path, tmp_path, money):
+    """The totals match split_by_item and individual_total_payments over the same people."""
+    valid_df = load_validate_data(csv_path, money=money)
+    ledger = compile_ledger(valid_df, tmp_path / "trip.ledger", money=money)
+
+    pd.testing.assert_frame_equal(ledger.should_pay_df(),
+                                  split_by_item(valid_df, money=money, people=ledger.people))
+    pd.testing.assert_frame_equal(ledger.actually_paid_df(),
+                                  individual_total_payments(valid_df, money=money,
+                                                            people=ledger.people))
+
+
+@pytest.mark.parametrize('money', ['float', 'cents'])
+def test_stages_accept_ledger(csv_path, tmp_path, money):
+    """split_by_item and individual_total_payments run straight over a compiled ledger."""
+    valid_df = load_validate_data(csv_path, money=money)
+    ledger = compile_ledger(valid_df, tmp_path / "trip.ledger", money=money)
+
+    pd.testing.assert_frame_equal(split_by_item(ledger, money=money), ledger.should_pay_df())
+    pd.testing.assert_frame_equal(individual_total_payments(ledger, money=money),
+                                  ledger.actually_paid_df())
+
+
+def test_arrays_are_memory_mapped(csv_path, tmp_path):
+    """Columns are mapped from disk, with 'shared_by' stored as CSR arrays."""
+    ledger = compile_ledger(load_validate_data(csv_path), tmp_path / "trip.ledger")
+
+    assert isinstance(ledger['item_price'], np.memmap)
+    assert ledger['share_offsets'].tolist() == [0, 1, 3, 5, 9, 12]
+    names = ledger.people.names
+    assert names[ledger['share_person'][9:12]].tolist() == ['Joe', 'Leo', 'Zoë']
+    assert names[ledger['payer']].tolist() == ['Leo', 'Leo', 'Ana', 'Mia', 'Joe']
+
+
+def test_to_frame(csv_path, tmp_path):
+    """The rebuilt bill settles like the original one."""
+    valid_df = load_validate_data(csv_path)
+    ledger = compile_ledger(valid_df, tmp_path / "trip.ledger")
+
+    rebuilt = ledger.to_frame()
+
+    assert rebuilt['item_name'].tolist() == valid_df['item_name'].tolist()
+    assert settle(rebuilt).to_dict('records') == settle(valid_df).to_dict('records')
+
+
+def test_invalid_ledgers(csv_path, tmp_path):
+    """Directories without a ledger and money mismatches raise ValueError."""
+    with pytest.raises(ValueError, match="not a compiled ledger"):
+        open_ledger(tmp_path)
+
+    ledger = compile_ledger(load_validate_data(csv_path, money="cents"), tmp_path / "trip.ledger",
+                            money="cents")
+    assert isinstance(ledger, CompiledLedger)
+    with pytest.raises(ValueError, match="compiled with money='cents'"):
+        settle(ledger)
+    with pytest.raises(ValueError, match="compiled with money='cents'"):
+        split_by_item(ledger)
+    with pytest.raises(ValueError, match="n_jobs"):
+        settle(ledger, money="cents", n_jobs=2)
+    with pytest.raises(ValueError, match="whole cents"):
+        compile_ledger(load_validate_data(csv_path), tmp_path / "dollars.ledger", money="cents")
@@ -0,0 +1,130 @@
+"""Tests for the currency conversion stage."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from billsplittermds.currency import FxRates, check_single_currency, convert_currency
+from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.settle import settle
+
+
+@pytest.fixture
+def rates():
+    """EUR and JPY rates into USD on a few days."""
+    return FxRates(pd.DataFrame({
+        'date': ['2024-07-01', '2024-07-05', '2024-07-01', '2024-07-08'],
+        'currency': ['EUR', 'EUR', 'JPY', 'JPY'],
+        'rate': [1.07, 1.08, 0.0062, 0.0063],
+    }), base='USD')
+
+
+@pytest.fixture
+def bill():
+    """A bill paid in three currencies over a few days."""
+    return pd.DataFrame({
+        'payer': ['Leo', 'Ana', 'Mia', 'Leo'],
+        'item_name': ['taxi', 'lunch', 'sushi', 'museum'],
+        'item_price': [25.0, 20.0, 5000.0, 10.0],
+        'shared_by': ['Leo;Ana', 'Ana;Mia', 'Leo;Ana;Mia', 'Leo'],
+        'tax_pct': [0.07, 0.12, 0.10, 0.05],
+        'tip_pct': [0.0, 0.15, 0.0, 0.0],
+        'currency': ['EUR', 'USD', 'JPY', 'EUR'],
+        'date': ['2024-07-02', '2024-07-02', '2024-07-09', '2024-07-06'],
+    })
+
+
+def test_as_of_lookup(rates):
+    """Every date uses the latest rate on or before it; the base currency is 1."""
+    result = rates.lookup(['EUR', 'EUR', 'EUR', 'JPY', 'USD'],
+                          ['2024-07-01', '2024-07-04', '2024-07-30', '2024-07-07', '1990-01-01'])
+
+    np.testing.assert_allclose(result, [1.07, 1.07, 1.08, 0.0062, 1.0])
+
+
+def test_latest_rate_without_dates(rates):
+    """Without dates, the latest rate of every currency is used."""
+    np.testing.assert_allclose(rates.lookup(['EUR', 'JPY']), [1.08, 0.0063])
+
+
+def test_rates_are_memoized(rates):
+    """A (currency, date) pair is searched only the first time it is seen."""
+    rates.lookup(['EUR', 'EUR'], ['2024-07-02', '2024-07-02'])
+    assert len(rates._memo) == 1
+
+    rates._tables.clear()  # any new search would now fail
+    np.testing.assert_allclose(rates.lookup(['EUR'], ['2024-07-02']), [1.07])
+
+
+def test_missing_rates(rates):
+    """Unknown currencies and dates before the first rate raise ValueError."""
+    with pytest.raises(ValueError, match="GBP"):
+        rates.lookup(['GBP'], ['2024-07-02'])
+    with pytest.raises(ValueError, match="before"):
+        rates.lookup(['EUR'], ['2024-06-30'])
+
+
+def test_invalid_rate_table():
+    """Rate tables need every column and positive rates."""
+    with pytest.raises(ValueError):
+        FxRates(pd.DataFrame({'date': ['2024-07-01'], 'currency': ['EUR']}))
+    with pytest.raises(ValueError):
+        FxRates(pd.DataFrame({'date': ['2024-07-01'], 'currency': ['EUR'], 'rate': [0.0]}))
+
+
+def test_convert_currency(rates, bill):
+    """Prices are converted row by row and the input is left untouched."""
+    before = bill.copy()
+    result = convert_currency(bill, rates)
+
+    np.testing.assert_allclose(result['item_price'], [25 * 1.07, 20.0, 5000 * 0.0063, 10 * 1.08])
+    assert (result['currency'] == 'USD').all()
+    pd.testing.assert_frame_equal(bill, before)
+
+
+def test_convert_cents(rates, bill):
+    """In cents mode converted prices are rounded to whole cents."""
+    bill['item_price'] = [2501, 2000, 500000, 1000]
+    result = convert_currency(bill.drop(columns='date'), rates, date='2024-07-02', money='cents')
+
+    assert result['item_price'].dtype == np.int64
+    assert result['item_price'].tolist() == [2676, 2000, 3100, 1070]
+
+
+def test_no_currency_column(rates, bill):
+    """A bill without a 'currency' column is returned as it is."""
+    plain = bill.drop(columns=['currency', 'date'])
+    assert convert_currency(plain, rates) is plain
+
+
+def test_load_validate_data(rates, bill, tmp_path):
+    """Loading with rates converts before any stage runs; mixed bills need rates."""
+    path = tmp_path / "trip.csv"
+    bill.to_csv(path, index=False)
+
+    with pytest.raises(ValueError, match="mixes currencies"):
+        load_validate_data(path)
+
+    converted = load_validate_data(path, rates=rates)
+    expected = settle(convert_currency(bill, rates))
+    assert settle(converted).to_dict('records') == expected.to_dict('records')
+
+
+def test_mixed_currencies_across_chunks(tmp_path):
+    """Chunks in different currencies are rejected, even if each has only one."""
+    path = tmp_path / "mix.csv"
+    path.write_text("payer,item_name,item_price,shared_by,tax_pct,tip_pct,currency\n"
+                    "Leo,taxi,10,Leo;Ana,0.07,0.0,USD\n"
+                    "Ana,sushi,1000,Leo;Ana,0.10,0.0,JPY\n")
+
+    with pytest.raises(ValueError, match="mixes currencies"):
+        list(load_validate_data(path, chunksize=1))
+
+
+def test_missing_currency_counts_as_a_currency(bill):
+    """Rows without a currency do not pass as the currency of the other rows."""
+    bill['currency'] = ['EUR', None, 'EUR', None]
+
+    with pytest.raises(ValueError, match="EUR, missing"):
+        check_single_currency(bill)
+    check_single_currency(bill.assign(currency=None))
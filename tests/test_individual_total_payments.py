@@ -111,3 +111,22 @@ class TestIndividualTotalPayments:
         total_paid = result['actually_paid'].sum()
 
         assert abs(total_paid - total_cost) < 0.01
+
+    def test_cents_mode(self, tax_tip_df):
+        """In cents mode, totals are int64 cents of each rounded item cost."""
+        tax_tip_df['item_price'] = [10001, 5001]
+        result = individual_total_payments(tax_tip_df, money='cents')
+
+        # 10001 * 1.30 = 13001.3 -> 13001 and 5001 * 1.20 = 6001.2 -> 6001
+        assert result['actually_paid'].dtype == 'int64'
+        assert result[result['name'] == 'Leo']['actually_paid'].values[0] == 13001
+        assert result[result['name'] == 'Ana']['actually_paid'].values[0] == 6001
+
+    def test_does_not_modify_input(self, multiple_items_df):
+        """The input dataframe is left untouched, with no 'item_payment' column added."""
+        before = multiple_items_df.copy()
+
+        individual_total_payments(multiple_items_df)
+        individual_total_payments(multiple_items_df.astype({'payer': 'category'}))
+
+        pd.testing.assert_frame_equal(multiple_items_df, before)
@@ -0,0 +1,155 @@
+"""Tests for the instrumentation of stages."""
+
+import io
+import json
+import logging
+import tracemalloc
+
+import pytest
+
+from billsplittermds.instrumentation import (
+    JsonLinesSink,
+    LoggingSink,
+    PrometheusSink,
+    StageRecord,
+    _instrumented,
+    _stage,
+    instrument,
+)
+from billsplittermds.settle import settle
+
+
+@_instrumented("make_list")
+def make_list(n):
+    """Allocate a list of `n` items inside an inner phase."""
+    with _stage("make_list.fill", rows=n):
+        return [object() for _ in range(n)]
+
+
+class Sized:
+    """An input with a shape, like a dataframe."""
+
+    shape = (7, 2)
+
+
+@_instrumented("count")
+def count(data):
+    """Return the number of rows of `data`."""
+    return data.shape[0]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """A small valid bill."""
+    path = tmp_path / "trip.csv"
+    path.write_text("payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+                    "Leo,taxi,25,Leo;Ana,0.07,0.0\n"
+                    "Ana,lunch,20,Ana;Mia,0.12,0.15\n")
+    return path
+
+
+def test_nothing_recorded_by_default():
+    """Outside instrument(), stages cost nothing and record nothing."""
+    sink = []
+    make_list(3)
+    with instrument(sink.append):
+        pass
+    make_list(3)
+
+    assert sink == []
+
+
+def test_records_inner_phases_first():
+    """Phases finish, and are recorded, before the function that ran them."""
+    with instrument() as records:
+        make_list(3)
+        count(Sized())
+
+    assert [record.stage for record in records] == ["make_list.fill", "make_list", "count"]
+    assert records[0].rows == 3
+    assert records[2].rows == 7
+    assert all(record.seconds >= 0 and record.peak_bytes is None for record in records)
+
+
+def test_failed_stage_not_recorded():
+    """A stage that raises is not recorded and the block still closes cleanly."""
+    with instrument() as records:
+        with pytest.raises(ZeroDivisionError):
+            with _stage("broken"):
+                1 / 0
+
+    assert records == []
+
+
+def test_memory_peaks():
+    """With memory=True, every stage reports its own peak, and a parent covers its phases."""
+    with instrument(memory=True) as records:
+        make_list(10_000)
+
+    fill, outer = records
+    assert fill.peak_bytes > 10_000 * 16
+    assert outer.peak_bytes >= fill.peak_bytes
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_blocks_overlap():
+    """Tracing lasts until the last block measuring memory ends, whichever ends first."""
+    first = instrument(memory=True)
+    first_records = first.__enter__()
+    with instrument(memory=True) as records:
+        first.__exit__(None, None, None)
+        assert tracemalloc.is_tracing()
+        make_list(10_000)
+
+    assert records[0].peak_bytes > 10_000 * 16
+    assert first_records == []
+    assert not tracemalloc.is_tracing()
+
+
+def test_logging_sink(caplog):
+    """Every record is logged on the 'billsplittermds' logger."""
+    with caplog.at_level(logging.INFO, logger="billsplittermds"):
+        with instrument(LoggingSink()):
+            count(Sized())
+
+    assert "stage=count" in caplog.text
+    assert "rows=7" in caplog.text
+
+
+def test_json_lines_sink(tmp_path):
+    """Records are appended to a path, or written to an open file, one per line."""
+    path = tmp_path / "stages.jsonl"
+    buffer = io.StringIO()
+    with instrument(JsonLinesSink(path), JsonLinesSink(buffer)):
+        make_list(2)
+
+    for text in [path.read_text(), buffer.getvalue()]:
+        lines = [json.loads(line) for line in text.splitlines()]
+        assert [line["stage"] for line in lines] == ["make_list.fill", "make_list"]
+        assert set(lines[0]) == set(StageRecord._fields)
+
+
+def test_prometheus_sink():
+    """Calls, seconds and rows are summed per stage."""
+    sink = PrometheusSink()
+    with instrument(sink):
+        count(Sized())
+        count(Sized())
+
+    text = sink.render()
+    assert "# TYPE billsplittermds_stage_calls_total counter" in text
+    assert 'billsplittermds_stage_calls_total{stage="count"} 2' in text
+    assert 'billsplittermds_stage_rows_total{stage="count"} 14' in text
+    assert "peak_bytes" not in text
+
+
+def test_settle_stages(csv_path):
+    """settle() reports loading, totals and the settlement loop."""
+    with instrument() as records:
+        settle(csv_path)
+
+    assert [record.stage for record in records] == [
+        "load_validate_data.parse", "load_validate_data.validate", "load_validate_data",
+        "settle.totals", "settlement_loop", "settle",
+    ]
+    assert records[2].rows == 2
@@ -0,0 +1,121 @@
+"""Tests for the Ledger class."""
+
+import pandas as pd
+import pytest
+
+from billsplittermds.ledger import Ledger
+from billsplittermds.load_validate_data import ValidationError, load_validate_data
+from billsplittermds.settle import settle
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    """A bill where several people owe money to several others."""
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Leo,candy,10,Leo,0.12,0.15\n"
+        "Leo,taxi,25,Leo;Ana,0.07,0.0\n"
+        "Ana,lunch,20,Ana;Mia,0.12,0.15\n"
+        "Mia,museum,45,Leo;Ana;Mia;Joe,0.05,0.0\n"
+        "Joe,dinner,80.33,Joe;Leo;Zoe,0.10,0.20\n"
+    )
+    path = tmp_path / "trip.csv"
+    path.write_text(csv_content)
+    return path
+
+
+@pytest.mark.parametrize('money', ['float', 'cents'])
+def test_matches_settle(csv_path, money):
+    """A ledger built row by row settles like the whole bill."""
+    valid_df = load_validate_data(csv_path, money=money)
+
+    ledger = Ledger.from_frame(valid_df, money=money)
+
+    assert len(ledger) == len(valid_df)
+    assert ledger.transfers().to_dict('records') == settle(valid_df, money=money).to_dict('records')
+
+
+@pytest.mark.parametrize('money', ['float', 'cents'])
+def test_remove_and_edit_match_rebuilt_bill(csv_path, money):
+    """Removing and editing expenses gives the same result as rebuilding the bill."""
+    valid_df = load_validate_data(csv_path, money=money)
+    ledger = Ledger.from_frame(valid_df, money=money)
+
+    ledger.remove_expense(1)
+    new_price = 3000 if money == 'cents' else 30.0
+    ledger.edit_expense(3, item_price=new_price, shared_by=['Leo', 'Mia'])
+
+    expected_df = valid_df.drop(index=1)
+    expected_df.loc[3, ['item_price', 'shared_by']] = [new_price, 'Leo;Mia']
+    expected = settle(expected_df, money=money)
+
+    assert 1 not in ledger
+    assert ledger.transfers().to_dict('records') == expected.to_dict('records')
+
+
+def test_totals_and_forgotten_people():
+    """Per-person totals follow the expenses, and unused names are dropped."""
+    ledger = Ledger()
+    taxi = ledger.add_expense("Leo", "taxi", 20.0, "Leo;Ana", 0.05, 0.0)
+    ledger.add_expense("Ana", "lunch", 10.0, "Ana", 0.05, 0.0)
+
+    assert ledger.should_pay_df().to_dict('records') == [
+        {'name': 'Ana', 'should_pay': pytest.approx(21.0)},
+        {'name': 'Leo', 'should_pay': pytest.approx(10.5)},
+    ]
+
+    ledger.remove_expense(taxi)
+
+    assert ledger.actually_paid_df()['name'].tolist() == ['Ana']
+    assert ledger.transfers().empty
+
+
+def test_cents_split_is_exact():
+    """In cents mode the shares of an expense add up to its cost."""
+    ledger = Ledger(money='cents')
+    ledger.add_expense("Leo", "cake", 1000, "Leo;Ana;Mia", 0.05, 0.0)
+
+    should_pay = ledger.should_pay_df()
+
+    assert should_pay['should_pay'].dtype == 'int64'
+    assert should_pay['should_pay'].sum() == 1050
+    assert sorted(should_pay['should_pay']) == [350, 350, 350]
+
+
+def test_invalid_expenses():
+    """Bad values and ids raise, and a failed edit leaves the expense unchanged."""
+    ledger = Ledger()
+    ledger.add_expense("Leo", "taxi", 20.0, "Leo;Ana", 0.05, 0.0, expense_id="taxi")
+    before = ledger.transfers()
+
+    with pytest.raises(ValidationError, match="tax_pct"):
+        ledger.add_expense("Leo", "bus", 5.0, "Leo", 0.5, 0.0)
+    with pytest.raises(ValueError, match="already exists"):
+        ledger.add_expense("Leo", "taxi", 20.0, "Leo", 0.05, 0.0, expense_id="taxi")
+    with pytest.raises(ValidationError, match="tip_pct"):
+        ledger.edit_expense("taxi", tip_pct=0.9)
+    with pytest.raises(TypeError, match="price"):
+        ledger.edit_expense("taxi", price=10.0)
+    with pytest.raises(KeyError):
+        ledger.remove_expense("bus")
+    with pytest.raises(ValueError, match="whole cents"):
+        Ledger(money="cents").add_expense("Leo", "bus", 12.99, "Leo", 0.05, 0.0)
+
+    pd.testing.assert_frame_equal(ledger.transfers(), before)
+
+
+@pytest.mark.parametrize('money', ['float', 'cents'])
+def test_weighted_shares_match_settle(money):
+    """Weighted and fixed shares are split like split_by_item splits them."""
+    valid_df = pd.DataFrame({
+        'payer': ['Leo', 'Ana'],
+        'item_name': ['dinner', 'taxi'],
+        'item_price': [3001, 2000] if money == 'cents' else [30.01, 20.0],
+        'shared_by': ['Leo:2;Ana;Mia=5', 'Ana;Mia:3'],
+        'tax_pct': [0.10, 0.05],
+        'tip_pct': [0.15, 0.0],
+    })
+
+    ledger = Ledger.from_frame(valid_df, money=money)
+
+    assert ledger.transfers().to_dict('records') == settle(valid_df, money=money).to_dict('records')
@@ -1,7 +1,7 @@
 import pandas as pd
 import pytest
 
-from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.load_validate_data import ValidationError, load_validate_data
 
 
 def test_load_validate_data_basic(tmp_path):
@@ -82,9 +82,188 @@ def test_load_validate_data_negative_price(tmp_path):
     with pytest.raises(ValueError):
         load_validate_data(csv_path)
 
+def test_load_validate_data_missing_shared_by(tmp_path):
+    """
+    If an item is not shared by anyone, raise ValueError naming its row.
+    """
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Amy,Pasta,18,Amy,0.05,0.12\n"
+        "Sam,Taxi,20,,0.05,0.0\n"
+    )
+    csv_path = tmp_path / "trip_missing_shared_by.csv"
+    csv_path.write_text(csv_content)
+
+    with pytest.raises(ValidationError) as excinfo:
+        load_validate_data(csv_path)
+    assert excinfo.value.report.violations[["row", "column"]].values.tolist() == [[1, "shared_by"]]
+
+
 def test_load_validate_data_nonexistent_path():
     """
     Loading a non-existent file path should raise an exception.
     """
     with pytest.raises(Exception):
         load_validate_data("this/does/not/exist.csv")
+
+
+def test_load_validate_data_cents(tmp_path):
+    """
+    With money='cents', item_price is returned as int64 cents.
+    """
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Amy,Pasta,18,Amy,0.05,0.12\n"
+        "Sam,Taxi,33.1,Amy;Sam,0.05,0.0\n"
+    )
+    csv_path = tmp_path / "trip_cents.csv"
+    csv_path.write_text(csv_content)
+
+    df = load_validate_data(csv_path, money="cents")
+
+    assert df["item_price"].dtype == "int64"
+    assert df["item_price"].tolist() == [1800, 3310]
+
+
+def test_load_validate_data_invalid_money(tmp_path):
+    """
+    An unknown money mode should raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        load_validate_data(tmp_path / "unused.csv", money="euros")
+
+
+def test_load_validate_data_reports_all_violations(tmp_path):
+    """
+    Every offending row and column should be reported in a single error.
+    """
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Amy,Pasta,18,Amy,0.05,0.12\n"
+        "Sam,Taxi,-3,Amy;Sam,0.02,0.10\n"
+        "Ben,Room,230,Amy;Ben,0.12,0.90\n"
+        "Amy,Museum,12,Amy,0.30,abc\n"
+    )
+    csv_path = tmp_path / "trip_many_errors.csv"
+    csv_path.write_text(csv_content)
+
+    with pytest.raises(ValidationError) as exc_info:
+        load_validate_data(csv_path)
+
+    violations = exc_info.value.report.violations
+    assert set(zip(violations["row"], violations["column"])) == {
+        (3, "tip_pct"),   # not numeric
+        (1, "item_price"),
+        (1, "tax_pct"),
+        (3, "tax_pct"),
+        (2, "tip_pct"),
+    }
+    assert isinstance(exc_info.value, ValueError)
+    assert "tax_pct values must be between 0.05 and 0.15." in str(exc_info.value)
+
+
+def test_load_validate_data_chunks(tmp_path):
+    """
+    With chunksize, an iterator of validated chunks is returned
+    that together hold every row of the file.
+    """
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Amy,Pasta,18,Amy,0.05,0.12\n"
+        "Sam,Taxi,33,Amy;Sam,0.05,0.0\n"
+        "Ben,Room,230,Amy;Ben,0.12,0.04\n"
+    )
+    csv_path = tmp_path / "trip_chunks.csv"
+    csv_path.write_text(csv_content)
+
+    chunks = list(load_validate_data(csv_path, chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[1].index.tolist() == [2]
+    # each chunk has its own 'payer' categories
+    pd.testing.assert_frame_equal(pd.concat(chunks).astype({"payer": str}),
+                                  load_validate_data(csv_path).astype({"payer": str}))
+
+
+def test_load_validate_data_chunk_violation_rows(tmp_path):
+    """
+    A chunk with invalid values reports the row numbers from the whole file.
+    """
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Amy,Pasta,18,Amy,0.05,0.12\n"
+        "Sam,Taxi,33,Amy;Sam,0.05,0.0\n"
+        "Ben,Room,-230,Amy;Ben,0.12,0.04\n"
+    )
+    csv_path = tmp_path / "trip_chunks_bad.csv"
+    csv_path.write_text(csv_content)
+
+    chunks = load_validate_data(csv_path, chunksize=2)
+    next(chunks)
+    with pytest.raises(ValidationError) as exc_info:
+        next(chunks)
+    assert exc_info.value.report.violations["row"].tolist() == [2]
+
+
+def test_load_validate_data_invalid_chunksize(tmp_path):
+    """
+    A chunksize that is not a positive integer should raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        load_validate_data(tmp_path / "unused.csv", chunksize=0)
+
+
+@pytest.mark.parametrize("engine", ["auto", "c", "python", "pyarrow"])
+def test_load_validate_data_schema(tmp_path, engine):
+    """
+    Every parser engine returns the declared dtypes.
+    """
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Amy,Pasta,18,Amy,0.05,0.12\n"
+        "Sam,Taxi,33,Amy;Sam,0.05,0\n"
+    )
+    csv_path = tmp_path / "trip_schema.csv"
+    csv_path.write_text(csv_content)
+
+    df = load_validate_data(csv_path, engine=engine)
+
+    assert isinstance(df["payer"].dtype, pd.CategoricalDtype)
+    assert df["item_price"].dtype == "float64"
+    assert df["tax_pct"].dtype == "float64"
+    assert df["tip_pct"].dtype == "float64"
+    assert df["item_price"].tolist() == [18.0, 33.0]
+
+
+def test_load_validate_data_chunk_non_numeric(tmp_path):
+    """
+    A non-numeric value in a later chunk is still reported with its row number,
+    after the earlier chunks have been returned.
+    """
+    csv_content = (
+        "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+        "Amy,Pasta,18,Amy,0.05,0.12\n"
+        "Sam,Taxi,33,Amy;Sam,0.05,0.0\n"
+        "Ben,Room,lots,Amy;Ben,0.12,0.04\n"
+    )
+    csv_path = tmp_path / "trip_chunks_text.csv"
+    csv_path.write_text(csv_content)
+
+    chunks = load_validate_data(csv_path, chunksize=2)
+    assert len(next(chunks)) == 2
+    with pytest.raises(ValidationError) as exc_info:
+        next(chunks)
+    violations = exc_info.value.report.violations
+    assert violations[["row", "column"]].values.tolist() == [[2, "item_price"]]
+
+
+def test_load_validate_data_invalid_engine(tmp_path):
+    """
+    An unknown parser engine, or pyarrow with chunks, should raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        load_validate_data(tmp_path / "unused.csv", engine="fast")
+    with pytest.raises(ValueError):
+        load_validate_data(tmp_path / "unused.csv", engine="pyarrow", chunksize=10)
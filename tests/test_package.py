@@ -0,0 +1,56 @@
+"""Tests for the lazily loaded package namespace."""
+
+import subprocess
+import sys
+
+import pytest
+
+import billsplittermds
+
+
+def run_python(code):
+    """Run `code` in a fresh interpreter and return its stdout."""
+    result = subprocess.run([sys.executable, "-c", code],
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_import_does_not_load_pandas():
+    """Importing the package alone does not import pandas or any submodule."""
+    out = run_python("import sys, billsplittermds;"
+                     "print(sorted(m for m in sys.modules"
+                     " if m == 'pandas' or m.startswith('billsplittermds.')))")
+    assert out == "[]"
+
+
+def test_name_loads_only_its_submodule():
+    """Using one public name imports the submodule that defines it."""
+    out = run_python("import sys, billsplittermds;"
+                     "billsplittermds.PersonIndex;"
+                     "print('billsplittermds.person_index' in sys.modules,"
+                     " 'billsplittermds.cache' in sys.modules)")
+    assert out == "True False"
+
+
+def test_public_names():
+    """Every name in __all__ resolves and appears in dir()."""
+    assert sorted(billsplittermds.__all__) == sorted(billsplittermds._EXPORTS)
+    for name in billsplittermds.__all__:
+        assert getattr(billsplittermds, name) is not None
+        assert name in dir(billsplittermds)
+
+
+def test_functions_not_shadowed_by_submodules():
+    """Importing a submodule keeps the same-named function as the attribute."""
+    import billsplittermds.settle  # noqa: F401
+    import billsplittermds.split_by_item  # noqa: F401
+
+    assert callable(billsplittermds.settle)
+    assert callable(billsplittermds.split_by_item)
+    assert billsplittermds.settle.__module__ == "billsplittermds.settle"
+
+
+def test_unknown_name():
+    """An unknown attribute still raises AttributeError."""
+    with pytest.raises(AttributeError, match="not_a_function"):
+        billsplittermds.not_a_function
@@ -0,0 +1,81 @@
+"""Tests for the PersonIndex class and the stages that accept it."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from billsplittermds.amount_to_transfer import amount_to_transfer
+from billsplittermds.individual_total_payments import individual_total_payments
+from billsplittermds.person_index import PersonIndex
+from billsplittermds.split_by_item import split_by_item
+
+
+class TestPersonIndex:
+    """Test suite for the PersonIndex class."""
+
+    @pytest.fixture
+    def valid_df(self):
+        """A bill where Joe only pays and Mia only consumes."""
+        return pd.DataFrame({
+            'payer': pd.Categorical(['Leo', 'Leo', 'Ana', 'Joe']),
+            'item_name': ['candy', 'taxi', 'lunch', 'museum'],
+            'item_price': [10.0, 25.0, 20.0, 45.0],
+            'shared_by': ['Leo', 'Leo;Ana', 'Ana;Mia', 'Leo;Ana;Mia'],
+            'tax_pct': [0.12, 0.07, 0.12, 0.05],
+            'tip_pct': [0.15, 0.0, 0.15, 0.0]
+        })
+
+    def test_from_ledger(self, valid_df):
+        """Every payer and consumer is indexed once, sorted by name."""
+        people = PersonIndex.from_ledger(valid_df)
+
+        assert people.names.tolist() == ['Ana', 'Joe', 'Leo', 'Mia']
+        assert len(people) == 4
+
+    def test_encode(self, valid_df):
+        """Names get dense int32 codes, unknown or missing names get -1."""
+        people = PersonIndex.from_ledger(valid_df)
+
+        codes = people.encode(['Mia', 'Ana', 'Bob', None, 'Mia'])
+
+        assert codes.dtype == np.int32
+        assert codes.tolist() == [3, 0, -1, -1, 3]
+
+    @pytest.mark.parametrize('money', ['float', 'cents'])
+    def test_stages_with_shared_index(self, valid_df, money):
+        """Results over a PersonIndex match the results without one."""
+        if money == 'cents':
+            valid_df['item_price'] = (valid_df['item_price'] * 100).astype('int64')
+        people = PersonIndex.from_ledger(valid_df)
+
+        should_pay = split_by_item(valid_df.copy(), money=money, people=people)
+        actually_paid = individual_total_payments(valid_df.copy(), money=money, people=people)
+
+        assert should_pay['name'].tolist() == ['Ana', 'Joe', 'Leo', 'Mia']
+        assert actually_paid['name'].tolist() == ['Ana', 'Joe', 'Leo', 'Mia']
+        assert should_pay.set_index('name')['should_pay'].loc['Joe'] == 0
+
+        expected_should = split_by_item(valid_df.copy(), money=money).set_index('name')['should_pay']
+        expected_paid = individual_total_payments(valid_df.copy(), money=money).set_index('name')['actually_paid']
+        result_should = should_pay.set_index('name')['should_pay']
+        result_paid = actually_paid.set_index('name')['actually_paid']
+        for name in expected_should.index:
+            assert result_should.loc[name] == pytest.approx(expected_should.loc[name])
+        for name in expected_paid.index:
+            assert result_paid.loc[name] == pytest.approx(expected_paid.loc[name])
+
+        # amount_to_transfer lines the two results up by code
+        transfers = amount_to_transfer(should_pay, actually_paid, money=money)
+        expected = amount_to_transfer(split_by_item(valid_df.copy(), money=money),
+                                      individual_total_payments(valid_df.copy(), money=money),
+                                      money=money)
+        assert transfers.to_dict('records') == expected.to_dict('records')
+
+    def test_unknown_names_raise(self, valid_df):
+        """Names that are not in the index are rejected."""
+        people = PersonIndex(['Ana', 'Leo'])
+
+        with pytest.raises(ValueError):
+            split_by_item(valid_df, people=people)
+        with pytest.raises(ValueError):
+            individual_total_payments(valid_df, people=people)
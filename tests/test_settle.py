@@ -0,0 +1,174 @@
+"""Tests for the settle function."""
+
+import pandas as pd
+import pytest
+
+from billsplittermds.amount_to_transfer import amount_to_transfer
+from billsplittermds.individual_total_payments import individual_total_payments
+from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.settle import settle, settle_groups
+from billsplittermds.split_by_item import split_by_item
+
+
+class TestSettle:
+    """Test suite for the settle function."""
+
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        """A bill where several people owe money to several others."""
+        csv_content = (
+            "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+            "Leo,candy,10,Leo,0.12,0.15\n"
+            "Leo,taxi,25,Leo;Ana,0.07,0.0\n"
+            "Ana,lunch,20,Ana;Mia,0.12,0.15\n"
+            "Mia,museum,45,Leo;Ana;Mia;Joe,0.05,0.0\n"
+            "Joe,dinner,80.33,Joe;Leo;Zoe,0.10,0.20\n"
+        )
+        path = tmp_path / "trip.csv"
+        path.write_text(csv_content)
+        return path
+
+    @pytest.mark.parametrize('money', ['float', 'cents'])
+    def test_matches_four_call_chain(self, csv_path, money):
+        """settle() gives the same transfers as calling the four functions."""
+        valid_df = load_validate_data(csv_path, money=money)
+        expected = amount_to_transfer(split_by_item(valid_df.copy(), money=money),
+                                      individual_total_payments(valid_df.copy(), money=money),
+                                      money=money)
+
+        result = settle(csv_path, money=money)
+
+        assert len(result) > 0
+        assert result.to_dict('records') == expected.to_dict('records')
+
+    def test_does_not_modify_input(self, csv_path):
+        """A dataframe passed in is left untouched."""
+        valid_df = load_validate_data(csv_path)
+        before = valid_df.copy()
+
+        settle(valid_df)
+
+        pd.testing.assert_frame_equal(valid_df, before)
+
+    def test_nothing_to_settle(self):
+        """A bill where everyone paid for their own items needs no transfers."""
+        valid_df = pd.DataFrame({
+            'payer': ['Leo', 'Ana'],
+            'item_name': ['candy', 'lunch'],
+            'item_price': [10.0, 20.0],
+            'shared_by': ['Leo', 'Ana'],
+            'tax_pct': [0.05, 0.05],
+            'tip_pct': [0.0, 0.0]
+        })
+
+        result = settle(valid_df)
+
+        assert len(result) == 0
+        assert list(result.columns) == ['sender', 'receiver', 'amount']
+
+    def test_invalid_money(self, csv_path):
+        """An unknown money mode should raise ValueError."""
+        with pytest.raises(ValueError):
+            settle(csv_path, money='euros')
+
+
+class TestSettleGroups:
+    """Test suite for the settle_groups function."""
+
+    @pytest.fixture
+    def groups_df(self):
+        """Three groups; Leo is in two of them and 'quiet' needs no transfers."""
+        return pd.DataFrame({
+            'group_id': ['rome', 'paris', 'paris', 'rome', 'quiet', 'paris'],
+            'payer': ['Joe', 'Leo', 'Ana', 'Leo', 'Sam', 'Mia'],
+            'item_name': ['pizza', 'taxi', 'lunch', 'museum', 'coffee', 'dinner'],
+            'item_price': [63.0, 25.0, 20.0, 18.5, 4.0, 61.1],
+            'shared_by': ['Joe;Leo;Amy', 'Leo;Ana', 'Ana;Mia', 'Leo;Amy', 'Sam', 'Leo;Ana;Mia'],
+            'tax_pct': [0.10, 0.07, 0.12, 0.05, 0.05, 0.12],
+            'tip_pct': [0.15, 0.0, 0.15, 0.0, 0.0, 0.18]
+        })
+
+    @pytest.mark.parametrize('money', ['float', 'cents'])
+    def test_matches_settling_each_group(self, groups_df, money):
+        """Every group gets the same transfers as settling it on its own."""
+        if money == 'cents':
+            groups_df['item_price'] = (groups_df['item_price'] * 100).round().astype('int64')
+
+        result = settle_groups(groups_df, money=money)
+
+        assert list(result.columns) == ['group_id', 'sender', 'receiver', 'amount']
+        assert 'quiet' not in set(result['group_id'])
+        for group_id in ['paris', 'rome']:
+            expected = settle(groups_df[groups_df['group_id'] == group_id], money=money)
+            got = result[result['group_id'] == group_id].drop(columns='group_id')
+            assert len(expected) > 0
+            assert got.to_dict('records') == expected.to_dict('records')
+
+    def test_missing_group_column(self, groups_df):
+        """A bill without the group column is rejected."""
+        with pytest.raises(ValueError):
+            settle_groups(groups_df.drop(columns='group_id'))
+
+    def test_custom_group_column(self, groups_df):
+        """The group column can have any name."""
+        result = settle_groups(groups_df.rename(columns={'group_id': 'trip'}), group_col='trip')
+
+        assert list(result.columns) == ['trip', 'sender', 'receiver', 'amount']
+        assert result['trip'].tolist() == sorted(result['trip'])
+
+    def test_empty_bill(self, groups_df):
+        """A bill without rows needs no transfers."""
+        result = settle_groups(groups_df.iloc[:0])
+
+        assert len(result) == 0
+
+
+class TestSettleParallel:
+    """Test suite for settle with worker processes."""
+
+    @pytest.fixture
+    def valid_df(self):
+        """A bill big enough to cut into several blocks."""
+        names = ['Leo', 'Ana', 'Mia', 'Joe', 'Zoë']
+        rows = 40
+        return pd.DataFrame({
+            'payer': [names[i % 5] for i in range(rows)],
+            'item_name': 'item',
+            'item_price': [100 + 37 * i for i in range(rows)],
+            'shared_by': [';'.join(names[(i * 3) % 5:(i * 3) % 5 + 1 + i % 3])
+                          for i in range(rows)],
+            'tax_pct': 0.07,
+            'tip_pct': 0.15,
+        })
+
+    @pytest.mark.parametrize('n_jobs', [2, 3, 100])
+    def test_matches_serial_in_cents(self, valid_df, n_jobs):
+        """Worker processes give exactly the serial transfers in cents mode."""
+        expected = settle(valid_df, money='cents')
+
+        result = settle(valid_df, money='cents', n_jobs=n_jobs)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_matches_serial_in_float(self, valid_df):
+        """Worker processes give the serial transfers in float mode."""
+        valid_df['item_price'] = valid_df['item_price'] / 100
+        expected = settle(valid_df)
+
+        result = settle(valid_df, n_jobs=2)
+
+        assert result[['sender', 'receiver']].equals(expected[['sender', 'receiver']])
+        assert result['amount'].astype(float).tolist() == pytest.approx(
+            expected['amount'].astype(float).tolist(), abs=0.01)
+
+    @pytest.mark.parametrize('n_jobs', [0, -2, 1.5, True])
+    def test_invalid_n_jobs(self, valid_df, n_jobs):
+        """n_jobs must be a positive integer, -1 or None."""
+        with pytest.raises(ValueError, match="n_jobs"):
+            settle(valid_df, n_jobs=n_jobs)
+
+    def test_missing_shared_by(self, valid_df):
+        """Worker processes refuse an item nobody shares, like the serial path."""
+        valid_df.loc[7, 'shared_by'] = None
+        with pytest.raises(ValueError, match=r"rows 7\)"):
+            settle(valid_df, n_jobs=2)
@@ -3,6 +3,10 @@
 import pandas as pd
 import pytest
 
+from billsplittermds.amount_to_transfer import amount_to_transfer
+from billsplittermds.individual_total_payments import individual_total_payments
+from billsplittermds.person_index import PersonIndex
+from billsplittermds.settle import settle
 from billsplittermds.split_by_item import split_by_item
 
 
@@ -135,3 +139,187 @@ class TestSplitByItem:
         with pytest.raises(Exception):
             split_by_item("not a dataframe")
 
+
+    def test_names_matched_as_whole_tokens(self):
+        """
+        A name that is a prefix of another name (Ana / Anastasia)
+        should only be charged for the items it actually shares.
+        """
+        df = pd.DataFrame({
+            'payer': ['Ana', 'Anastasia'],
+            'item_name': ['coffee', 'museum'],
+            'item_price': [10.0, 30.0],
+            'shared_by': ['Ana', 'Anastasia'],
+            'tax_pct': [0.0, 0.0],
+            'tip_pct': [0.0, 0.0]
+        })
+
+        for engine in ['explode', 'loop']:
+            result = split_by_item(df.copy(), engine=engine)
+            ana_pay = result[result['name'] == 'Ana']['should_pay'].values[0]
+            anastasia_pay = result[result['name'] == 'Anastasia']['should_pay'].values[0]
+
+            assert ana_pay == 10.0
+            assert anastasia_pay == 30.0
+
+    def test_engines_agree(self, comprehensive_df, shared_item_df):
+        """The 'explode' and 'loop' engines should give the same totals."""
+        for df in [comprehensive_df, shared_item_df]:
+            explode = split_by_item(df, engine='explode').set_index('name')['should_pay']
+            loop = split_by_item(df, engine='loop').set_index('name')['should_pay']
+
+            pd.testing.assert_series_equal(explode.sort_index(), loop.sort_index())
+
+    @pytest.mark.parametrize('engine', ['explode', 'loop'])
+    def test_does_not_modify_input(self, comprehensive_df, engine):
+        """No engine adds 'num_shared_people' or 'individual_price' to the input."""
+        before = comprehensive_df.copy()
+
+        split_by_item(comprehensive_df, engine=engine)
+
+        pd.testing.assert_frame_equal(comprehensive_df, before)
+
+    def test_invalid_engine(self, simple_df):
+        """An unknown engine should raise a ValueError."""
+        with pytest.raises(ValueError):
+            split_by_item(simple_df, engine='spark')
+
+    def test_cents_largest_remainder(self):
+        """
+        In cents mode, leftover cents go to the people listed first
+        and the shares add up to the item cost exactly.
+        """
+        df = pd.DataFrame({
+            'payer': ['Leo', 'Ana'],
+            'item_name': ['taxi', 'snack'],
+            'item_price': [1000, 200],
+            'shared_by': ['Mia;Leo;Ana', 'Ana;Mia;Leo'],
+            'tax_pct': [0.0, 0.0],
+            'tip_pct': [0.0, 0.0]
+        })
+
+        result = split_by_item(df, money='cents').set_index('name')['should_pay']
+
+        # taxi: 1000 = 334 (Mia) + 333 (Leo) + 333 (Ana)
+        # snack: 200 = 67 (Ana) + 67 (Mia) + 66 (Leo)
+        assert result.dtype == 'int64'
+        assert result['Mia'] == 334 + 67
+        assert result['Leo'] == 333 + 66
+        assert result['Ana'] == 333 + 67
+        assert result.sum() == 1200
+
+    def test_cents_rounds_item_cost_once(self, comprehensive_df):
+        """The cents totals should add up to the rounded cost of every item."""
+        comprehensive_df['item_price'] = [5000, 3000]
+        result = split_by_item(comprehensive_df, money='cents')
+
+        # 5000 * 1.25 = 6250 and 3000 * 1.15 = 3450
+        assert result['should_pay'].sum() == 6250 + 3450
+
+    def test_cents_rejects_fractional_prices(self, comprehensive_df):
+        """A price in dollars is refused in cents mode instead of being cut to whole cents."""
+        comprehensive_df['item_price'] = [12.99, 3000.0]
+        with pytest.raises(ValueError, match="whole cents"):
+            split_by_item(comprehensive_df, money='cents')
+
+    def test_cents_loop_engine_not_supported(self, simple_df):
+        """The 'loop' engine only works with float money."""
+        with pytest.raises(ValueError):
+            split_by_item(simple_df, engine='loop', money='cents')
+
+    @pytest.mark.parametrize('engine', ['explode', 'loop'])
+    @pytest.mark.parametrize('missing', [None, ''])
+    def test_missing_shared_by(self, simple_df, engine, missing):
+        """An item nobody shares is refused, naming its row, instead of being dropped."""
+        simple_df['shared_by'] = ['Leo', missing]
+        with pytest.raises(ValueError, match=r"rows 1\)"):
+            split_by_item(simple_df, engine=engine)
+
+
+class TestWeightedShares:
+    """Test functions for weighted and fixed shares in 'shared_by'."""
+
+    @staticmethod
+    def bill(shared_by, item_price, tax_pct=0.0, tip_pct=0.0):
+        """Build a bill with one item per entry of `shared_by`."""
+        return pd.DataFrame({
+            'payer': 'Leo',
+            'item_name': 'item',
+            'item_price': item_price,
+            'shared_by': shared_by,
+            'tax_pct': tax_pct,
+            'tip_pct': tip_pct,
+        })
+
+    @staticmethod
+    def totals(df, **kwargs):
+        """Return split_by_item's totals as a Series indexed by name."""
+        return split_by_item(df, **kwargs).set_index('name')['should_pay']
+
+    def test_weights(self):
+        """'Leo:2;Ana' makes Leo pay twice as much as Ana."""
+        result = self.totals(self.bill(['Leo:2;Ana'], [30.0]))
+
+        assert result['Leo'] == pytest.approx(20.0)
+        assert result['Ana'] == pytest.approx(10.0)
+
+    def test_fixed_amount(self):
+        """A fixed amount comes off the price first; tax and tip apply to every share."""
+        result = self.totals(self.bill(['Leo=12.50;Ana;Mia'], [32.5], tax_pct=0.1))
+
+        assert result['Leo'] == pytest.approx(13.75)
+        assert result['Ana'] == pytest.approx(11.0)
+        assert result['Mia'] == pytest.approx(11.0)
+
+    def test_mixed_with_equal_items(self):
+        """Weighted and plain items can be mixed, and equal weights give an even split."""
+        weighted = self.bill(['Leo:1;Ana:1', 'Ana;Mia', 'Mia:3;Leo'], [10.0, 20.0, 40.0], tax_pct=0.12)
+        plain = self.bill(['Leo;Ana', 'Ana;Mia'], [10.0, 20.0], tax_pct=0.12)
+
+        result = self.totals(weighted)
+        expected = self.totals(plain)
+
+        assert result['Ana'] == pytest.approx(expected['Ana'])
+        assert result['Leo'] == pytest.approx(expected['Leo'] + 40 * 1.12 / 4)
+        assert result['Mia'] == pytest.approx(expected['Mia'] + 40 * 1.12 * 3 / 4)
+
+    def test_cents_largest_remainder(self):
+        """In cents mode weighted shares add up to the item cost, extra cents going first."""
+        result = self.totals(self.bill(['Leo:1;Ana:1;Mia:1', 'Leo:1;Ana:2', 'Mia=0.01;Ana'],
+                                       [1000, 100, 1000]), money='cents')
+
+        # 1000 -> 334/333/333, 100 -> 33.33/66.67 -> 33/67, 1000 -> 1 + 999
+        assert result['Leo'] == 334 + 33
+        assert result['Ana'] == 333 + 67 + 999
+        assert result['Mia'] == 333 + 1
+        assert result.dtype == 'int64'
+
+    @pytest.mark.parametrize('shared_by, item_price', [
+        ('Leo:0;Ana', 10.0),
+        ('Leo:x;Ana', 10.0),
+        ('Leo=-1;Ana', 10.0),
+        (':2;Ana', 10.0),
+        ('Leo=50;Ana', 30.0),
+        ('Leo=10;Ana=10', 30.0),
+    ])
+    def test_invalid_shares(self, shared_by, item_price):
+        """Bad weights and fixed amounts that do not fit the price raise ValueError."""
+        with pytest.raises(ValueError):
+            split_by_item(self.bill([shared_by], [item_price]))
+
+    def test_loop_engine_not_supported(self):
+        """The 'loop' engine only splits evenly."""
+        with pytest.raises(ValueError):
+            split_by_item(self.bill(['Leo:2;Ana'], [30.0]), engine='loop')
+
+    def test_settle_and_person_index(self):
+        """settle and PersonIndex see plain names and the same weighted totals."""
+        df = self.bill(['Leo:2;Ana', 'Ana=5;Mia'], [30.0, 20.0])
+        df['payer'] = ['Leo', 'Mia']
+
+        people = PersonIndex.from_ledger(df)
+        transfers = settle(df)
+        expected = amount_to_transfer(split_by_item(df), individual_total_payments(df))
+
+        assert list(people.names) == ['Ana', 'Leo', 'Mia']
+        assert transfers.to_dict('records') == expected.to_dict('records')
@@ -0,0 +1,56 @@
+"""Tests for the TotalsAccumulator class."""
+
+import pandas as pd
+import pytest
+
+from billsplittermds.individual_total_payments import individual_total_payments
+from billsplittermds.load_validate_data import load_validate_data
+from billsplittermds.split_by_item import split_by_item
+from billsplittermds.totals_accumulator import TotalsAccumulator
+
+
+class TestTotalsAccumulator:
+    """Test suite for the TotalsAccumulator class."""
+
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        """A small bill file with people spread over several chunks."""
+        csv_content = (
+            "payer,item_name,item_price,shared_by,tax_pct,tip_pct\n"
+            "Leo,candy,10,Leo,0.12,0.15\n"
+            "Leo,taxi,25,Leo;Ana,0.07,0.0\n"
+            "Ana,lunch,20,Ana;Mia,0.12,0.15\n"
+            "Mia,museum,45,Leo;Ana;Mia,0.05,0.0\n"
+            "Joe,dinner,80,Joe;Leo,0.10,0.20\n"
+        )
+        path = tmp_path / "trip.csv"
+        path.write_text(csv_content)
+        return path
+
+    @pytest.mark.parametrize('money', ['float', 'cents'])
+    def test_chunked_totals_match_whole_file(self, csv_path, money):
+        """Folding chunks should give the same totals as the whole file at once."""
+        totals = TotalsAccumulator(money=money)
+        for chunk in load_validate_data(csv_path, money=money, chunksize=2):
+            totals.update(chunk)
+
+        valid_df = load_validate_data(csv_path, money=money)
+        expected_should = split_by_item(valid_df.copy(), money=money)
+        expected_paid = individual_total_payments(valid_df.copy(), money=money)
+
+        pd.testing.assert_frame_equal(totals.should_pay_df(), expected_should)
+        pd.testing.assert_frame_equal(totals.actually_paid_df(), expected_paid)
+        assert totals.rows == 5
+
+    def test_empty_accumulator(self):
+        """An accumulator without chunks returns empty totals."""
+        totals = TotalsAccumulator()
+
+        assert list(totals.should_pay_df().columns) == ['name', 'should_pay']
+        assert list(totals.actually_paid_df().columns) == ['name', 'actually_paid']
+        assert len(totals.should_pay_df()) == 0
+
+    def test_invalid_money(self):
+        """An unknown money mode should raise ValueError."""
+        with pytest.raises(ValueError):
+            TotalsAccumulator(money='euros')